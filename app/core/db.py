@@ -1,87 +1,1685 @@
-import os
-import sqlite3
-from typing import List, Tuple, Optional
-
-# Database file path setup
-db_dir = os.path.dirname(os.path.abspath(__file__))
-db_path = os.path.join(db_dir, "database.db")
-conn = sqlite3.connect(db_path, check_same_thread=False)
-
-def init_table():
-    # Initialize database table for travel logs
-    stmt = """CREATE TABLE IF NOT EXISTS log(
-        id INTEGER PRIMARY KEY AUTOINCREMENT, 
-        origin TEXT NOT NULL, 
-        destination TEXT NOT NULL, 
-        mode TEXT NOT NULL, 
-        start TEXT NOT NULL, 
-        end TEXT NOT NULL, 
-        description TEXT DEFAULT ''
-    )"""
-    conn.execute(stmt)
-    conn.commit()
-
-init_table()
-
-def get_all_logs() -> List[Tuple]:
-    # Retrieve all travel logs ordered by ID
-    stmt = "SELECT * FROM log ORDER BY id"
-    rows = conn.execute(stmt).fetchall()
-    return rows
-
-def get_log(log_id: int) -> Optional[Tuple]:
-    # Retrieve specific log by ID, returns None if not found
-    stmt = "SELECT * FROM log WHERE id=?"
-    row = conn.execute(stmt, (log_id,)).fetchone()
-    return row
-
-def create_log(origin: str, destination: str, mode: str, start: str, end: str, description: str = "") -> int:
-    # Create new travel log and return generated ID
-    # Validate required fields
-    if not origin:
-        raise ValueError("Origin is required")
-    if not destination:
-        raise ValueError("Destination is required")
-    if not mode:
-        raise ValueError("Mode is required")
-    if not start:
-        raise ValueError("Start is required")
-    if not end:
-        raise ValueError("End is required")
-    
-    # Insert new record
-    stmt = "INSERT INTO log(origin, destination, mode, start, end, description) VALUES (?, ?, ?, ?, ?, ?)"
-    cursor = conn.execute(stmt, (origin, destination, mode, start, end, description))
-    conn.commit()
-    return cursor.lastrowid
-
-def update_log(log_id: int, origin: str, destination: str, mode: str, start: str, end: str, description: str = ""):
-    # Update existing travel log
-    # Validate required fields
-    if not origin:
-        raise ValueError("Origin is required")
-    if not destination:
-        raise ValueError("Destination is required")
-    if not mode:
-        raise ValueError("Mode is required")
-    if not start:
-        raise ValueError("Start is required")
-    if not end:
-        raise ValueError("End is required")
-    
-    # Update record
-    stmt = "UPDATE log SET origin=?, destination=?, mode=?, start=?, end=?, description=? WHERE id=?"
-    conn.execute(stmt, (origin, destination, mode, start, end, description, log_id))
-    conn.commit()
-
-def delete_log(log_id: int):
-    # Delete specific log by ID
-    stmt = "DELETE FROM log WHERE id=?"
-    conn.execute(stmt, (log_id,))
-    conn.commit()
-
-def clear_all_logs():
-    # Delete all logs from database
-    stmt = "DELETE FROM log"
-    conn.execute(stmt)
-    conn.commit()
\ No newline at end of file
+import calendar
+import hashlib
+import itertools
+import math
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Set, Tuple, Optional
+from array import array
+from core.downsample import load_series
+from core.filters import compile_filter
+from core.gpx import EARTH_RADIUS, distance
+
+# Database location: app/main.py --database, the TRAVEL_LOGGER_DB environment variable,
+# or database.db beside this module
+db_dir = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DATABASE = os.path.join(db_dir, "database.db")
+DATABASE_ENV = "TRAVEL_LOGGER_DB"
+
+# Connection every function below uses, opened on first use or by connect()
+conn: Optional[sqlite3.Connection] = None
+database: Optional[str] = None
+database_target: Optional[Tuple[str, bool]] = None
+memory_databases = itertools.count(1)
+
+# Writes queued within WRITE_WINDOW seconds of each other, up to WRITE_BATCH operations,
+# share one transaction and one fsync
+WRITE_WINDOW = 0.002
+WRITE_BATCH = 256
+
+# Memory budget of cached read results; a single result may use at most a quarter of it
+CACHE_BYTES = 32 * 1024 * 1024
+
+# Format of the stored start and end text; SQLite reads it into the start_ts and end_ts columns
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Stored fields in the order the UI unpacks them
+LOG_FIELDS = "id, origin, destination, mode, start, end, description"
+
+# Stored times SQLite cannot parse read as NULL epochs. Every reader keeps such a log with a zero duration:
+# an unknown time takes the other one, or 0 when both are unknown. Readers of a start range match on start_ts
+# itself, so a log whose start is unknown is in no range
+KNOWN_START = "COALESCE(start_ts, end_ts, 0)"
+KNOWN_END = "COALESCE(end_ts, start_ts, 0)"
+KNOWN_DURATION = "COALESCE(duration, 0)"
+KNOWN_TIMES = f"{KNOWN_START}, {KNOWN_END}, {KNOWN_DURATION}"
+
+# Typed column projection used by the in-memory store
+LOG_COLUMNS = f"id, origin, destination, mode, {KNOWN_START}, {KNOWN_END}"
+
+# Insert used by the bulk write paths; coordinates are optional and may be None
+LOG_INSERT = """INSERT INTO log(origin, destination, mode, start, end, description,
+    origin_lat, origin_lon, destination_lat, destination_lon) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+
+# (origin, destination, mode, start, end, description, origin lat, origin lon, destination lat, destination lon)
+NewLog = Tuple[str, str, str, str, str, str, Optional[float], Optional[float], Optional[float], Optional[float]]
+
+# Trip endpoints that can be searched by location
+ENDPOINTS = ("origin", "destination")
+
+# Schema changes that cannot be expressed with IF NOT EXISTS are applied once per PRAGMA user_version
+SCHEMA_VERSION = 3
+
+# Deleted logs are tombstoned and cleared logs are hidden behind an ID watermark; both can be undone
+# until compaction purges them, which happens once they are older than PURGE_AFTER seconds
+PURGE_AFTER = 10 * 60
+CLEARED_THROUGH = "(SELECT COALESCE(MAX(max_id), 0) FROM log_clear WHERE undone = 0)"
+
+def live_filter(prefix: str = "") -> str:
+    # Condition selecting logs that are neither tombstoned nor cleared; prefix is e.g. "OLD." in triggers
+    return f"{prefix}deleted_at IS NULL AND {prefix}id > {CLEARED_THROUGH}"
+
+LIVE = live_filter()
+
+# Recurring trips: times are wall-clock "HH:MM"; an end at or before the start is on the next day
+class Schedule(NamedTuple):
+    id: int
+    origin: str
+    destination: str
+    mode: str
+    weekdays: int  # Bit i set for datetime weekday i, Monday = 0
+    start_time: str
+    end_time: str
+    description: str
+    first_date: str  # "YYYY-MM-DD"
+    last_date: Optional[str]  # None while the schedule runs
+    expanded_until: str  # Start of the newest occurrence logged or skipped, "" before the first
+
+SCHEDULE_FIELDS = "id, origin, destination, mode, weekdays, start_time, end_time, description, first_date, last_date, expanded_until"
+
+# Route statistics tuning: EWMA weight of the newest trip, samples needed before flagging outliers,
+# and how many standard deviations above the mean counts as unusually long
+EWMA_ALPHA = 0.2
+MIN_ROUTE_SAMPLES = 5
+OUTLIER_STDDEVS = 2.0
+
+class RouteEstimate(NamedTuple):
+    # Streaming duration statistics of one (origin, destination, mode), all in seconds
+    count: int
+    mean: float
+    stddev: float
+    ewma: float
+    median: int
+    p90: int
+
+def resolve_database(location: str) -> Tuple[str, bool]:
+    # Map a location to sqlite3.connect arguments (target, uri)
+    # ":memory:" becomes a named shared-cache memory database so several connections see the same data
+    if location == ":memory:":
+        return f"file:travel-logger-{next(memory_databases)}?mode=memory&cache=shared", True
+    if location.startswith("file:"):
+        return location, True
+
+    return os.path.abspath(location), False
+
+def open_connection() -> sqlite3.Connection:
+    # Connection factory: every connection to the configured database is created here
+    if database_target is None:
+        connection()
+
+    target, uri = database_target
+    return sqlite3.connect(target, uri=uri, check_same_thread=False)
+
+def connect(location: Optional[str] = None) -> sqlite3.Connection:
+    # Open the database at a path, "file:" URI, or ":memory:" and create the schema
+    # Without a location the environment variable or the default file is used; a previous connection is closed
+    global conn, database, database_target, writer
+
+    if writer is not None:
+        writer.stop()
+        writer = None
+    if conn is not None:
+        conn.close()
+
+    query_cache.clear()
+    day_totals.clear()
+    database = database_location(location)
+    database_target = resolve_database(database)
+    conn = open_connection()
+
+    if memory_database():
+        # Shared-cache tables are locked while the writer's transaction is open; read committed pages anyway
+        conn.execute("PRAGMA read_uncommitted=1")
+    else:
+        # WAL lets this connection read while the writer thread commits
+        conn.execute("PRAGMA journal_mode=WAL")
+
+    init_table()
+    return conn
+
+def database_location(location: Optional[str] = None) -> str:
+    # The location connect() opens: the given one, else the environment variable, else the default file
+    return location or os.environ.get(DATABASE_ENV) or DEFAULT_DATABASE
+
+def memory_database() -> bool:
+    # Whether the configured database is a shared-cache memory database
+    return database_target[1] and "mode=memory" in database_target[0]
+
+def connection() -> sqlite3.Connection:
+    # The connection in use, opening the configured database on first use
+    if conn is None:
+        connect()
+
+    return conn
+
+class Writer:
+    # Single thread owning the only write connection
+    # Operations are callables taking that connection; the ones queued close together run in one
+    # transaction, each inside a savepoint so a failing operation only rolls back itself
+    # Operations submitted with transaction=False (VACUUM and the like) run alone in autocommit mode
+    def __init__(self):
+        self.queue: "queue.Queue[Optional[Tuple[Future, Callable[[sqlite3.Connection], Any], bool]]]" = queue.Queue()
+        self.conn = open_connection()
+        self.conn.isolation_level = None  # Transactions are managed explicitly
+        self.thread = threading.Thread(target=self.run, name="db-writer", daemon=True)
+        self.thread.start()
+
+    def submit(self, operation: Callable[[sqlite3.Connection], Any], transaction: bool = True) -> Future:
+        future: Future = Future()
+        self.queue.put((future, operation, transaction))
+        return future
+
+    def stop(self):
+        # Finish queued operations, then close the write connection
+        self.queue.put(None)
+        self.thread.join()
+
+    def run(self):
+        stopping = False
+        held = None  # An operation that has to run alone, taken from the queue while filling a batch
+
+        while not stopping:
+            item = held if held is not None else self.queue.get()
+            held = None
+
+            if item is None:
+                break
+            if not item[2]:
+                self.run_alone(item[0], item[1])
+                continue
+
+            batch = [item]
+            deadline = time.monotonic() + WRITE_WINDOW
+
+            while len(batch) < WRITE_BATCH:
+                try:
+                    item = self.queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+
+                if item is None:
+                    stopping = True
+                    break
+                if not item[2]:
+                    held = item
+                    break
+
+                batch.append(item)
+
+            self.commit(batch)
+
+        self.conn.close()
+
+    def run_alone(self, future: Future, operation: Callable[[sqlite3.Connection], Any]):
+        if not future.set_running_or_notify_cancel():
+            return
+
+        try:
+            result = operation(self.conn)
+        except Exception as e:
+            if self.conn.in_transaction:
+                self.conn.execute("ROLLBACK")
+
+            future.set_exception(e)
+            return
+
+        future.set_result(result)
+
+    def commit(self, batch: List[Tuple[Future, Callable[[sqlite3.Connection], Any], bool]]):
+        # Run a batch in one transaction; futures resolve only once it is committed
+        batch = [(future, operation) for future, operation, _ in batch if future.set_running_or_notify_cancel()]
+        outcomes = []
+
+        try:
+            self.conn.execute("BEGIN IMMEDIATE")
+
+            for future, operation in batch:
+                self.conn.execute("SAVEPOINT operation")
+
+                try:
+                    outcomes.append((future, operation(self.conn), None))
+                    self.conn.execute("RELEASE operation")
+                except Exception as e:
+                    self.conn.execute("ROLLBACK TO operation")
+                    self.conn.execute("RELEASE operation")
+                    outcomes.append((future, None, e))
+
+            self.conn.execute("COMMIT")
+        except Exception as e:
+            # The transaction itself failed (busy, disk full): nothing in it was written
+            if self.conn.in_transaction:
+                self.conn.execute("ROLLBACK")
+
+            for future, _ in batch:
+                future.set_exception(e)
+            return
+
+        for future, result, error in outcomes:
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+writer: Optional[Writer] = None
+writer_lock = threading.Lock()
+
+def submit_write(operation: Callable[[sqlite3.Connection], Any], transaction: bool = True) -> Future:
+    # Queue a write for the writer thread, starting it on first use
+    global writer
+
+    with writer_lock:
+        if writer is None:
+            connection()
+            writer = Writer()
+
+        return writer.submit(operation, transaction)
+
+def write(operation: Callable[[sqlite3.Connection], Any]) -> Any:
+    # Run a write on the writer thread and wait until it is committed, returning its result
+    return submit_write(operation).result()
+
+def pending_writes() -> int:
+    # Number of writes queued but not yet picked up by the writer thread
+    return writer.queue.qsize() if writer is not None else 0
+
+# Start-time range a cached result depends on or a write touched, in epoch seconds
+TimeRange = Tuple[float, float]
+ALL_TIME: TimeRange = (-math.inf, math.inf)
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int  # Dropped to stay within the memory budget
+    invalidations: int  # Dropped because a write touched their range
+    entries: int
+    size: int  # Estimated bytes held
+
+class LogWrite(NamedTuple):
+    # Change log position around one write_logs() call, read on the writer connection inside its transaction
+    before: int  # Newest change log entry before the write; the write's own entries are the ones after it
+    after: int  # Newest change log entry once the write is done
+    data_version: int  # PRAGMA data_version of the writer connection, which only moves when another connection commits
+
+class ChangeTracker:
+    # How far a cache has accounted for the change log; the owning cache holds its own lock around every call
+    def __init__(self):
+        self.change_seq = 0  # Newest change log entry accounted for
+        self.data_version: Optional[int] = None  # Writer's data_version at the last local write
+
+    def behind(self, seq: int) -> bool:
+        # Whether the change log moved past what was accounted for, in which case the cache drops everything
+        if seq <= self.change_seq:
+            return False
+
+        self.change_seq = seq
+        return True
+
+    def gap(self, write: LogWrite) -> bool:
+        # Account for a local write; True if something else was committed since the last sync (another process,
+        # or a local write not yet accounted for), so dropping just the touched range is not enough
+        gap = write.before != self.change_seq or write.data_version != self.data_version
+        self.change_seq = max(self.change_seq, write.after)
+        self.data_version = write.data_version
+        return gap
+
+    def reset(self):
+        self.change_seq = 0
+        self.data_version = None
+
+def estimate_size(value: Any) -> int:
+    # Rough memory footprint of a result: the container, its items, and the fields of tuple items
+    size = sys.getsizeof(value)
+
+    if isinstance(value, dict):
+        items = itertools.chain(value.keys(), value.values())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        items = value
+    else:
+        return size
+
+    for item in items:
+        size += sys.getsizeof(item)
+
+        if isinstance(item, tuple):
+            size += sum(sys.getsizeof(field) for field in item)
+
+    return size
+
+class QueryCache:
+    # LRU cache of read results keyed by normalized query and parameters, bounded by estimated memory
+    # Every entry covers a start-time range; a write drops the entries overlapping the range of logs it touched
+    # and bumps the write generation, so a result computed while a write landed is not stored
+    # Writes by other processes are noticed through the change log, or as a gap before the next local write,
+    # and drop everything
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.entries: "OrderedDict[Tuple[str, Tuple], Tuple[Any, int, TimeRange]]" = OrderedDict()
+        self.size = 0
+        self.generation = 0
+        self.changes = ChangeTracker()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.lock = threading.Lock()
+
+    def get(self, query: str, params: Tuple, compute: Callable[[], Any], scope: TimeRange = ALL_TIME) -> Any:
+        # Cached result of query with params, computing and storing it on a miss
+        # Results are shared between callers and must not be modified
+        key = (" ".join(query.split()), params)
+        seq = connection().execute("SELECT MAX(seq) FROM log_change").fetchone()[0] or 0
+
+        with self.lock:
+            if self.changes.behind(seq):
+                self.drop(ALL_TIME)
+
+            entry = self.entries.get(key)
+
+            if entry is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+            self.misses += 1
+            generation = self.generation
+
+        value = compute()
+        size = estimate_size(value)
+
+        with self.lock:
+            if generation == self.generation and size <= self.max_bytes // 4 and key not in self.entries:
+                self.entries[key] = (value, size, scope)
+                self.size += size
+
+                while self.size > self.max_bytes:
+                    _, (_, evicted_size, _) = self.entries.popitem(last=False)
+                    self.size -= evicted_size
+                    self.evictions += 1
+
+        return value
+
+    def invalidate(self, touched: Optional[TimeRange], write: LogWrite):
+        # A local write committed and touched logs starting in the touched range
+        with self.lock:
+            if self.changes.gap(write):
+                self.generation += 1
+                self.drop(ALL_TIME)
+            elif touched is not None:
+                self.generation += 1
+                self.drop(touched)
+
+    def drop(self, touched: TimeRange):
+        low, high = touched
+
+        for key, (_, size, (start, end)) in list(self.entries.items()):
+            if start <= high and low <= end:
+                del self.entries[key]
+                self.size -= size
+                self.invalidations += 1
+
+    def clear(self):
+        with self.lock:
+            self.generation += 1
+            self.entries.clear()
+            self.size = 0
+            self.changes.reset()
+
+    def stats(self) -> CacheStats:
+        with self.lock:
+            return CacheStats(self.hits, self.misses, self.evictions, self.invalidations, len(self.entries), self.size)
+
+query_cache = QueryCache(CACHE_BYTES)
+
+def cache_stats() -> CacheStats:
+    return query_cache.stats()
+
+class DayTotals:
+    # Trips and total seconds for every day of a year, read with one GROUP BY query the first time a year is shown
+    # A write only marks the days it touched in the years already read, and the next read re-queries just those days
+    # Writes by other processes are noticed through the change log, or as a gap before the next local write,
+    # and drop everything
+    def __init__(self):
+        self.years: Dict[int, List[Tuple[int, int]]] = {}
+        self.stale: Dict[int, Tuple[int, int]] = {}  # Year -> first and last day index to re-read
+        self.changes = ChangeTracker()
+        self.lock = threading.Lock()
+
+    def get(self, year: int) -> List[Tuple[int, int]]:
+        # (trips, seconds) per day of year, indexed from January 1
+        seq = connection().execute("SELECT MAX(seq) FROM log_change").fetchone()[0] or 0
+
+        with self.lock:
+            if self.changes.behind(seq):
+                self.years.clear()
+                self.stale.clear()
+
+            first = calendar.timegm((year, 1, 1, 0, 0, 0))
+            days = self.years.get(year)
+
+            if days is None:
+                days = [(0, 0)] * (366 if calendar.isleap(year) else 365)
+                self.read(days, first, 0, len(days) - 1)
+                self.years[year] = days
+            elif year in self.stale:
+                low, high = self.stale.pop(year)
+                self.read(days, first, low, high)
+
+            return list(days)
+
+    def read(self, days: List[Tuple[int, int]], first: int, low: int, high: int):
+        # Re-read days low through high of the year starting at epoch first
+        # A log whose end cannot be read counts as a trip of zero seconds, as it does in the table
+        stmt = f"""SELECT (start_ts - ?) / 86400 AS day, COUNT(*), SUM({KNOWN_DURATION}) FROM log
+            WHERE start_ts >= ? AND start_ts < ? AND {LIVE} GROUP BY day"""
+        days[low:high + 1] = [(0, 0)] * (high - low + 1)
+
+        for day, trips, seconds in connection().execute(stmt, (first, first + low * 86400, first + (high + 1) * 86400)):
+            days[day] = (trips, seconds)
+
+    def invalidate(self, touched: Optional[TimeRange], write: LogWrite):
+        # A local write committed and touched logs starting in the touched range
+        with self.lock:
+            if self.changes.gap(write):
+                self.years.clear()
+                self.stale.clear()
+            elif touched is not None:
+                for year, days in list(self.years.items()):
+                    first = calendar.timegm((year, 1, 1, 0, 0, 0))
+                    low = max(touched[0], first)
+                    high = min(touched[1], first + len(days) * 86400 - 1)
+
+                    if low > high:
+                        continue
+                    elif low == first and high == first + len(days) * 86400 - 1:
+                        # The whole year changed (a clear, for one), read it again from scratch
+                        del self.years[year]
+                        self.stale.pop(year, None)
+                        continue
+
+                    low, high = int(low - first) // 86400, int(high - first) // 86400
+                    stale = self.stale.get(year)
+                    self.stale[year] = (low, high) if stale is None else (min(stale[0], low), max(stale[1], high))
+
+    def clear(self):
+        with self.lock:
+            self.years.clear()
+            self.stale.clear()
+            self.changes.reset()
+
+day_totals = DayTotals()
+
+def span(*ranges: Optional[TimeRange]) -> Optional[TimeRange]:
+    # Smallest range covering the given ones, None if all are None
+    ranges = [r for r in ranges if r is not None]
+
+    if not ranges:
+        return None
+
+    return min(r[0] for r in ranges), max(r[1] for r in ranges)
+
+def start_range(c: sqlite3.Connection, log_ids: List[int]) -> Optional[TimeRange]:
+    # Earliest and latest start of the given logs as currently stored, None if none exist
+    touched = None
+
+    for i in range(0, len(log_ids), 500):
+        chunk = log_ids[i:i + 500]
+        row = c.execute(f"SELECT MIN(start_ts), MAX(start_ts) FROM log WHERE id IN ({', '.join('?' * len(chunk))})", chunk).fetchone()
+        touched = span(touched, None if row[0] is None else row)
+
+    return touched
+
+def text_range(c: sqlite3.Connection, starts: List[str]) -> Optional[TimeRange]:
+    # Start range of logs about to be written, converted the same way as the start_ts column
+    if not starts:
+        return None
+
+    row = c.execute("SELECT CAST(strftime('%s', ?) AS INTEGER), CAST(strftime('%s', ?) AS INTEGER)", (min(starts), max(starts))).fetchone()
+    return ALL_TIME if row[0] is None else row
+
+def write_logs(operation: Callable[[sqlite3.Connection], Tuple[Any, Optional[TimeRange]]]) -> Any:
+    # Run a write returning (result, start range it touched) and drop the cached reads over that range
+    # The writer holds the write lock from BEGIN IMMEDIATE on, so the change log entries after before are this write's
+    def run(c: sqlite3.Connection) -> Tuple[Any, Optional[TimeRange], LogWrite]:
+        before = c.execute("SELECT MAX(seq) FROM log_change").fetchone()[0] or 0
+        result, touched = operation(c)
+        after = c.execute("SELECT MAX(seq) FROM log_change").fetchone()[0] or 0
+        return result, touched, LogWrite(before, after, c.execute("PRAGMA data_version").fetchone()[0])
+
+    result, touched, log_write = write(run)
+    query_cache.invalidate(touched, log_write)
+    day_totals.invalidate(touched, log_write)
+    return result
+
+def init_table():
+    # Initialize database table for travel logs
+    conn = connection()
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+
+    if conn.execute("SELECT 1 FROM sqlite_master").fetchone() is None:
+        # Version 2: incremental auto-vacuum, so maintenance can hand freed pages back in slices
+        # Switching to WAL has already written the header, so even an empty file needs a VACUUM, which is instant
+        # while there are no tables; maintenance converts existing databases (see vacuum_task)
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        conn.execute("VACUUM")
+
+    stmt = """CREATE TABLE IF NOT EXISTS log(
+        id INTEGER PRIMARY KEY AUTOINCREMENT, 
+        origin TEXT NOT NULL, 
+        destination TEXT NOT NULL, 
+        mode TEXT NOT NULL, 
+        start TEXT NOT NULL, 
+        end TEXT NOT NULL, 
+        description TEXT DEFAULT ''
+    )"""
+    conn.execute(stmt)
+
+    # Typed epoch columns computed by SQLite from the stored text, so range queries can use an index
+    # Times are stored as local wall-clock text and read as UTC, which keeps durations exact
+    columns = [row[1] for row in conn.execute("PRAGMA table_xinfo(log)")]
+
+    if "start_ts" not in columns:
+        conn.execute("ALTER TABLE log ADD COLUMN start_ts INTEGER GENERATED ALWAYS AS (CAST(strftime('%s', start) AS INTEGER)) VIRTUAL")
+    if "end_ts" not in columns:
+        conn.execute("ALTER TABLE log ADD COLUMN end_ts INTEGER GENERATED ALWAYS AS (CAST(strftime('%s', end) AS INTEGER)) VIRTUAL")
+    if "duration" not in columns:
+        conn.execute("ALTER TABLE log ADD COLUMN duration INTEGER GENERATED ALWAYS AS (end_ts - start_ts) VIRTUAL")
+
+    # Optional endpoint coordinates in degrees, NULL for logs entered without a location
+    for endpoint in ENDPOINTS:
+        for axis in ("lat", "lon"):
+            if f"{endpoint}_{axis}" not in columns:
+                conn.execute(f"ALTER TABLE log ADD COLUMN {endpoint}_{axis} REAL")
+
+    # Tombstone: epoch of the soft delete, NULL while the log is live
+    if "deleted_at" not in columns:
+        conn.execute("ALTER TABLE log ADD COLUMN deleted_at INTEGER")
+
+    # Each clear hides every log up to max_id until it is undone
+    conn.execute("""CREATE TABLE IF NOT EXISTS log_clear(
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        max_id INTEGER NOT NULL,
+        cleared_at INTEGER NOT NULL,
+        undone INTEGER NOT NULL DEFAULT 0
+    )""")
+
+    if version < 1:
+        # Version 1: triggers skip tombstoned logs and the time indexes only cover live logs
+        for name in ("log_after_update", "log_after_delete", "route_stats_after_delete", "route_stats_after_update"):
+            conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+        for name in ("log_start_ts", "log_mode_start_ts"):
+            conn.execute(f"DROP INDEX IF EXISTS {name}")
+
+    if version < 3:
+        # Version 3: route statistics triggers skip logs whose times cannot be parsed
+        for name in ("route_stats_after_insert", "route_stats_after_delete", "route_stats_after_update",
+                     "route_stats_after_tombstone", "route_stats_after_restore"):
+            conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+
+    conn.execute("CREATE INDEX IF NOT EXISTS log_start_ts ON log(start_ts) WHERE deleted_at IS NULL")
+    conn.execute("CREATE INDEX IF NOT EXISTS log_mode_start_ts ON log(mode, start_ts) WHERE deleted_at IS NULL")
+    conn.execute("CREATE INDEX IF NOT EXISTS log_deleted_at ON log(deleted_at) WHERE deleted_at IS NOT NULL")
+
+    # Change log filled by triggers so readers (including other processes) can apply deltas
+    conn.execute("""CREATE TABLE IF NOT EXISTS log_change(
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        log_id INTEGER NOT NULL,
+        op TEXT NOT NULL
+    )""")
+    init_route_stats()
+    init_location_index()
+    init_content_hash()
+
+    # Checkpoints for resumable bulk imports
+    conn.execute("""CREATE TABLE IF NOT EXISTS import_progress(
+        source TEXT PRIMARY KEY,
+        fingerprint TEXT NOT NULL,
+        batches INTEGER NOT NULL,
+        done INTEGER NOT NULL
+    )""")
+
+    # Saved filter views, selectable next to the table selector
+    conn.execute("""CREATE TABLE IF NOT EXISTS saved_view(
+        name TEXT PRIMARY KEY,
+        expression TEXT NOT NULL
+    )""")
+    init_schedules()
+    conn.execute("""CREATE TRIGGER IF NOT EXISTS log_after_insert AFTER INSERT ON log BEGIN
+        INSERT INTO log_change(log_id, op) VALUES (NEW.id, 'insert');
+    END""")
+    conn.execute("""CREATE TRIGGER IF NOT EXISTS log_after_update AFTER UPDATE ON log BEGIN
+        INSERT INTO log_change(log_id, op) VALUES (NEW.id, CASE WHEN NEW.deleted_at IS NULL THEN 'update' ELSE 'delete' END);
+    END""")
+
+    # Purging tombstones is not a change readers need to see
+    conn.execute(f"""CREATE TRIGGER IF NOT EXISTS log_after_delete AFTER DELETE ON log WHEN {live_filter("OLD.")} BEGIN
+        INSERT INTO log_change(log_id, op) VALUES (OLD.id, 'delete');
+    END""")
+    conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+    conn.commit()
+
+def init_schedules():
+    # Recurring trips and their per-date skips and overrides, expanded into logs by expand_schedules()
+    conn = connection()
+    conn.execute("""CREATE TABLE IF NOT EXISTS schedule(
+        id INTEGER PRIMARY KEY,
+        origin TEXT NOT NULL,
+        destination TEXT NOT NULL,
+        mode TEXT NOT NULL,
+        weekdays INTEGER NOT NULL,
+        start_time TEXT NOT NULL,
+        end_time TEXT NOT NULL,
+        description TEXT NOT NULL DEFAULT '',
+        first_date TEXT NOT NULL,
+        last_date TEXT,
+        expanded_until TEXT NOT NULL DEFAULT ''
+    )""")
+
+    # NULL override columns keep the schedule's value
+    conn.execute("""CREATE TABLE IF NOT EXISTS schedule_exception(
+        schedule_id INTEGER NOT NULL,
+        date TEXT NOT NULL,
+        skip INTEGER NOT NULL DEFAULT 0,
+        origin TEXT,
+        destination TEXT,
+        mode TEXT,
+        start_time TEXT,
+        end_time TEXT,
+        description TEXT,
+        PRIMARY KEY(schedule_id, date)
+    ) WITHOUT ROWID""")
+
+def init_route_stats():
+    # Per-route streaming statistics kept current by triggers, so every write path updates them
+    # route_stats holds Welford count/mean/M2 plus an EWMA; route_duration_bucket is a per-minute
+    # histogram used as a mergeable, deletable quantile sketch
+    conn = connection()
+    exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='route_stats'").fetchone()
+
+    conn.execute("""CREATE TABLE IF NOT EXISTS route_stats(
+        origin TEXT NOT NULL,
+        destination TEXT NOT NULL,
+        mode TEXT NOT NULL,
+        count INTEGER NOT NULL,
+        mean REAL NOT NULL,
+        m2 REAL NOT NULL,
+        ewma REAL NOT NULL,
+        PRIMARY KEY(origin, destination, mode)
+    )""")
+    conn.execute("""CREATE TABLE IF NOT EXISTS route_duration_bucket(
+        origin TEXT NOT NULL,
+        destination TEXT NOT NULL,
+        mode TEXT NOT NULL,
+        minute INTEGER NOT NULL,
+        count INTEGER NOT NULL,
+        PRIMARY KEY(origin, destination, mode, minute)
+    )""")
+
+    if not exists:
+        # Backfill from existing logs once, then triggers take over
+        rebuild_route_stats(conn)
+
+    # Add one sample: Welford update, EWMA, and histogram bucket
+    # Logs whose times cannot be parsed have a NULL duration and are not sampled
+    add_sample = f"""
+        INSERT INTO route_stats(origin, destination, mode, count, mean, m2, ewma)
+        SELECT NEW.origin, NEW.destination, NEW.mode, 1, NEW.duration, 0, NEW.duration WHERE NEW.duration IS NOT NULL
+        ON CONFLICT(origin, destination, mode) DO UPDATE SET
+            count = count + 1,
+            mean = mean + (excluded.mean - mean) / (count + 1),
+            m2 = m2 + (excluded.mean - mean) * (excluded.mean - (mean + (excluded.mean - mean) / (count + 1))),
+            ewma = {EWMA_ALPHA} * excluded.mean + {1 - EWMA_ALPHA} * ewma;
+        INSERT INTO route_duration_bucket(origin, destination, mode, minute, count)
+        SELECT NEW.origin, NEW.destination, NEW.mode, NEW.duration / 60, 1 WHERE NEW.duration IS NOT NULL
+        ON CONFLICT(origin, destination, mode, minute) DO UPDATE SET count = count + 1;"""
+
+    # Remove one sample: inverse Welford update; the EWMA cannot be un-applied and is kept
+    # Logs with a NULL duration were never sampled and remove nothing
+    remove_sample = """
+        UPDATE route_stats SET
+            count = count - 1,
+            mean = CASE WHEN count > 1 THEN (mean * count - OLD.duration) / (count - 1) ELSE 0 END,
+            m2 = CASE WHEN count > 1
+                THEN MAX(m2 - (OLD.duration - mean) * (OLD.duration - (mean * count - OLD.duration) / (count - 1)), 0)
+                ELSE 0 END
+        WHERE origin=OLD.origin AND destination=OLD.destination AND mode=OLD.mode AND OLD.duration IS NOT NULL;
+        DELETE FROM route_stats WHERE origin=OLD.origin AND destination=OLD.destination AND mode=OLD.mode AND count <= 0;
+        UPDATE route_duration_bucket SET count = count - 1
+        WHERE origin=OLD.origin AND destination=OLD.destination AND mode=OLD.mode AND minute=OLD.duration / 60 AND OLD.duration IS NOT NULL;
+        DELETE FROM route_duration_bucket
+        WHERE origin=OLD.origin AND destination=OLD.destination AND mode=OLD.mode AND minute=OLD.duration / 60 AND count <= 0;"""
+
+    # Tombstoning removes a sample and undoing a delete adds it back; tombstoned and cleared logs are not counted
+    conn.execute(f"CREATE TRIGGER IF NOT EXISTS route_stats_after_insert AFTER INSERT ON log BEGIN {add_sample} END")
+    conn.execute(f"""CREATE TRIGGER IF NOT EXISTS route_stats_after_delete AFTER DELETE ON log
+        WHEN {live_filter("OLD.")} BEGIN {remove_sample} END""")
+    conn.execute(f"""CREATE TRIGGER IF NOT EXISTS route_stats_after_update
+        AFTER UPDATE OF origin, destination, mode, start, end ON log
+        WHEN OLD.deleted_at IS NULL AND {live_filter("NEW.")} BEGIN {remove_sample} {add_sample} END""")
+    conn.execute(f"""CREATE TRIGGER IF NOT EXISTS route_stats_after_tombstone AFTER UPDATE OF deleted_at ON log
+        WHEN NEW.deleted_at IS NOT NULL AND {live_filter("OLD.")} BEGIN {remove_sample} END""")
+    conn.execute(f"""CREATE TRIGGER IF NOT EXISTS route_stats_after_restore AFTER UPDATE OF deleted_at ON log
+        WHEN OLD.deleted_at IS NOT NULL AND {live_filter("NEW.")} BEGIN {add_sample} END""")
+
+def rebuild_route_stats(c: sqlite3.Connection):
+    # Recompute route statistics from live logs, used for the first backfill and after undoing a clear
+    c.execute("DELETE FROM route_stats")
+    c.execute("DELETE FROM route_duration_bucket")
+    c.execute(f"""INSERT INTO route_stats(origin, destination, mode, count, mean, m2, ewma)
+        SELECT origin, destination, mode, COUNT(*), AVG(duration),
+               MAX(SUM(duration * duration) - COUNT(*) * AVG(duration) * AVG(duration), 0), AVG(duration)
+        FROM log WHERE duration IS NOT NULL AND {LIVE} GROUP BY origin, destination, mode""")
+    c.execute(f"""INSERT INTO route_duration_bucket(origin, destination, mode, minute, count)
+        SELECT origin, destination, mode, duration / 60, COUNT(*)
+        FROM log WHERE duration IS NOT NULL AND {LIVE} GROUP BY origin, destination, mode, duration / 60""")
+
+def init_location_index():
+    # One R*Tree per endpoint holding a point box for every geotagged log, kept current by triggers
+    # The R*Tree narrows a search to a bounding box; exact distances are checked on the log row
+    conn = connection()
+
+    for endpoint in ENDPOINTS:
+        index = f"log_{endpoint}_rtree"
+        exists = conn.execute("SELECT 1 FROM sqlite_master WHERE name=?", (index,)).fetchone()
+        conn.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS {index} USING rtree(id, min_lat, max_lat, min_lon, max_lon)")
+
+        if not exists:
+            conn.execute(f"""INSERT INTO {index}(id, min_lat, max_lat, min_lon, max_lon)
+                SELECT id, {endpoint}_lat, {endpoint}_lat, {endpoint}_lon, {endpoint}_lon FROM log
+                WHERE {endpoint}_lat IS NOT NULL AND {endpoint}_lon IS NOT NULL""")
+
+        add_point = f"""INSERT INTO {index}(id, min_lat, max_lat, min_lon, max_lon)
+            SELECT NEW.id, NEW.{endpoint}_lat, NEW.{endpoint}_lat, NEW.{endpoint}_lon, NEW.{endpoint}_lon
+            WHERE NEW.{endpoint}_lat IS NOT NULL AND NEW.{endpoint}_lon IS NOT NULL;"""
+
+        conn.execute(f"CREATE TRIGGER IF NOT EXISTS {index}_after_insert AFTER INSERT ON log BEGIN {add_point} END")
+        conn.execute(f"""CREATE TRIGGER IF NOT EXISTS {index}_after_delete AFTER DELETE ON log BEGIN
+            DELETE FROM {index} WHERE id=OLD.id;
+        END""")
+        conn.execute(f"""CREATE TRIGGER IF NOT EXISTS {index}_after_update
+            AFTER UPDATE OF {endpoint}_lat, {endpoint}_lon ON log BEGIN
+            DELETE FROM {index} WHERE id=OLD.id;
+            {add_point}
+        END""")
+
+def init_content_hash():
+    # Content hash of every live log, grouped by start month, for merging databases from several devices
+    # Triggers only queue new and edited logs in log_hash_queue: the hash is computed in Python, and the
+    # database stays writable from tools that do not know the hash function
+    conn = connection()
+    exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='log_hash'").fetchone()
+
+    conn.execute("""CREATE TABLE IF NOT EXISTS log_hash(
+        id INTEGER PRIMARY KEY,
+        month TEXT NOT NULL,
+        hash INTEGER NOT NULL
+    )""")
+    conn.execute("CREATE INDEX IF NOT EXISTS log_hash_month ON log_hash(month, hash)")
+    conn.execute("CREATE TABLE IF NOT EXISTS log_hash_queue(id INTEGER PRIMARY KEY)")
+
+    if not exists:
+        conn.execute("INSERT INTO log_hash_queue(id) SELECT id FROM log WHERE deleted_at IS NULL")
+
+    conn.execute("""CREATE TRIGGER IF NOT EXISTS log_hash_after_insert AFTER INSERT ON log WHEN NEW.deleted_at IS NULL BEGIN
+        INSERT OR IGNORE INTO log_hash_queue(id) VALUES (NEW.id);
+    END""")
+    conn.execute("""CREATE TRIGGER IF NOT EXISTS log_hash_after_delete AFTER DELETE ON log BEGIN
+        DELETE FROM log_hash WHERE id=OLD.id;
+        DELETE FROM log_hash_queue WHERE id=OLD.id;
+    END""")
+    conn.execute("""CREATE TRIGGER IF NOT EXISTS log_hash_after_update
+        AFTER UPDATE OF origin, destination, mode, start, end, description, deleted_at ON log BEGIN
+        DELETE FROM log_hash WHERE id=OLD.id;
+        INSERT OR IGNORE INTO log_hash_queue(id) SELECT NEW.id WHERE NEW.deleted_at IS NULL;
+    END""")
+
+def get_all_logs() -> List[Tuple]:
+    # Retrieve all travel logs ordered by ID
+    conn = connection()
+    stmt = f"SELECT {LOG_FIELDS} FROM log WHERE {LIVE} ORDER BY id"
+    rows = conn.execute(stmt).fetchall()
+    return rows
+
+def get_log(log_id: int) -> Optional[Tuple]:
+    # Retrieve specific log by ID, returns None if not found
+    conn = connection()
+    stmt = f"SELECT {LOG_FIELDS} FROM log WHERE id=? AND {LIVE}"
+    row = conn.execute(stmt, (log_id,)).fetchone()
+    return row
+
+def get_logs(log_ids: List[int]) -> List[Tuple]:
+    # Retrieve several logs by ID, chunked to stay under SQLite's variable limit
+    conn = connection()
+    rows = []
+    log_ids = list(log_ids)
+
+    for i in range(0, len(log_ids), 500):
+        chunk = log_ids[i:i + 500]
+        stmt = f"SELECT {LOG_FIELDS} FROM log WHERE id IN ({', '.join('?' * len(chunk))}) AND {LIVE} ORDER BY id"
+        rows.extend(conn.execute(stmt, chunk).fetchall())
+
+    return rows
+
+def iter_log_columns() -> Iterator[Tuple[int, str, str, str, int, int]]:
+    # Stream logs as (id, origin, destination, mode, start epoch, end epoch) without descriptions
+    conn = connection()
+    stmt = f"SELECT {LOG_COLUMNS} FROM log WHERE {LIVE} ORDER BY id"
+    return conn.execute(stmt)
+
+def get_log_columns(log_ids: List[int]) -> List[Tuple[int, str, str, str, int, int]]:
+    # Same layout as iter_log_columns for specific logs
+    conn = connection()
+    rows = []
+    log_ids = list(log_ids)
+
+    for i in range(0, len(log_ids), 500):
+        chunk = log_ids[i:i + 500]
+        stmt = f"SELECT {LOG_COLUMNS} FROM log WHERE id IN ({', '.join('?' * len(chunk))}) AND {LIVE} ORDER BY id"
+        rows.extend(conn.execute(stmt, chunk).fetchall())
+
+    return rows
+
+def get_description(log_id: int) -> str:
+    # Retrieve the description of a single log, empty if not found
+    conn = connection()
+    row = conn.execute(f"SELECT description FROM log WHERE id=? AND {LIVE}", (log_id,)).fetchone()
+    return row[0] if row else ""
+
+def iter_description_order() -> Iterator[Tuple[int]]:
+    # Stream the IDs of the live logs ordered by description, then ID, so sorting reads no description text
+    conn = connection()
+    stmt = f"SELECT id FROM log WHERE {LIVE} ORDER BY COALESCE(description, ''), id"
+    return conn.execute(stmt)
+
+def validate_route(origin: str, destination: str, mode: str):
+    # Validate the required route fields, raising ValueError with a user-facing message
+    if not origin:
+        raise ValueError("Origin is required")
+    if not destination:
+        raise ValueError("Destination is required")
+    if not mode:
+        raise ValueError("Mode is required")
+
+def validate_log(origin: str, destination: str, mode: str, start: str, end: str):
+    # Validate required fields and the stored time format, raising ValueError with a user-facing message
+    validate_route(origin, destination, mode)
+
+    for name, value in (("Start", start), ("End", end)):
+        if not value:
+            raise ValueError(f"{name} is required")
+
+        try:
+            datetime.strptime(value, TIME_FORMAT)
+        except ValueError:
+            raise ValueError(f"{name} '{value}' is not a date and time like 2026-01-31 08:30:00")
+
+def create_log(origin: str, destination: str, mode: str, start: str, end: str, description: str = "") -> int:
+    # Create new travel log and return generated ID
+    validate_log(origin, destination, mode, start, end)
+    
+    # Insert new record
+    stmt = "INSERT INTO log(origin, destination, mode, start, end, description) VALUES (?, ?, ?, ?, ?, ?)"
+    return write_logs(lambda c: (c.execute(stmt, (origin, destination, mode, start, end, description)).lastrowid, text_range(c, [start])))
+
+def create_logs(logs: List[NewLog]):
+    # Insert many already validated rows in one transaction
+    write_logs(lambda c: (c.executemany(LOG_INSERT, logs), text_range(c, [log[3] for log in logs])))
+
+def get_import_progress(source: str) -> Optional[Tuple[str, int, int]]:
+    # Return (fingerprint, batches written, done) recorded for an import source
+    conn = connection()
+    stmt = "SELECT fingerprint, batches, done FROM import_progress WHERE source=?"
+    return conn.execute(stmt, (source,)).fetchone()
+
+def import_logs_batch(source: str, fingerprint: str, batch: int, logs: List[NewLog], done: bool = False):
+    # Insert a validated batch and record the import checkpoint in the same transaction
+    def operation(c: sqlite3.Connection):
+        c.executemany(LOG_INSERT, logs)
+        c.execute(
+            "INSERT OR REPLACE INTO import_progress(source, fingerprint, batches, done) VALUES (?, ?, ?, ?)",
+            (source, fingerprint, batch + 1, int(done))
+        )
+        return None, text_range(c, [log[3] for log in logs])
+
+    write_logs(operation)
+
+def update_log(log_id: int, origin: str, destination: str, mode: str, start: str, end: str, description: str = ""):
+    # Update existing travel log
+    validate_log(origin, destination, mode, start, end)
+    
+    # Update record
+    stmt = "UPDATE log SET origin=?, destination=?, mode=?, start=?, end=?, description=? WHERE id=?"
+
+    def operation(c: sqlite3.Connection):
+        touched = start_range(c, [log_id])
+        c.execute(stmt, (origin, destination, mode, start, end, description, log_id))
+        return None, span(touched, text_range(c, [start]))
+
+    write_logs(operation)
+
+def delete_log(log_id: int):
+    # Tombstone a specific log by ID; restore_logs can bring it back until it is purged
+    delete_logs([log_id])
+
+def clear_all_logs() -> int:
+    # Hide every current log behind a new clear watermark in constant time, returning the clear's sequence number
+    # Route statistics restart empty and readers get a single 'clear' change instead of one per log
+    def operation(c: sqlite3.Connection) -> int:
+        seq = c.execute("INSERT INTO log_clear(max_id, cleared_at) SELECT COALESCE(MAX(id), 0), CAST(strftime('%s') AS INTEGER) FROM log").lastrowid
+        c.execute("DELETE FROM route_stats")
+        c.execute("DELETE FROM route_duration_bucket")
+        c.execute("INSERT INTO log_change(log_id, op) VALUES (0, 'clear')")
+        return seq, ALL_TIME
+
+    return write_logs(operation)
+
+def delete_logs(log_ids: List[int]):
+    # Tombstone several logs by ID in a single transaction
+    stmt = "UPDATE log SET deleted_at=CAST(strftime('%s') AS INTEGER) WHERE id=? AND deleted_at IS NULL"
+    write_logs(lambda c: (c.executemany(stmt, [(log_id,) for log_id in log_ids]), start_range(c, log_ids)))
+
+def restore_logs(log_ids: List[int]) -> int:
+    # Undo deleting logs that have not been purged yet, returning how many came back
+    stmt = "UPDATE log SET deleted_at=NULL WHERE id=? AND deleted_at IS NOT NULL"
+    return write_logs(lambda c: (c.executemany(stmt, [(log_id,) for log_id in log_ids]).rowcount, start_range(c, log_ids)))
+
+def undo_clear(seq: int) -> bool:
+    # Undo a clear while its logs are still within PURGE_AFTER, False if they may already be purged
+    # Readers get a 'restore' change and reload
+    def operation(c: sqlite3.Connection) -> bool:
+        stmt = f"UPDATE log_clear SET undone=1 WHERE seq=? AND undone=0 AND cleared_at > CAST(strftime('%s') AS INTEGER) - {PURGE_AFTER}"
+
+        if c.execute(stmt, (seq,)).rowcount == 0:
+            return False, None
+
+        rebuild_route_stats(c)
+        c.execute("INSERT INTO log_change(log_id, op) VALUES (0, 'restore')")
+        return True, ALL_TIME
+
+    return write_logs(operation)
+
+def purge_logs(c: sqlite3.Connection, chunk_size: int) -> int:
+    # Delete up to chunk_size tombstoned and up to chunk_size cleared logs older than PURGE_AFTER
+    cutoff = f"CAST(strftime('%s') AS INTEGER) - {PURGE_AFTER}"
+    watermark = c.execute(f"SELECT COALESCE(MAX(max_id), 0) FROM log_clear WHERE undone = 0 AND cleared_at <= {cutoff}").fetchone()[0]
+    purged = c.execute("DELETE FROM log WHERE id IN (SELECT id FROM log WHERE id <= ? LIMIT ?)", (watermark, chunk_size)).rowcount
+    purged += c.execute(f"DELETE FROM log WHERE id IN (SELECT id FROM log WHERE deleted_at <= {cutoff} LIMIT ?)", (chunk_size,)).rowcount
+    return purged
+
+def update_logs_mode(log_ids: List[int], mode: str):
+    # Change the mode of several logs in a single transaction
+    if not mode:
+        raise ValueError("Mode is required")
+
+    stmt = "UPDATE log SET mode=? WHERE id=?"
+    write_logs(lambda c: (c.executemany(stmt, [(mode, log_id) for log_id in log_ids]), start_range(c, log_ids)))
+
+def shift_logs(log_ids: List[int], seconds: int):
+    # Move start and end of several logs by an offset in a single transaction
+    # datetime() keeps the stored 'YYYY-MM-DD HH:MM:SS' format
+    offset = f"{int(seconds):+d} seconds"
+    stmt = "UPDATE log SET start=datetime(start, ?), end=datetime(end, ?) WHERE id=?"
+
+    def operation(c: sqlite3.Connection):
+        touched = start_range(c, log_ids)
+        c.executemany(stmt, [(offset, offset, log_id) for log_id in log_ids])
+        return None, span(touched, start_range(c, log_ids))
+
+    write_logs(operation)
+
+def data_version() -> int:
+    # Cheap counter that changes whenever another connection commits to the database
+    conn = connection()
+    return conn.execute("PRAGMA data_version").fetchone()[0]
+
+def last_change_seq() -> int:
+    # Return the newest change sequence number, 0 if nothing was recorded yet
+    conn = connection()
+    row = conn.execute("SELECT MAX(seq) FROM log_change").fetchone()
+    return row[0] or 0
+
+def changes_since(seq: int) -> Optional[List[Tuple[int, int, str]]]:
+    # Return (seq, log_id, op) for changes after seq, collapsed to the latest op per log
+    # Returns None if the changes were pruned and the caller must do a full reload
+    conn = connection()
+    oldest = conn.execute("SELECT MIN(seq) FROM log_change").fetchone()[0]
+
+    if oldest is not None and seq < oldest - 1:
+        return None
+
+    stmt = "SELECT MAX(seq), log_id, op FROM log_change WHERE seq > ? GROUP BY log_id ORDER BY 1"
+    return conn.execute(stmt, (seq,)).fetchall()
+
+def prune_changes(keep: int = 100000):
+    # Drop old change records, always keeping the newest `keep` entries
+    stmt = "DELETE FROM log_change WHERE seq <= (SELECT MAX(seq) FROM log_change) - ?"
+    write(lambda c: c.execute(stmt, (keep,)))
+
+def get_modes() -> List[str]:
+    # Distinct modes in use, alphabetically
+    conn = connection()
+    stmt = f"SELECT DISTINCT mode FROM log WHERE {LIVE} ORDER BY mode"
+    return query_cache.get(stmt, (), lambda: [row[0] for row in conn.execute(stmt)])
+
+def get_start_range(mode: Optional[str] = None) -> Optional[Tuple[int, int]]:
+    # Earliest and latest start epoch, optionally for one mode, None if there are no logs
+    conn = connection()
+    if mode is None:
+        stmt = f"SELECT MIN(start_ts), MAX(start_ts) FROM log WHERE {LIVE}"
+        params = ()
+    else:
+        stmt = f"SELECT MIN(start_ts), MAX(start_ts) FROM log WHERE mode=? AND {LIVE}"
+        params = (mode,)
+
+    row = query_cache.get(stmt, params, lambda: conn.execute(stmt, params).fetchone())
+    return None if row[0] is None else (row[0], row[1])
+
+def iter_duration_series(start_ts: int, end_ts: int, mode: Optional[str] = None) -> Iterator[Tuple[int, int]]:
+    # Stream (start epoch, duration seconds) in time order for a start range using the start index
+    conn = connection()
+    if mode is None:
+        stmt = f"SELECT start_ts, {KNOWN_DURATION} FROM log WHERE start_ts BETWEEN ? AND ? AND {LIVE} ORDER BY start_ts"
+        return conn.execute(stmt, (start_ts, end_ts))
+
+    stmt = f"SELECT start_ts, {KNOWN_DURATION} FROM log WHERE mode=? AND start_ts BETWEEN ? AND ? AND {LIVE} ORDER BY start_ts"
+    return conn.execute(stmt, (mode, start_ts, end_ts))
+
+def get_day_totals(year: int) -> List[Tuple[int, int]]:
+    # (trips, seconds) per day of a year by start time, kept current a day at a time as logs change
+    return day_totals.get(year)
+
+def iter_report_rows(start_ts: int, end_ts: int) -> Iterator[Tuple[int, str, str, str, int, int, int, str]]:
+    # Stream (id, origin, destination, mode, start epoch, end epoch, duration, description) of the logs starting in
+    # [start_ts, end_ts) in time order using the start index, without loading them all
+    conn = connection()
+    stmt = f"SELECT id, origin, destination, mode, {KNOWN_TIMES}, description FROM log WHERE start_ts >= ? AND start_ts < ? AND {LIVE} ORDER BY start_ts, id"
+    return conn.execute(stmt, (start_ts, end_ts))
+
+def get_duration_series(start_ts: int, end_ts: int, mode: Optional[str] = None) -> Tuple[array, array]:
+    # Start epochs and durations for a start range as typed arrays, cached until a write touches the range
+    return query_cache.get("duration_series", (start_ts, end_ts, mode),
+                           lambda: load_series(iter_duration_series(start_ts, end_ts, mode)), (start_ts, end_ts))
+
+def get_route_estimate(origin: str, destination: str, mode: str) -> Optional[RouteEstimate]:
+    # Cached read_route_estimate
+    return query_cache.get("route_estimate", (origin, destination, mode), lambda: read_route_estimate(origin, destination, mode))
+
+def read_route_estimate(origin: str, destination: str, mode: str) -> Optional[RouteEstimate]:
+    # Look up a route's statistics by primary key; quantiles come from its duration histogram
+    conn = connection()
+    stmt = "SELECT count, mean, m2, ewma FROM route_stats WHERE origin=? AND destination=? AND mode=?"
+    row = conn.execute(stmt, (origin, destination, mode)).fetchone()
+
+    if row is None:
+        return None
+
+    count, mean, m2, ewma = row
+    stddev = (m2 / (count - 1)) ** 0.5 if count > 1 else 0.0
+
+    stmt = "SELECT minute, count FROM route_duration_bucket WHERE origin=? AND destination=? AND mode=? ORDER BY minute"
+    buckets = conn.execute(stmt, (origin, destination, mode)).fetchall()
+    quantiles = []
+    seen = 0
+    targets = [count * 0.5, count * 0.9]
+
+    for minute, bucket_count in buckets:
+        seen += bucket_count
+
+        while targets and seen >= targets[0]:
+            quantiles.append(minute * 60)
+            targets.pop(0)
+
+    while len(quantiles) < 2:
+        quantiles.append(int(mean))
+
+    return RouteEstimate(count, mean, stddev, ewma, quantiles[0], quantiles[1])
+
+def get_route_thresholds() -> Dict[Tuple[str, str, str], float]:
+    # Duration above which a trip counts as unusually long, for every route with enough samples
+    conn = connection()
+    stmt = "SELECT origin, destination, mode, mean, m2 / (count - 1) FROM route_stats WHERE count >= ?"
+    return query_cache.get(stmt, (MIN_ROUTE_SAMPLES,), lambda: {
+        (origin, destination, mode): mean + OUTLIER_STDDEVS * max(variance, 0) ** 0.5
+        for origin, destination, mode, mean, variance in conn.execute(stmt, (MIN_ROUTE_SAMPLES,))
+    })
+
+def get_route_templates(limit: int) -> List[Tuple[str, str, str, int]]:
+    # The most frequent (origin, destination, mode, trips) routes, read from the trigger-maintained route statistics
+    conn = connection()
+    stmt = "SELECT origin, destination, mode, count FROM route_stats ORDER BY count DESC, origin, destination, mode LIMIT ?"
+    return query_cache.get(stmt, (limit,), lambda: conn.execute(stmt, (limit,)).fetchall())
+
+def is_unusual_duration(estimate: Optional[RouteEstimate], duration: int) -> bool:
+    # Same rule as get_route_thresholds for a single estimate
+    if estimate is None or estimate.count < MIN_ROUTE_SAMPLES:
+        return False
+
+    return duration > estimate.mean + OUTLIER_STDDEVS * estimate.stddev
+
+def bounding_boxes(lat: float, lon: float, radius: float) -> List[Tuple[float, float, float, float]]:
+    # (min lat, max lat, min lon, max lon) boxes covering a circle, split in two where it crosses the antimeridian
+    lat_span = math.degrees(radius / EARTH_RADIUS)
+    min_lat = max(lat - lat_span, -90.0)
+    max_lat = min(lat + lat_span, 90.0)
+    cos_lat = math.cos(math.radians(max(abs(min_lat), abs(max_lat))))
+
+    if cos_lat <= 0 or lat_span / cos_lat >= 180:
+        return [(min_lat, max_lat, -180.0, 180.0)]
+
+    min_lon = lon - lat_span / cos_lat
+    max_lon = lon + lat_span / cos_lat
+
+    if min_lon < -180:
+        return [(min_lat, max_lat, min_lon + 360, 180.0), (min_lat, max_lat, -180.0, max_lon)]
+    if max_lon > 180:
+        return [(min_lat, max_lat, min_lon, 180.0), (min_lat, max_lat, -180.0, max_lon - 360)]
+
+    return [(min_lat, max_lat, min_lon, max_lon)]
+
+def find_logs_in_box(min_lat: float, max_lat: float, min_lon: float, max_lon: float, endpoint: str = "origin") -> Set[int]:
+    # IDs of logs whose origin, destination, or "either" endpoint lies inside a bounding box
+    # The R*Tree stores 32-bit floats rounded outwards, so candidates are checked against the stored coordinates
+    conn = connection()
+    log_ids: Set[int] = set()
+
+    for name in (ENDPOINTS if endpoint == "either" else (endpoint,)):
+        stmt = f"""SELECT log.id FROM log_{name}_rtree AS box JOIN log ON log.id = box.id
+            WHERE box.max_lat >= ? AND box.min_lat <= ? AND box.max_lon >= ? AND box.min_lon <= ?
+            AND log.{name}_lat BETWEEN ? AND ? AND log.{name}_lon BETWEEN ? AND ? AND {live_filter("log.")}"""
+        params = (min_lat, max_lat, min_lon, max_lon, min_lat, max_lat, min_lon, max_lon)
+        log_ids.update(row[0] for row in conn.execute(stmt, params))
+
+    return log_ids
+
+def find_logs_near(lat: float, lon: float, radius: float, endpoint: str = "origin", log_ids: Optional[List[int]] = None) -> Set[int]:
+    # IDs of logs with an endpoint within radius metres of a point, optionally only among log_ids
+    # Searches over all logs are cached; checking a few given logs is cheap and always reads the database
+    if log_ids is None:
+        return query_cache.get("logs_near", (lat, lon, radius, endpoint), lambda: search_logs_near(lat, lon, radius, endpoint))
+
+    return search_logs_near(lat, lon, radius, endpoint, log_ids)
+
+def search_logs_near(lat: float, lon: float, radius: float, endpoint: str = "origin", log_ids: Optional[List[int]] = None) -> Set[int]:
+    # The R*Tree narrows the search to the circle's bounding box, then exact distances decide
+    conn = connection()
+    found: Set[int] = set()
+
+    for name in (ENDPOINTS if endpoint == "either" else (endpoint,)):
+        candidates = []
+
+        if log_ids is None:
+            for min_lat, max_lat, min_lon, max_lon in bounding_boxes(lat, lon, radius):
+                stmt = f"""SELECT log.id, log.{name}_lat, log.{name}_lon FROM log_{name}_rtree AS box JOIN log ON log.id = box.id
+                    WHERE box.max_lat >= ? AND box.min_lat <= ? AND box.max_lon >= ? AND box.min_lon <= ? AND {live_filter("log.")}"""
+                candidates.extend(conn.execute(stmt, (min_lat, max_lat, min_lon, max_lon)))
+        else:
+            # Checking a few known logs directly beats scanning every box near a busy place
+            ids = list(log_ids)
+
+            for i in range(0, len(ids), 500):
+                chunk = ids[i:i + 500]
+                stmt = f"""SELECT id, {name}_lat, {name}_lon FROM log
+                    WHERE id IN ({', '.join('?' * len(chunk))}) AND {name}_lat IS NOT NULL AND {name}_lon IS NOT NULL AND {LIVE}"""
+                candidates.extend(conn.execute(stmt, chunk))
+
+        found.update(log_id for log_id, log_lat, log_lon in candidates if distance(lat, lon, log_lat, log_lon) <= radius)
+
+    return found
+
+def find_logs_matching(expression: str, log_ids: Optional[List[int]] = None) -> Set[int]:
+    # IDs of logs matching a filter expression (see core.filters), optionally only among log_ids
+    # Searches over all logs are cached and only dropped by writes within the start range the filter allows
+    compiled = compile_filter(expression)
+    conn = connection()
+
+    if log_ids is None:
+        stmt = f"SELECT id FROM log WHERE {compiled.where} AND {LIVE}"
+        return query_cache.get(stmt, compiled.params, lambda: {row[0] for row in conn.execute(stmt, compiled.params)}, compiled.scope)
+
+    found: Set[int] = set()
+    log_ids = list(log_ids)
+
+    for i in range(0, len(log_ids), 500):
+        chunk = log_ids[i:i + 500]
+        stmt = f"SELECT id FROM log WHERE id IN ({', '.join('?' * len(chunk))}) AND {compiled.where} AND {LIVE}"
+        found.update(row[0] for row in conn.execute(stmt, (*chunk, *compiled.params)))
+
+    return found
+
+def get_views() -> List[Tuple[str, str]]:
+    # Saved (name, expression) views in name order
+    conn = connection()
+    return conn.execute("SELECT name, expression FROM saved_view ORDER BY name COLLATE NOCASE").fetchall()
+
+def save_view(name: str, expression: str):
+    # Save a view under name, replacing the expression of an existing view with that name
+    if not name.strip():
+        raise ValueError("View name is required")
+
+    compile_filter(expression)
+    write(lambda c: c.execute("INSERT INTO saved_view(name, expression) VALUES (?, ?) ON CONFLICT(name) DO UPDATE SET expression=excluded.expression",
+                              (name.strip(), expression.strip())))
+
+def delete_view(name: str):
+    write(lambda c: c.execute("DELETE FROM saved_view WHERE name=?", (name,)))
+
+def parse_clock(text: str) -> str:
+    # "H:MM" or "HH:MM" to "HH:MM", raising ValueError with a user-facing message
+    parts = text.strip().split(":")
+
+    if len(parts) != 2 or not all(part.isdigit() for part in parts) or int(parts[0]) > 23 or len(parts[1]) != 2 or int(parts[1]) > 59:
+        raise ValueError(f"'{text}' is not a time like 08:30")
+
+    return f"{int(parts[0]):02d}:{parts[1]}"
+
+def parse_day(text: str) -> str:
+    # "YYYY-MM-DD", raising ValueError with a user-facing message
+    try:
+        return date.fromisoformat(text.strip()).isoformat()
+    except ValueError:
+        raise ValueError(f"'{text}' is not a date like 2026-01-31")
+
+def clock_minutes(start_time: str, end_time: str) -> int:
+    # Minutes from start to end, into the next day when the end is not after the start
+    minutes = (int(end_time[:2]) - int(start_time[:2])) * 60 + int(end_time[3:]) - int(start_time[3:])
+    return minutes if minutes > 0 else minutes + 24 * 60
+
+def clock_after(start_time: str, minutes: int) -> str:
+    # "HH:MM" the given number of minutes after start_time
+    total = (int(start_time[:2]) * 60 + int(start_time[3:]) + minutes) % (24 * 60)
+    return f"{total // 60:02d}:{total % 60:02d}"
+
+def create_schedule(origin: str, destination: str, mode: str, weekdays: int, start_time: str, end_time: str, first_date: str,
+                    description: str = "", expanded_until: str = "") -> int:
+    # Create a recurring trip on the weekdays whose bits are set (bit 0 = Monday) from first_date on, returning its ID
+    # Occurrences starting at or before expanded_until ("YYYY-MM-DD HH:MM:SS") are taken as already logged
+    validate_route(origin, destination, mode)
+
+    if not 0 < weekdays < 1 << 7:
+        raise ValueError("Pick at least one weekday")
+
+    row = (origin, destination, mode, weekdays, parse_clock(start_time), parse_clock(end_time), description, parse_day(first_date), expanded_until)
+    stmt = """INSERT INTO schedule(origin, destination, mode, weekdays, start_time, end_time, description, first_date, expanded_until)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+    return write(lambda c: c.execute(stmt, row).lastrowid)
+
+def get_schedules() -> List[Schedule]:
+    # Schedules that still have occurrences from today on, oldest first
+    conn = connection()
+    stmt = f"SELECT {SCHEDULE_FIELDS} FROM schedule WHERE last_date IS NULL OR last_date >= ? ORDER BY id"
+    return [Schedule(*row) for row in conn.execute(stmt, (date.today().isoformat(),))]
+
+def end_schedule(schedule_id: int, last_date: str):
+    # Stop a schedule after last_date; occurrences already logged stay
+    write(lambda c: c.execute("UPDATE schedule SET last_date=? WHERE id=?", (parse_day(last_date), schedule_id)))
+
+def skip_occurrence(schedule_id: int, day: str):
+    # Leave one date of a schedule out; a later override of the same date replaces the skip
+    write(lambda c: c.execute("INSERT OR REPLACE INTO schedule_exception(schedule_id, date, skip) VALUES (?, ?, 1)", (schedule_id, parse_day(day))))
+
+def override_occurrence(schedule_id: int, day: str, origin: Optional[str] = None, destination: Optional[str] = None, mode: Optional[str] = None,
+                        start_time: Optional[str] = None, end_time: Optional[str] = None, description: Optional[str] = None):
+    # Log one date of a schedule with different values; None keeps the schedule's value
+    row = (schedule_id, parse_day(day), origin or None, destination or None, mode or None,
+           start_time and parse_clock(start_time), end_time and parse_clock(end_time), description)
+    stmt = """INSERT OR REPLACE INTO schedule_exception(schedule_id, date, skip, origin, destination, mode, start_time, end_time, description)
+        VALUES (?, ?, 0, ?, ?, ?, ?, ?, ?)"""
+    write(lambda c: c.execute(stmt, row))
+
+def next_occurrence(schedule: Schedule, now: Optional[str] = None) -> Optional[str]:
+    # Date of the first occurrence that has not started by now and is not skipped, None if the schedule has ended
+    now = now or time.strftime("%Y-%m-%d %H:%M:%S")
+    conn = connection()
+    stmt = "SELECT date, skip, start_time FROM schedule_exception WHERE schedule_id=? AND date>=?"
+    exceptions = {row[0]: row[1:] for row in conn.execute(stmt, (schedule.id, now[:10]))}
+    skipped = {text for text, (skip, _) in exceptions.items() if skip}
+    day = date.fromisoformat(max(now[:10], schedule.first_date))
+
+    # Any weekday pattern repeats within a week, so a week past the latest skip is far enough
+    for _ in range(7 * (len(skipped) + 2)):
+        text = day.isoformat()
+
+        if schedule.last_date is not None and text > schedule.last_date:
+            return None
+
+        start_time = exceptions.get(text, (0, None))[1] or schedule.start_time
+
+        if schedule.weekdays >> day.weekday() & 1 and f"{text} {start_time}:00" > max(now, schedule.expanded_until) and text not in skipped:
+            return text
+
+        day += timedelta(days=1)
+
+    return None
+
+def schedule_occurrences(schedule: Schedule, now: str, exceptions: Dict[Tuple[int, str], Tuple]) -> Tuple[List[NewLog], Optional[str]]:
+    # Logs for the occurrences that started after schedule.expanded_until and by now, with their overrides applied,
+    # and the newest start considered
+    # Skipped occurrences count as considered so they are not looked at again
+    last = min(now[:10], schedule.last_date or now[:10])
+    day = date.fromisoformat(max(schedule.first_date, schedule.expanded_until[:10]))
+    logs: List[NewLog] = []
+    newest = None
+
+    while day.isoformat() <= last:
+        text = day.isoformat()
+
+        if schedule.weekdays >> day.weekday() & 1:
+            skip, *overrides = exceptions.get((schedule.id, text), (0, None, None, None, None, None, None))
+            defaults = (schedule.origin, schedule.destination, schedule.mode, schedule.start_time, schedule.end_time, schedule.description)
+            origin, destination, mode, start_time, end_time, description = (default if value is None else value for value, default in zip(overrides, defaults))
+
+            # An end at or before the start time is on the next day; moving only the start keeps the trip length
+            if overrides[3] is not None and overrides[4] is None:
+                end_time = clock_after(start_time, clock_minutes(schedule.start_time, schedule.end_time))
+
+            # Due once the start as overridden has passed, so an occurrence moved later is not logged early
+            start = f"{text} {start_time}:00"
+
+            if schedule.expanded_until < start <= now:
+                newest = start
+
+                if not skip:
+                    end_day = day + timedelta(days=1) if end_time <= start_time else day
+                    logs.append((origin, destination, mode, start, f"{end_day.isoformat()} {end_time}:00", description, None, None, None, None))
+
+        day += timedelta(days=1)
+
+    return logs, newest
+
+def expand_schedules(now: Optional[str] = None) -> int:
+    # Log every schedule occurrence that has started since the last expansion, returning how many were logged
+    # All schedules are expanded in one transaction with a single bulk insert, so catching up on a long
+    # absence costs the same few statements as a normal day
+    now = now or time.strftime("%Y-%m-%d %H:%M:%S")
+
+    def operation(c: sqlite3.Connection):
+        stmt = f"SELECT {SCHEDULE_FIELDS} FROM schedule WHERE first_date <= ? AND expanded_until < ? AND (last_date IS NULL OR expanded_until < last_date || ' 24')"
+        schedules = [Schedule(*row) for row in c.execute(stmt, (now[:10], now))]
+
+        if not schedules:
+            return 0, None
+
+        stmt = """SELECT e.schedule_id, e.date, e.skip, e.origin, e.destination, e.mode, e.start_time, e.end_time, e.description
+            FROM schedule_exception AS e JOIN schedule AS s ON s.id = e.schedule_id
+            WHERE e.date >= substr(s.expanded_until, 1, 10) AND e.date <= ?"""
+        exceptions = {(schedule_id, day): rest for schedule_id, day, *rest in c.execute(stmt, (now[:10],))}
+        logs: List[NewLog] = []
+        expanded = []
+
+        for schedule in schedules:
+            occurrences, newest = schedule_occurrences(schedule, now, exceptions)
+            logs.extend(occurrences)
+
+            if newest is not None:
+                expanded.append((newest, schedule.id))
+
+        c.executemany(LOG_INSERT, logs)
+        c.executemany("UPDATE schedule SET expanded_until=? WHERE id=?", expanded)
+        return len(logs), text_range(c, [log[3] for log in logs])
+
+    return write_logs(operation)
+
+def get_place_location(name: str) -> Optional[Tuple[float, float]]:
+    # Average coordinates recorded for a place name used as origin or destination, None if never geotagged
+    conn = connection()
+    stmt = f"""SELECT AVG(lat), AVG(lon) FROM (
+        SELECT origin_lat AS lat, origin_lon AS lon FROM log WHERE origin=? AND origin_lat IS NOT NULL AND origin_lon IS NOT NULL AND {LIVE}
+        UNION ALL
+        SELECT destination_lat, destination_lon FROM log WHERE destination=? AND destination_lat IS NOT NULL AND destination_lon IS NOT NULL AND {LIVE}
+    )"""
+    row = query_cache.get(stmt, (name, name), lambda: conn.execute(stmt, (name, name)).fetchone())
+    return None if row[0] is None else (row[0], row[1])
+
+def iter_log_export(chunk_size: int = 65536) -> Iterator:
+    # Yield the row count, then lists of (id, origin, destination, mode, start epoch, end epoch, duration, description)
+    # All reads happen in one transaction so the count matches the rows; it runs on its own connection,
+    # so a transaction open on the shared one is neither joined nor ended
+    c = open_connection()
+
+    try:
+        if memory_database():
+            c.execute("PRAGMA read_uncommitted=1")
+
+        c.execute("BEGIN")
+        yield c.execute(f"SELECT COUNT(*) FROM log WHERE {LIVE}").fetchone()[0]
+        cursor = c.execute(f"SELECT id, origin, destination, mode, {KNOWN_TIMES}, description FROM log WHERE {LIVE} ORDER BY id")
+
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+
+            if not rows:
+                break
+
+            yield rows
+    finally:
+        c.close()
+
+def trip_hash(origin: str, destination: str, mode: str, start: str, end: str, description: Optional[str]) -> int:
+    # Stable 64-bit content hash of a trip; the same trip hashes the same on every device whatever its ID
+    text = "\x1f".join((origin, destination, mode, start, end, description or ""))
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little", signed=True)
+
+def hash_pending(c: sqlite3.Connection, chunk_size: int) -> int:
+    # Hash up to chunk_size queued logs, returning how many were taken off the queue
+    # Logs tombstoned since they were queued are dropped; restoring them queues them again
+    stmt = """SELECT log.id, deleted_at, substr(start, 1, 7), origin, destination, mode, start, end, description
+        FROM log_hash_queue JOIN log ON log.id = log_hash_queue.id ORDER BY log_hash_queue.id LIMIT ?"""
+    rows = c.execute(stmt, (chunk_size,)).fetchall()
+
+    if rows:
+        hashes = [(row[0], row[2], trip_hash(*row[3:])) for row in rows if row[1] is None]
+        c.executemany("INSERT OR REPLACE INTO log_hash(id, month, hash) VALUES (?, ?, ?)", hashes)
+        c.execute("DELETE FROM log_hash_queue WHERE id <= ?", (rows[-1][0],))
+
+    return len(rows)
+
+# Content hashes of the live logs as (id, month, hash), hashing logs still queued as they are read,
+# so a read-only connection sees current hashes; needs the trip_hash function registered by open_read_only
+MERGE_HASHES = f"""merge_hash(id, month, hash) AS (
+    SELECT id, month, hash FROM log_hash WHERE id > {CLEARED_THROUGH}
+    UNION ALL
+    SELECT log.id, substr(start, 1, 7), trip_hash(origin, destination, mode, start, end, description)
+    FROM log_hash_queue JOIN log ON log.id = log_hash_queue.id WHERE {live_filter("log.")})"""
+
+def open_read_only(location: str) -> sqlite3.Connection:
+    # Read-only connection to a database file for merging; nothing is migrated or written through it
+    target, uri = resolve_database(location)
+    if uri:
+        target += ("&" if "?" in target else "?") + "mode=ro"
+    else:
+        target = Path(target).as_uri() + "?mode=ro"
+
+    c = sqlite3.connect(target, uri=True)
+    c.create_function("trip_hash", 6, trip_hash, deterministic=True)
+    return c
+
+def schema_version(c: sqlite3.Connection) -> int:
+    # Schema version a database was last migrated to by init_table
+    return c.execute("PRAGMA user_version").fetchone()[0]
+
+def get_month_digests(c: sqlite3.Connection) -> Dict[str, Tuple[int, int, int]]:
+    # (count, sum of the low 32 bits, sum of the high 32 bits) of the content hashes per start month
+    # The sums are order-independent, so databases holding the same trips have equal digests whatever their IDs,
+    # and split in halves so they cannot overflow; hashed logs are read from the (month, hash) index alone
+    stmt = f"""WITH {MERGE_HASHES}
+        SELECT month, COUNT(*), SUM(hash & 4294967295), SUM((hash >> 32) & 4294967295) FROM merge_hash GROUP BY month"""
+    return {row[0]: row[1:] for row in c.execute(stmt)}
+
+def get_month_hashes(c: sqlite3.Connection, month: str) -> List[int]:
+    # Content hashes of the live logs starting in a month ("YYYY-MM"), one per log
+    stmt = f"WITH {MERGE_HASHES} SELECT hash FROM merge_hash WHERE month=?"
+    return [row[0] for row in c.execute(stmt, (month,))]
+
+def get_month_logs(c: sqlite3.Connection, month: str, hashes: List[int]) -> List[Tuple[int, NewLog]]:
+    # (hash, log) for the live logs of a month with one of the given hashes, in the bulk insert layout
+    logs = []
+
+    for i in range(0, len(hashes), 500):
+        chunk = hashes[i:i + 500]
+        stmt = f"""WITH {MERGE_HASHES}
+            SELECT merge_hash.hash, origin, destination, mode, start, end, description,
+            origin_lat, origin_lon, destination_lat, destination_lon
+            FROM merge_hash JOIN log ON log.id = merge_hash.id
+            WHERE merge_hash.month=? AND merge_hash.hash IN ({', '.join('?' * len(chunk))})"""
+        logs.extend((row[0], row[1:]) for row in c.execute(stmt, [month] + chunk))
+
+    return logs
+
+# Idle-time maintenance: each step runs one bounded slice so the writer is never held for long
+# (task, seconds between runs); purge, vacuum and hash run again straight away while they still find work
+MAINTENANCE_TASKS = (("purge", 5), ("vacuum", 5), ("hash", 5), ("analyze", 60 * 60), ("check", 6 * 60 * 60))
+PURGE_CHUNK = 2000
+HASH_CHUNK = 5000
+VACUUM_PAGES = 512
+ANALYSIS_LIMIT = 1000
+
+class MaintenanceResult(NamedTuple):
+    # Outcome of one maintenance slice; sizes are in bytes and taken after the slice
+    task: str
+    detail: str  # What was done, empty if there was nothing to do
+    seconds: float
+    size: int
+    free: int
+    problems: List[str]  # Integrity check findings, empty when healthy
+
+def database_size(c: sqlite3.Connection) -> Tuple[int, int]:
+    # (file size, size of the free-page list) in bytes
+    page_size = c.execute("PRAGMA page_size").fetchone()[0]
+    pages = c.execute("PRAGMA page_count").fetchone()[0]
+    free_pages = c.execute("PRAGMA freelist_count").fetchone()[0]
+    return pages * page_size, free_pages * page_size
+
+def purge_task(c: sqlite3.Connection) -> Tuple[str, List[str]]:
+    purged = purge_logs(c, PURGE_CHUNK)
+    return (f"Purged {purged} deleted logs" if purged else ""), []
+
+def vacuum_task(c: sqlite3.Connection) -> Tuple[str, List[str]]:
+    # Runs outside a transaction: a database from before version 2 is first switched to incremental
+    # auto-vacuum, which takes one full VACUUM
+    if c.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+        c.executescript("PRAGMA auto_vacuum=INCREMENTAL; VACUUM")
+        return "Switched the database to incremental auto-vacuum", []
+
+    # executescript steps the pragma to completion; execute() would step it once and release a single page
+    free_pages = c.execute("PRAGMA freelist_count").fetchone()[0]
+    c.executescript(f"PRAGMA incremental_vacuum({min(free_pages, VACUUM_PAGES)})")
+    released = free_pages - c.execute("PRAGMA freelist_count").fetchone()[0]
+    return (f"Released {released} free pages" if released else ""), []
+
+def hash_task(c: sqlite3.Connection) -> Tuple[str, List[str]]:
+    # Keeps content hashes current so a merge does not have to hash everything first
+    hashed = hash_pending(c, HASH_CHUNK)
+    return (f"Hashed {hashed} logs for merging" if hashed else ""), []
+
+def analyze_task(c: sqlite3.Connection) -> Tuple[str, List[str]]:
+    # analysis_limit samples large indexes instead of scanning them, keeping the slice short
+    c.execute(f"PRAGMA analysis_limit={ANALYSIS_LIMIT}")
+    c.execute("ANALYZE")
+    return "Refreshed query planner statistics", []
+
+def timed(task: str, operation: Callable[[sqlite3.Connection], Tuple[str, List[str]]]) -> Callable[[sqlite3.Connection], MaintenanceResult]:
+    # Wrap a maintenance operation so it reports its own run time and the database size
+    def run(c: sqlite3.Connection) -> MaintenanceResult:
+        started = time.perf_counter()
+        detail, problems = operation(c)
+        return MaintenanceResult(task, detail, time.perf_counter() - started, *database_size(c), problems)
+
+    return run
+
+def quote(name: str) -> str:
+    # SQL identifier quoting for names read from sqlite_master
+    return '"' + name.replace('"', '""') + '"'
+
+def submit_check() -> Future:
+    # Run quick_check table by table on a separate read connection, so writes are not held up
+    # Each table is its own read transaction; the log table alone can take seconds on a large database
+    future: Future = Future()
+    future.set_running_or_notify_cancel()
+
+    def check(c: sqlite3.Connection) -> Tuple[str, List[str]]:
+        # Virtual tables are covered by their shadow tables
+        stmt = "SELECT name FROM sqlite_master WHERE type='table' AND sql NOT LIKE 'CREATE VIRTUAL%' ORDER BY name"
+        tables = [row[0] for row in c.execute(stmt)]
+        problems = []
+
+        for table in tables:
+            problems.extend(f"{table}: {row[0]}" for row in c.execute(f"PRAGMA quick_check({quote(table)})") if row[0] != "ok")
+
+        return f"Integrity check of {len(tables)} tables {'found problems' if problems else 'passed'}", problems
+
+    def run():
+        c = open_connection()
+
+        try:
+            if memory_database():
+                c.execute("PRAGMA read_uncommitted=1")
+
+            future.set_result(timed("check", check)(c))
+        except Exception as e:
+            future.set_exception(e)
+        finally:
+            c.close()
+
+    threading.Thread(target=run, name="db-check", daemon=True).start()
+    return future
+
+MAINTENANCE_OPERATIONS = {"purge": purge_task, "vacuum": vacuum_task, "hash": hash_task, "analyze": analyze_task}
+
+class Maintenance:
+    # Scheduler for database upkeep; the caller runs step() when the app is idle and the previous slice is done
+    # Results are kept in history, newest last
+    def __init__(self):
+        self.last_run = {task: -math.inf for task, _ in MAINTENANCE_TASKS}
+        self.history: "deque[MaintenanceResult]" = deque(maxlen=50)
+
+    def step(self) -> Optional[Future]:
+        # Start the next due slice, returning its future, or None if nothing is due
+        now = time.monotonic()
+
+        for task, interval in MAINTENANCE_TASKS:
+            if now - self.last_run[task] < interval:
+                continue
+
+            self.last_run[task] = now
+
+            if task == "vacuum" and database_size(connection())[1] == 0 and connection().execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+                continue
+            if task == "check":
+                return self.track(submit_check())
+
+            return self.track(submit_write(timed(task, MAINTENANCE_OPERATIONS[task]), transaction=task != "vacuum"))
+
+        return None
+
+    def track(self, future: Future) -> Future:
+        future.add_done_callback(self.finished)
+        return future
+
+    def finished(self, future: Future):
+        # Runs on the thread that resolved the future
+        if future.exception() is not None:
+            return
+
+        result = future.result()
+        self.history.append(result)
+
+        # Keep draining while there are tombstones to purge, pages to release or logs to hash
+        if result.task in ("purge", "vacuum", "hash") and result.detail:
+            self.last_run[result.task] = -math.inf
@@ -0,0 +1,57 @@
+from array import array
+from typing import Iterable, List, Sequence, Tuple
+
+def load_series(points: Iterable[Tuple[int, int]]) -> Tuple[array, array]:
+    # Collect (x, y) rows from a cursor into two typed arrays
+    xs = array("q")
+    ys = array("q")
+
+    for x, y in points:
+        xs.append(x)
+        ys.append(y)
+
+    return xs, ys
+
+def lttb(xs: Sequence[float], ys: Sequence[float], threshold: int) -> Tuple[List[float], List[float]]:
+    # Largest-Triangle-Three-Buckets: keep `threshold` points that preserve the visual shape
+    # First and last points are always kept; each bucket keeps the point forming the largest
+    # triangle with the previously kept point and the average of the next bucket
+    n = len(xs)
+
+    if threshold >= n or threshold < 3:
+        return list(xs), list(ys)
+
+    sampled_xs = [xs[0]]
+    sampled_ys = [ys[0]]
+    bucket_size = (n - 2) / (threshold - 2)
+    a = 0
+
+    for i in range(threshold - 2):
+        # Average of the next bucket, the third triangle corner
+        next_start = int((i + 1) * bucket_size) + 1
+        next_end = min(int((i + 2) * bucket_size) + 1, n)
+        count = next_end - next_start
+        average_x = sum(xs[next_start:next_end]) / count
+        average_y = sum(ys[next_start:next_end]) / count
+
+        # Pick the point of the current bucket with the largest triangle area
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        ax, ay = xs[a], ys[a]
+        largest = -1.0
+        chosen = start
+
+        for j in range(start, end):
+            area = abs((ax - average_x) * (ys[j] - ay) - (ax - xs[j]) * (average_y - ay))
+
+            if area > largest:
+                largest = area
+                chosen = j
+
+        sampled_xs.append(xs[chosen])
+        sampled_ys.append(ys[chosen])
+        a = chosen
+
+    sampled_xs.append(xs[n - 1])
+    sampled_ys.append(ys[n - 1])
+    return sampled_xs, sampled_ys
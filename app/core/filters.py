@@ -0,0 +1,300 @@
+import calendar
+import math
+import re
+from collections import OrderedDict
+from typing import List, NamedTuple, Tuple
+
+# Filter expressions select logs with conditions on their columns, for example
+#   mode in (Bus, Walk) and start >= 2026-01-01 and duration > 45m and origin ~ "Station"
+# They are parsed once into a parameterized WHERE clause over the typed columns, so a filter runs as one
+# indexed query. Values never become part of the SQL text.
+#
+#   expression := term ("or" term)*
+#   term       := factor ("and" factor)*
+#   factor     := "not" factor | "(" expression ")" | condition
+#   condition  := field ("=" | "!=" | "<" | "<=" | ">" | ">=") value
+#               | text_field ("~" | "!~") value
+#               | text_field ["not"] "in" "(" value ("," value)* ")"
+
+# Text fields compare exactly with = and in; ~ is a case-insensitive "contains"
+TEXT_FIELDS = {"origin": "origin", "destination": "destination", "mode": "mode", "description": "IFNULL(description, '')"}
+
+# Time fields take a date or date and time; a value covers its whole day, minute or second
+TIME_FIELDS = {"start": "start_ts", "end": "end_ts"}
+
+# Duration takes 45m, 1h30m, 2h, 90s, 1d or plain minutes
+DURATION_FIELDS = {"duration": "duration"}
+
+COMPARISONS = ("=", "!=", "<", "<=", ">", ">=")
+KEYWORDS = ("and", "or", "not", "in")
+
+TOKEN = re.compile(r"""\s*(?:
+    (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+    |(?P<op><=|>=|!=|!~|=|<|>|~|\(|\)|,)
+    |(?P<word>[^\s"'(),=<>!~]+)
+)""", re.VERBOSE)
+
+TIME_VALUE = re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})(?:[ T](\d{1,2}):(\d{2})(?::(\d{2}))?)?")
+DURATION_VALUE = re.compile(r"(?:(\d+)d)?(?:(\d+)h)?(?:(\d+)m)?(?:(\d+)s)?")
+
+# Compiled filters by expression text, so re-applying a view or re-checking changed logs skips parsing
+COMPILED_LIMIT = 256
+
+# Start-time range the matching logs lie in, in epoch seconds
+StartRange = Tuple[float, float]
+ANY_START: StartRange = (-math.inf, math.inf)
+
+class CompiledFilter(NamedTuple):
+    where: str  # Parameterized condition over the log table
+    params: Tuple
+    scope: StartRange  # Every matching log starts in this range
+
+class Token(NamedTuple):
+    kind: str  # "string", "op", "word" or "end"
+    text: str
+    position: int
+
+def tokenize(expression: str) -> List[Token]:
+    # Split an expression into quoted strings, operators and bare words
+    tokens = []
+    position = 0
+    expression = expression.rstrip()
+
+    while position < len(expression):
+        match = TOKEN.match(expression, position)
+
+        if match is None or match.end() == position:
+            raise ValueError(f"Unexpected '{expression[position:].strip()[:20]}' at position {position + 1}")
+
+        kind = match.lastgroup
+        text = match.group(kind)
+
+        if kind == "string":
+            text = re.sub(r"\\(.)", r"\1", text[1:-1])
+
+        tokens.append(Token(kind, text, match.start(kind)))
+        position = match.end()
+
+    tokens.append(Token("end", "", len(expression)))
+    return tokens
+
+def parse_time(text: str) -> Tuple[int, int]:
+    # Epoch of a date or date and time read as UTC, like stored times, and the length of the period it names
+    match = TIME_VALUE.fullmatch(text)
+
+    if match is None:
+        raise ValueError(f"'{text}' is not a date like 2026-01-31 or a time like \"2026-01-31 08:30\"")
+
+    year, month, day, hour, minute, second = (int(part) if part is not None else None for part in match.groups())
+
+    if not 1 <= month <= 12 or not 1 <= day <= calendar.monthrange(year, month)[1] or (hour is not None and (hour > 23 or minute > 59 or (second or 0) > 59)):
+        raise ValueError(f"'{text}' is not a valid date or time")
+
+    epoch = calendar.timegm((year, month, day, hour or 0, minute or 0, second or 0))
+
+    if hour is None:
+        return epoch, 86400
+
+    return epoch, 60 if second is None else 1
+
+def parse_duration(text: str) -> int:
+    # Seconds of 45m, 1h30m, 2h, 90s, 1d or a plain number of minutes
+    if text.isdigit():
+        return int(text) * 60
+
+    match = DURATION_VALUE.fullmatch(text.lower())
+
+    if match is None or not any(match.groups()):
+        raise ValueError(f"'{text}' is not a duration like 45m, 1h30m or 2h")
+
+    days, hours, minutes, seconds = (int(part or 0) for part in match.groups())
+    return ((days * 24 + hours) * 60 + minutes) * 60 + seconds
+
+def like_pattern(text: str) -> str:
+    # LIKE pattern matching text anywhere, with wildcards in text taken literally
+    return "%" + re.sub(r"([\\%_])", r"\\\1", text) + "%"
+
+def intersect(a: StartRange, b: StartRange) -> StartRange:
+    return max(a[0], b[0]), min(a[1], b[1])
+
+def union(a: StartRange, b: StartRange) -> StartRange:
+    return min(a[0], b[0]), max(a[1], b[1])
+
+class Parser:
+    # Recursive descent parser producing (SQL condition, parameters, start range) for each rule
+    def __init__(self, expression: str):
+        self.tokens = tokenize(expression)
+        self.position = 0
+
+    def peek(self) -> Token:
+        return self.tokens[self.position]
+
+    def take(self) -> Token:
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+
+    def keyword(self, word: str) -> bool:
+        # Consume a keyword if it is next
+        token = self.peek()
+
+        if token.kind == "word" and token.text.lower() == word:
+            self.position += 1
+            return True
+
+        return False
+
+    def expect(self, text: str):
+        token = self.take()
+
+        if token.kind != "op" or token.text != text:
+            raise ValueError(f"Expected '{text}' {self.where(token)}")
+
+    def where(self, token: Token) -> str:
+        return "at the end" if token.kind == "end" else f"at '{token.text}' (position {token.position + 1})"
+
+    def parse(self) -> CompiledFilter:
+        sql, params, scope = self.expression()
+        token = self.peek()
+
+        if token.kind != "end":
+            raise ValueError(f"Expected 'and', 'or' or the end {self.where(token)}")
+
+        return CompiledFilter(sql, tuple(params), scope)
+
+    def expression(self) -> Tuple[str, list, StartRange]:
+        sql, params, scope = self.term()
+        parts = [sql]
+
+        while self.keyword("or"):
+            sql, more, other = self.term()
+            parts.append(sql)
+            params += more
+            scope = union(scope, other)
+
+        return (parts[0] if len(parts) == 1 else "(" + " OR ".join(parts) + ")"), params, scope
+
+    def term(self) -> Tuple[str, list, StartRange]:
+        sql, params, scope = self.factor()
+        parts = [sql]
+
+        while self.keyword("and"):
+            sql, more, other = self.factor()
+            parts.append(sql)
+            params += more
+            scope = intersect(scope, other)
+
+        return (parts[0] if len(parts) == 1 else "(" + " AND ".join(parts) + ")"), params, scope
+
+    def factor(self) -> Tuple[str, list, StartRange]:
+        if self.keyword("not"):
+            sql, params, _ = self.factor()
+            return f"NOT ({sql})", params, ANY_START
+
+        token = self.peek()
+
+        if token.kind == "op" and token.text == "(":
+            self.take()
+            result = self.expression()
+            self.expect(")")
+            return result
+
+        return self.condition()
+
+    def value(self) -> str:
+        token = self.take()
+
+        if token.kind == "string" or (token.kind == "word" and token.text.lower() not in KEYWORDS):
+            return token.text
+
+        raise ValueError(f"Expected a value {self.where(token)}")
+
+    def condition(self) -> Tuple[str, list, StartRange]:
+        token = self.take()
+        field = token.text.lower()
+
+        if token.kind != "word" or field not in {**TEXT_FIELDS, **TIME_FIELDS, **DURATION_FIELDS}:
+            raise ValueError(f"Expected a field ({', '.join([*TEXT_FIELDS, *TIME_FIELDS, *DURATION_FIELDS])}) {self.where(token)}")
+
+        if field in TEXT_FIELDS:
+            return self.text_condition(TEXT_FIELDS[field])
+
+        operator = self.take()
+
+        if operator.kind != "op" or operator.text not in COMPARISONS:
+            raise ValueError(f"Expected a comparison ({' '.join(COMPARISONS)}) after '{token.text}' {self.where(operator)}")
+
+        if field in DURATION_FIELDS:
+            return f"{DURATION_FIELDS[field]} {operator.text} ?", [parse_duration(self.value())], ANY_START
+
+        return self.time_condition(field, TIME_FIELDS[field], operator.text, *parse_time(self.value()))
+
+    def text_condition(self, column: str) -> Tuple[str, list, StartRange]:
+        negate = self.keyword("not")
+
+        if self.keyword("in"):
+            self.expect("(")
+            values = [self.value()]
+
+            while self.peek().kind == "op" and self.peek().text == ",":
+                self.take()
+                values.append(self.value())
+
+            self.expect(")")
+            return f"{column} {'NOT IN' if negate else 'IN'} ({', '.join('?' * len(values))})", values, ANY_START
+
+        operator = self.take()
+
+        if negate:
+            raise ValueError(f"Expected 'in' after 'not' {self.where(operator)}")
+        elif operator.kind == "op" and operator.text in ("=", "!="):
+            return f"{column} {operator.text} ?", [self.value()], ANY_START
+        elif operator.kind == "op" and operator.text in ("~", "!~"):
+            return f"{column} {'NOT LIKE' if operator.text == '!~' else 'LIKE'} ? ESCAPE '\\'", [like_pattern(self.value())], ANY_START
+
+        raise ValueError(f"Expected = != ~ !~ or in after a text field {self.where(operator)}")
+
+    def time_condition(self, field: str, column: str, operator: str, epoch: int, length: int) -> Tuple[str, list, StartRange]:
+        # A value names the period [epoch, epoch + length), so "start <= 2026-01-31" includes that whole day
+        if operator == "=":
+            sql, params, low, high = f"({column} >= ? AND {column} < ?)", [epoch, epoch + length], epoch, epoch + length - 1
+        elif operator == "!=":
+            sql, params, low, high = f"({column} < ? OR {column} >= ?)", [epoch, epoch + length], -math.inf, math.inf
+        elif operator == "<":
+            sql, params, low, high = f"{column} < ?", [epoch], -math.inf, epoch - 1
+        elif operator == "<=":
+            sql, params, low, high = f"{column} < ?", [epoch + length], -math.inf, epoch + length - 1
+        elif operator == ">":
+            sql, params, low, high = f"{column} >= ?", [epoch + length], epoch + length, math.inf
+        else:
+            sql, params, low, high = f"{column} >= ?", [epoch], epoch, math.inf
+
+        return sql, params, ((low, high) if field == "start" else ANY_START)
+
+compiled_filters: "OrderedDict[str, CompiledFilter]" = OrderedDict()
+
+def compile_filter(expression: str) -> CompiledFilter:
+    # Parameterized WHERE condition for a filter expression, raising ValueError with a user-facing message
+    key = expression.strip()
+    compiled = compiled_filters.get(key)
+
+    if compiled is not None:
+        compiled_filters.move_to_end(key)
+        return compiled
+
+    if not key:
+        raise ValueError("Filter is empty")
+
+    compiled = Parser(key).parse()
+    compiled_filters[key] = compiled
+
+    if len(compiled_filters) > COMPILED_LIMIT:
+        compiled_filters.popitem(last=False)
+
+    return compiled
+
+def describe_fields() -> str:
+    # Short help text listing the fields and operators
+    return (f"Text: {', '.join(TEXT_FIELDS)} with = != ~ (contains) !~ in (a, b). "
+            f"Time: {', '.join(TIME_FIELDS)} with = != < <= > >= and dates like 2026-01-31 or \"2026-01-31 08:30\". "
+            f"Duration: {', '.join(DURATION_FIELDS)} with 45m, 1h30m, 2h. Combine with and, or, not and parentheses.")
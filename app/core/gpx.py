@@ -0,0 +1,279 @@
+import math
+import os
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+# Stop detection: staying within STOP_RADIUS metres for STOP_SECONDS, or a recording gap of
+# STOP_SECONDS, ends a trip. Shorter or smaller movements are GPS jitter or moving around a place
+STOP_RADIUS = 75
+STOP_SECONDS = 5 * 60
+MIN_TRIP_METERS = 300
+MIN_TRIP_SECONDS = 2 * 60
+
+# Named waypoints within this distance of a trip endpoint name the origin/destination
+PLACE_RADIUS = 150
+
+# Speeds below this count as standing still (traffic lights, stations) and are left out of the profile
+# Speed and distance are measured over windows of SPEED_SECONDS so that GPS jitter averages out
+MOVING_KMH = 2
+SPEED_SECONDS = 30
+
+# Mode by the 85th percentile of moving speed: the first profile whose limit is above it wins
+SPEED_PROFILES = (("Walk", 8), ("Bicycle", 26), ("Car", 180), ("Airplane", math.inf))
+
+EARTH_RADIUS = 6371008.8
+
+class TrackPoint(NamedTuple):
+    lat: float
+    lon: float
+    time: float
+    text: str  # Timestamp as written in the file
+
+class Trip(NamedTuple):
+    start: TrackPoint
+    end: TrackPoint
+    meters: float
+    mode: str
+
+def distance(a_lat: float, a_lon: float, b_lat: float, b_lon: float) -> float:
+    # Haversine distance in metres
+    phi_a = math.radians(a_lat)
+    phi_b = math.radians(b_lat)
+    h = math.sin((phi_b - phi_a) / 2) ** 2 + math.cos(phi_a) * math.cos(phi_b) * math.sin(math.radians(b_lon - a_lon) / 2) ** 2
+    return 2 * EARTH_RADIUS * math.asin(min(1.0, math.sqrt(h)))
+
+def local_name(tag: str) -> str:
+    # Tag without the GPX 1.0/1.1 namespace
+    return tag.rsplit("}", 1)[-1]
+
+def iter_gpx(path: str) -> Iterator[Tuple[str, object]]:
+    # Stream ("waypoint", (name, lat, lon)) and ("point", TrackPoint) items in file order
+    # Finished elements are cleared and detached, so memory stays flat however large the file is
+    root = None
+    segment = None
+
+    for event, element in ET.iterparse(path, events=("start", "end")):
+        tag = local_name(element.tag)
+
+        if event == "start":
+            if root is None:
+                root = element
+            elif tag == "trkseg":
+                segment = element
+            continue
+
+        if tag == "trkpt":
+            time_text = None
+
+            for child in element:
+                if local_name(child.tag) == "time":
+                    time_text = (child.text or "").strip()
+                    break
+
+            # Points without a time cannot be segmented and are skipped
+            if time_text:
+                try:
+                    time = datetime.fromisoformat(time_text.replace("Z", "+00:00")).timestamp()
+                    yield "point", TrackPoint(float(element.get("lat")), float(element.get("lon")), time, time_text)
+                except (TypeError, ValueError):
+                    pass
+
+            if segment is not None:
+                segment.clear()
+        elif tag == "wpt":
+            name = ""
+
+            for child in element:
+                if local_name(child.tag) == "name":
+                    name = (child.text or "").strip()
+                    break
+
+            try:
+                if name:
+                    yield "waypoint", (name, float(element.get("lat")), float(element.get("lon")))
+            except (TypeError, ValueError):
+                pass
+
+            root.clear()
+        elif tag == "trkseg":
+            segment = None
+        elif tag in ("trk", "rte"):
+            root.clear()
+
+class TripBuilder:
+    # Incremental stop detection over one time-ordered point stream
+    # The anchor is where a possible stop began; points since the anchor are kept apart as "pending"
+    # so that a confirmed stop can be cut off the trip without revisiting points
+    def __init__(self):
+        self.trips: List[Trip] = []
+        self.start: Optional[TrackPoint] = None
+        self.last: Optional[TrackPoint] = None
+        self.anchor: Optional[TrackPoint] = None
+        self.window: Optional[TrackPoint] = None
+        self.meters = 0.0
+        self.speeds: Dict[int, float] = {}
+        self.pending_meters = 0.0
+        self.pending_speeds: Dict[int, float] = {}
+
+    def add(self, point: TrackPoint) -> List[Trip]:
+        # Feed the next point, returning trips completed by it
+        self.trips = []
+        last = self.last
+
+        if last is None:
+            self.begin(point)
+            return self.trips
+
+        elapsed = point.time - last.time
+
+        # Out of order or duplicate timestamps carry no speed information
+        if elapsed <= 0:
+            return self.trips
+
+        # Recording gap: the device was off or without a fix for as long as a stop
+        if elapsed >= STOP_SECONDS:
+            self.end_trip()
+            self.begin(point)
+            return self.trips
+
+        self.add_step(point)
+        self.last = point
+
+        if distance(self.anchor.lat, self.anchor.lon, point.lat, point.lon) > STOP_RADIUS:
+            if last.time - self.anchor.time >= STOP_SECONDS:
+                # Dwelled around the anchor: the trip arrived there and a new one leaves from the last dwell point
+                self.finish(self.anchor)
+                self.begin(last)
+                self.add_step(point)
+                self.last = point
+
+            self.merge_pending()
+            self.anchor = point
+
+        return self.trips
+
+    def close(self) -> List[Trip]:
+        # End of the stream: whatever is in progress is a trip up to the start of a trailing stop
+        self.trips = []
+
+        if self.last is not None:
+            self.end_trip()
+
+        self.last = None
+        return self.trips
+
+    def end_trip(self):
+        # The trip ends where a trailing stop began, or at the last point if it was still moving
+        if self.last.time - self.anchor.time >= STOP_SECONDS:
+            self.finish(self.anchor)
+        else:
+            self.merge_pending()
+            self.meters += distance(self.window.lat, self.window.lon, self.last.lat, self.last.lon)
+            self.finish(self.last)
+
+    def begin(self, point: TrackPoint):
+        self.start = self.last = self.anchor = self.window = point
+        self.meters = 0.0
+        self.speeds = {}
+        self.pending_meters = 0.0
+        self.pending_speeds = {}
+
+    def add_step(self, point: TrackPoint):
+        # Straight-line distance and speed over each window, held as pending until they are known
+        # not to be part of a stop
+        elapsed = point.time - self.window.time
+
+        if elapsed < SPEED_SECONDS:
+            return
+
+        step = distance(self.window.lat, self.window.lon, point.lat, point.lon)
+        kmh = int(step / elapsed * 3.6)
+        self.pending_meters += step
+        self.window = point
+
+        if kmh >= MOVING_KMH:
+            self.pending_speeds[kmh] = self.pending_speeds.get(kmh, 0.0) + elapsed
+
+    def merge_pending(self):
+        self.meters += self.pending_meters
+        self.pending_meters = 0.0
+
+        for kmh, seconds in self.pending_speeds.items():
+            self.speeds[kmh] = self.speeds.get(kmh, 0.0) + seconds
+
+        self.pending_speeds = {}
+
+    def finish(self, end: TrackPoint):
+        # Keep the trip if it went somewhere, dropping jitter around a single place
+        if end.time - self.start.time < MIN_TRIP_SECONDS:
+            return
+        if distance(self.start.lat, self.start.lon, end.lat, end.lon) < MIN_TRIP_METERS:
+            return
+
+        self.trips.append(Trip(self.start, end, self.meters, classify_mode(self.speeds)))
+
+def classify_mode(speeds: Dict[int, float]) -> str:
+    # Time-weighted 85th percentile of the moving speed histogram against SPEED_PROFILES
+    total = sum(speeds.values())
+    seen = 0.0
+    p85 = 0
+
+    for kmh in sorted(speeds):
+        seen += speeds[kmh]
+        p85 = kmh
+
+        if seen >= total * 0.85:
+            break
+
+    for mode, limit in SPEED_PROFILES:
+        if p85 < limit:
+            return mode
+
+    return SPEED_PROFILES[-1][0]
+
+def place_name(lat: float, lon: float, places: List[Tuple[str, float, float]]) -> str:
+    # Nearest named waypoint within PLACE_RADIUS, otherwise the rounded coordinates (about 100 m cells)
+    nearest = None
+    nearest_distance = PLACE_RADIUS
+
+    for name, place_lat, place_lon in places:
+        d = distance(lat, lon, place_lat, place_lon)
+
+        if d <= nearest_distance:
+            nearest = name
+            nearest_distance = d
+
+    return nearest or f"{lat:.3f}, {lon:.3f}"
+
+def read_trips(path: str) -> Iterator[dict]:
+    # Yield one importer record per trip detected in a GPX file
+    places: List[Tuple[str, float, float]] = []
+    builder = TripBuilder()
+    file_name = os.path.basename(path)
+
+    def record(trip: Trip) -> dict:
+        hours = (trip.end.time - trip.start.time) / 3600
+        return {
+            "origin": place_name(trip.start.lat, trip.start.lon, places),
+            "destination": place_name(trip.end.lat, trip.end.lon, places),
+            "mode": trip.mode,
+            "start": trip.start.text,
+            "end": trip.end.text,
+            "description": f"From {file_name}: {trip.meters / 1000:.1f} km, average {trip.meters / 1000 / hours:.0f} km/h",
+            "origin_lat": trip.start.lat,
+            "origin_lon": trip.start.lon,
+            "destination_lat": trip.end.lat,
+            "destination_lon": trip.end.lon,
+        }
+
+    for kind, item in iter_gpx(path):
+        if kind == "waypoint":
+            places.append(item)
+            continue
+
+        for trip in builder.add(item):
+            yield record(trip)
+
+    for trip in builder.close():
+        yield record(trip)
@@ -0,0 +1,285 @@
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import threading
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Callable, List, NamedTuple, Optional, Sequence, Tuple
+from core import db, gpx
+
+# Format the database stores, same as QDateTime "yyyy-MM-dd hh:mm:ss"
+DB_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Extra layouts seen in exported files, tried after ISO 8601
+TIMESTAMP_FORMATS = (
+    "%Y/%m/%d %H:%M:%S",
+    "%Y/%m/%d %H:%M",
+    "%m/%d/%Y %H:%M:%S",
+    "%m/%d/%Y %H:%M",
+    "%m/%d/%Y %I:%M %p",
+    "%Y, %b %d [%I:%M %p]",  # Display format of the log table
+)
+
+FIELDS = ("origin", "destination", "mode", "start", "end", "description",
+          "origin_lat", "origin_lon", "destination_lat", "destination_lon")
+
+class LineError(NamedTuple):
+    # A rejected input record
+    path: str
+    line: int
+    message: str
+
+class ImportSummary(NamedTuple):
+    files: int
+    skipped_files: int
+    logs: int
+    errors: List[LineError]
+
+def normalize_timestamp(value) -> str:
+    # Convert a timestamp from an exported file to the database format
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return datetime.fromtimestamp(value).strftime(DB_FORMAT)
+
+    text = str(value or "").strip()
+
+    if not text:
+        return ""
+
+    try:
+        parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
+    except ValueError:
+        parsed = None
+
+        for layout in TIMESTAMP_FORMATS:
+            try:
+                parsed = datetime.strptime(text, layout)
+                break
+            except ValueError:
+                continue
+
+    if parsed is None:
+        raise ValueError(f"Unrecognized timestamp '{text}'")
+
+    # Timestamps with an offset are stored in local time like the rest of the table
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+
+    return parsed.strftime(DB_FORMAT)
+
+def validate_record(record: dict) -> db.NewLog:
+    # Apply the db.create_log checks plus timestamp normalization to one record
+    origin = str(record.get("origin") or "").strip()
+    destination = str(record.get("destination") or "").strip()
+    mode = str(record.get("mode") or "").strip()
+    start = normalize_timestamp(record.get("start"))
+    end = normalize_timestamp(record.get("end"))
+    description = str(record.get("description") or "")
+
+    db.validate_log(origin, destination, mode, start, end)
+
+    if start >= end:
+        raise ValueError("End date & time must be after start date & time")
+
+    return (origin, destination, mode, start, end, description) + read_coordinates(record, "origin") + read_coordinates(record, "destination")
+
+def read_coordinates(record: dict, endpoint: str) -> Tuple[Optional[float], Optional[float]]:
+    # Optional <endpoint>_lat/<endpoint>_lon pair in degrees, (None, None) when both are blank
+    lat = record.get(f"{endpoint}_lat")
+    lon = record.get(f"{endpoint}_lon")
+
+    if lat in (None, "") and lon in (None, ""):
+        return None, None
+
+    try:
+        lat = float(lat)
+        lon = float(lon)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid {endpoint} coordinates")
+
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        raise ValueError(f"Invalid {endpoint} coordinates")
+
+    return lat, lon
+
+def read_records(path: str):
+    # Yield (line number, record) from CSV, JSON array or JSON Lines files
+    # JSON Lines records are yielded as undecoded text so a broken line fails on its own in parse_file
+    # GPX tracks are streamed and segmented into trips, numbered in file order
+    extension = os.path.splitext(path)[1].lower()
+
+    if extension == ".gpx":
+        yield from enumerate(gpx.read_trips(path), 1)
+        return
+
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if extension == ".csv":
+            reader = csv.DictReader(f)
+
+            for record in reader:
+                yield reader.line_num, record
+        elif extension in (".jsonl", ".ndjson"):
+            for line_number, line in enumerate(f, 1):
+                if line.strip():
+                    yield line_number, line
+        else:
+            records = json.load(f)
+
+            for index, record in enumerate(records if isinstance(records, list) else [records], 1):
+                yield index, record
+
+def parse_file(path: str, current: str, batch_size: int, skip_batches: int, out) -> Tuple[int, List[LineError], bool]:
+    # Worker: parse and validate a file, putting each full batch on the out queue as (path, fingerprint, number, logs, False)
+    # Batches already written by an earlier run are dropped; only one batch is held in memory at a time
+    # Returns (batches in the file, errors, whether the file as a whole could not be read)
+    batch: List[db.NewLog] = []
+    number = 0
+    errors: List[LineError] = []
+    failed = False
+
+    def flush():
+        nonlocal batch, number
+
+        if number >= skip_batches:
+            out.put((path, current, number, batch, False))
+
+        batch = []
+        number += 1
+
+    try:
+        for line, record in read_records(path):
+            try:
+                if isinstance(record, str):
+                    record = json.loads(record)
+
+                if not isinstance(record, dict):
+                    raise ValueError("Record is not an object")
+
+                batch.append(validate_record(record))
+
+                if len(batch) == batch_size:
+                    flush()
+            except ValueError as e:
+                errors.append(LineError(path, line, str(e)))
+    except (OSError, ValueError, csv.Error, ET.ParseError) as e:
+        # Unreadable file or broken JSON/XML, report it as a whole-file error
+        errors.append(LineError(path, 0, str(e)))
+        failed = True
+
+    if batch:
+        flush()
+
+    return number, errors, failed
+
+def fingerprint(path: str) -> str:
+    # Identify a file version so a checkpoint is only reused for unchanged files
+    stat = os.stat(path)
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+def import_files(paths: Sequence[str], workers: Optional[int] = None, batch_size: int = 5000,
+                 progress: Optional[Callable[[int, int, int], None]] = None) -> ImportSummary:
+    # Parse files in a process pool and write validated batches from a single writer thread
+    # Each batch commits together with its checkpoint, so an interrupted import resumes where it stopped
+    pending = []
+    skipped_files = 0
+
+    for path in paths:
+        path = os.path.abspath(path)
+        current = fingerprint(path)
+        checkpoint = db.get_import_progress(path)
+        skip_batches = 0
+
+        if checkpoint and checkpoint[0] == current:
+            if checkpoint[2]:
+                skipped_files += 1
+                continue
+
+            skip_batches = checkpoint[1]
+
+        pending.append((path, current, skip_batches))
+
+    # Workers stream batches straight to the writer through a bounded queue, so memory stays at a few batches
+    manager = multiprocessing.Manager()
+    batches = manager.Queue(maxsize=64)
+    written = [0]
+    writer_errors: List[BaseException] = []
+
+    def writer():
+        # Only this thread touches the database while the import runs
+        while True:
+            item = batches.get()
+
+            if item is None:
+                break
+
+            if writer_errors:
+                continue
+
+            source, current, number, logs, done = item
+
+            try:
+                db.import_logs_batch(source, current, number, logs, done)
+                written[0] += len(logs)
+            except Exception as e:
+                writer_errors.append(e)
+
+    writer_thread = threading.Thread(target=writer, name="import-writer", daemon=True)
+    writer_thread.start()
+
+    errors: List[LineError] = []
+    finished = 0
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(parse_file, path, current, batch_size, skip, batches): (path, current) for path, current, skip in pending}
+
+            for future in as_completed(futures):
+                path, current = futures[future]
+                number, file_errors, failed = future.result()
+                errors.extend(file_errors)
+
+                # All of the file's batches are queued by now; a final empty batch marks it done
+                # A file that could not be read stays pending so the next run reports it again
+                if not failed:
+                    batches.put((path, current, number, [], True))
+
+                finished += 1
+
+                if progress:
+                    progress(finished, len(pending), written[0])
+    finally:
+        batches.put(None)
+        writer_thread.join()
+        manager.shutdown()
+
+    if writer_errors:
+        raise writer_errors[0]
+
+    return ImportSummary(len(pending), skipped_files, written[0], errors)
+
+def main(argv: Optional[Sequence[str]] = None):
+    # Command line entry point: python -m core.importer FILE [FILE ...]
+    parser = argparse.ArgumentParser(description="Import travel logs from CSV/JSON exports and GPX tracks.")
+    parser.add_argument("files", nargs="+", help="CSV, JSON or JSON Lines files with origin, destination, mode, start, end, description and optional "
+                        "origin_lat, origin_lon, destination_lat, destination_lon, or GPX tracks")
+    parser.add_argument("--workers", type=int, default=None, help="parser processes (default: CPU count)")
+    parser.add_argument("--batch-size", type=int, default=5000, help="logs written per transaction")
+    parser.add_argument("--database", default=None, help=f"database path, file: URI or :memory: (default: ${db.DATABASE_ENV} or {db.DEFAULT_DATABASE})")
+    args = parser.parse_args(argv)
+    db.connect(args.database)
+
+    def report(finished, total, logs):
+        print(f"[{finished}/{total}] files parsed, {logs} logs written", flush=True)
+
+    summary = import_files(args.files, args.workers, args.batch_size, report)
+
+    for error in summary.errors:
+        print(f"{error.path}:{error.line}: {error.message}")
+
+    print(f"Imported {summary.logs} logs from {summary.files} files "
+          f"({summary.skipped_files} already imported, {len(summary.errors)} errors)")
+
+if __name__ == "__main__":
+    main()
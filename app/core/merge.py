@@ -0,0 +1,119 @@
+import argparse
+import sqlite3
+from collections import Counter
+from typing import Dict, List, NamedTuple, Optional, Sequence
+from core import db
+
+# Merging compares databases in two rounds: first one digest per start month, then, only for months whose
+# digests differ, the content hashes of their logs. Logs are matched by content, not by ID, since every device
+# numbers its logs independently. Only logs missing on the other side are read and copied. The comparison only
+# reads both databases; logs not yet hashed by maintenance are hashed as they are read.
+
+class MergeSummary(NamedTuple):
+    months: int  # Months compared by digest
+    changed_months: int  # Months whose digests differed and were compared log by log
+    compared: int  # Hashes compared in those months
+    added: int  # Logs copied into the target
+    returned: int  # Logs copied back into the source by a two-way sync
+
+def open_database(location: str, migrate: bool) -> sqlite3.Connection:
+    # Read-only connection for comparing one side; with migrate an older database is first brought up to date
+    # by connecting to it, otherwise it is refused rather than changed
+    if migrate:
+        db.connect(location)
+
+    try:
+        c = db.open_read_only(location)
+        version = db.schema_version(c)
+    except sqlite3.Error as e:
+        raise ValueError(f"Cannot read {location}: {e}")
+
+    if version < db.SCHEMA_VERSION:
+        c.close()
+        raise ValueError(f"{location} was last opened by an older version; open it once with this version before comparing it")
+
+    return c
+
+def missing_logs(c: sqlite3.Connection, missing: Dict[str, Counter]) -> List[db.NewLog]:
+    # Read the logs whose hashes are counted in missing, as often as they are counted
+    logs = []
+
+    for month, counts in missing.items():
+        if not counts:
+            continue
+
+        for trip_hash, log in db.get_month_logs(c, month, list(counts)):
+            if counts[trip_hash] > 0:
+                counts[trip_hash] -= 1
+                logs.append(log)
+
+    return logs
+
+def merge_databases(source: str, target: Optional[str] = None, both: bool = False, dry_run: bool = False) -> MergeSummary:
+    # Copy logs that are in source but not in target; with both, also copy logs only in target back to source
+    # Identical trips are counted, so a trip logged twice on one device is copied twice
+    # Both sides are compared through read-only connections, so a dry run leaves both files untouched
+    # A real merge migrates the target it writes to, and the source only when it is written to as well
+    target = db.database_location(target)
+    source_conn = open_database(source, both and not dry_run)
+
+    try:
+        target_conn = open_database(target, not dry_run)
+    except ValueError:
+        source_conn.close()
+        raise
+
+    try:
+        source_digests = db.get_month_digests(source_conn)
+        target_digests = db.get_month_digests(target_conn)
+        months = set(source_digests) | set(target_digests)
+        changed = sorted(month for month in months if source_digests.get(month) != target_digests.get(month))
+
+        source_hashes = {month: Counter(db.get_month_hashes(source_conn, month)) for month in changed}
+        target_hashes = {month: Counter(db.get_month_hashes(target_conn, month)) for month in changed}
+        compared = sum(sum(counts.values()) for counts in source_hashes.values()) + sum(sum(counts.values()) for counts in target_hashes.values())
+
+        to_target = missing_logs(source_conn, {month: source_hashes[month] - target_hashes[month] for month in changed})
+        to_source: List[db.NewLog] = []
+
+        if both:
+            to_source = missing_logs(target_conn, {month: target_hashes[month] - source_hashes[month] for month in changed})
+    finally:
+        source_conn.close()
+        target_conn.close()
+
+    # Connected to the target since it was opened last
+    if not dry_run and to_target:
+        db.create_logs(to_target)
+
+    if not dry_run and to_source:
+        db.connect(source)
+        db.create_logs(to_source)
+        db.connect(target)
+
+    return MergeSummary(len(months), len(changed), compared, len(to_target), len(to_source))
+
+def main(argv: Optional[Sequence[str]] = None):
+    # Command line entry point: python -m core.merge OTHER_DATABASE
+    parser = argparse.ArgumentParser(description="Merge the travel logs of another device's database into this one.")
+    parser.add_argument("other", help="database to merge from, e.g. a copy of another device's database.db")
+    parser.add_argument("--database", default=None, help=f"database to merge into (default: ${db.DATABASE_ENV} or {db.DEFAULT_DATABASE})")
+    parser.add_argument("--both", action="store_true", help="sync both ways: also copy logs missing in OTHER into it")
+    parser.add_argument("--dry-run", action="store_true", help="only report what would be copied")
+    args = parser.parse_args(argv)
+
+    try:
+        summary = merge_databases(args.other, args.database, args.both, args.dry_run)
+    except ValueError as e:
+        parser.error(str(e))
+
+    verb = "Would copy" if args.dry_run else "Copied"
+
+    print(f"Compared {summary.months} months: {summary.changed_months} differed ({summary.compared} logs compared)")
+    print(f"{verb} {summary.added} logs from {args.other}")
+
+    if args.both:
+        print(f"{verb} {summary.returned} logs to {args.other}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+import argparse
+import calendar
+import heapq
+import html
+import os
+import re
+import shutil
+import tempfile
+from datetime import datetime, timezone
+from typing import Dict, IO, List, Optional, Sequence, Tuple
+from core import db
+
+# Reports are built in one pass over the logs of a period. Summary tables are accumulated while the
+# day-by-day listing is written to a spool file as it streams by; the summary is written first and the
+# spooled listing copied after it, so memory stays proportional to the number of routes, not trips
+LONGEST_TRIPS = 10
+
+def format_duration_components(components: List[str]) -> str:
+    # Format duration components with proper conjunction
+    if not components:
+        return "0 mins"
+    elif len(components) == 1:
+        return components[0]
+    elif len(components) == 2:
+        return f"{components[0]} & {components[1]}"
+    else:
+        return f"{components[0]}, {components[1]}, & {components[2]}"
+
+def format_duration(duration_seconds: int) -> str:
+    # Format a number of seconds as days, hours, and minutes
+    minutes = (duration_seconds // 60) % 60
+    hours = (duration_seconds // 3600) % 24
+    days = duration_seconds // 86400
+
+    components = []
+
+    if days > 0:
+        components.append(f"{days} {'day' if days == 1 else 'days'}")
+
+    if hours > 0:
+        components.append(f"{hours} {'hr' if hours == 1 else 'hrs'}")
+
+    if minutes > 0:
+        components.append(f"{minutes} {'min' if minutes == 1 else 'mins'}")
+
+    return format_duration_components(components)
+
+def period_range(period: str) -> Tuple[int, int, str]:
+    # "YYYY" or "YYYY-MM" to [start, end) epochs of the stored wall-clock time and a report title
+    match = re.fullmatch(r"(\d{4})(?:-(\d{1,2}))?", period.strip())
+
+    if match is None or (match.group(2) and not 1 <= int(match.group(2)) <= 12):
+        raise ValueError(f"Period must be a year (2024) or a month (2024-05), not '{period}'")
+
+    year = int(match.group(1))
+
+    if match.group(2) is None:
+        return calendar.timegm((year, 1, 1, 0, 0, 0)), calendar.timegm((year + 1, 1, 1, 0, 0, 0)), f"Travel Report {year}"
+
+    month = int(match.group(2))
+    next_year, next_month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return (calendar.timegm((year, month, 1, 0, 0, 0)), calendar.timegm((next_year, next_month, 1, 0, 0, 0)),
+            f"Travel Report {calendar.month_name[month]} {year}")
+
+def to_datetime(epoch: int) -> datetime:
+    # Stored times are local wall-clock time read as UTC
+    return datetime.fromtimestamp(epoch, timezone.utc)
+
+def format_time(epoch: int) -> str:
+    return to_datetime(epoch).strftime("%I:%M %p").lstrip("0")
+
+def format_day(epoch: int) -> str:
+    dt = to_datetime(epoch)
+    return f"{dt:%A, %B} {dt.day}, {dt.year}"
+
+class MarkdownWriter:
+    # Incremental Markdown output
+    def __init__(self, out: IO[str]):
+        self.out = out
+
+    def begin(self, title: str):
+        self.out.write(f"# {self.escape(title)}\n\n")
+
+    def heading(self, text: str):
+        self.out.write(f"## {self.escape(text)}\n\n")
+
+    def subheading(self, text: str):
+        self.out.write(f"### {self.escape(text)}\n\n")
+
+    def paragraph(self, text: str):
+        self.out.write(f"{self.escape(text)}\n\n")
+
+    def table_start(self, headers: Sequence[str]):
+        self.out.write("| " + " | ".join(self.escape(header) for header in headers) + " |\n")
+        self.out.write("|" + "---|" * len(headers) + "\n")
+
+    def table_row(self, cells: Sequence[str]):
+        self.out.write("| " + " | ".join(self.escape(cell) for cell in cells) + " |\n")
+
+    def table_end(self):
+        self.out.write("\n")
+
+    def end(self):
+        pass
+
+    def escape(self, text: str) -> str:
+        # Keep user text from breaking table cells or turning into markup
+        return re.sub(r"([\\`*_\[\]|<>#])", r"\\\1", str(text)).replace("\n", " ")
+
+class HtmlWriter(MarkdownWriter):
+    # Incremental standalone HTML output
+    def begin(self, title: str):
+        self.out.write("<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n")
+        self.out.write(f"<title>{self.escape(title)}</title>\n")
+        self.out.write("<style>body { font-family: sans-serif; color: #34495e; } "
+                       "table { border-collapse: collapse; margin-bottom: 1em; } "
+                       "th { background: #496c8c; color: white; } "
+                       "th, td { border: 1px solid #bdc3c7; padding: 4px 8px; text-align: left; }</style>\n")
+        self.out.write(f"</head>\n<body>\n<h1>{self.escape(title)}</h1>\n")
+
+    def heading(self, text: str):
+        self.out.write(f"<h2>{self.escape(text)}</h2>\n")
+
+    def subheading(self, text: str):
+        self.out.write(f"<h3>{self.escape(text)}</h3>\n")
+
+    def paragraph(self, text: str):
+        self.out.write(f"<p>{self.escape(text)}</p>\n")
+
+    def table_start(self, headers: Sequence[str]):
+        self.out.write("<table>\n<tr>" + "".join(f"<th>{self.escape(header)}</th>" for header in headers) + "</tr>\n")
+
+    def table_row(self, cells: Sequence[str]):
+        self.out.write("<tr>" + "".join(f"<td>{self.escape(cell)}</td>" for cell in cells) + "</tr>\n")
+
+    def table_end(self):
+        self.out.write("</table>\n")
+
+    def end(self):
+        self.out.write("</body>\n</html>\n")
+
+    def escape(self, text: str) -> str:
+        return html.escape(str(text))
+
+WRITERS = {".md": MarkdownWriter, ".markdown": MarkdownWriter, ".html": HtmlWriter, ".htm": HtmlWriter}
+
+def write_report(path: str, start_ts: int, end_ts: int, title: str) -> int:
+    # Write a report of the logs starting in [start_ts, end_ts) as Markdown or HTML by file extension,
+    # returning the number of trips
+    writer_class = WRITERS.get(os.path.splitext(path)[1].lower())
+
+    if writer_class is None:
+        raise ValueError(f"Report file must end in one of {', '.join(WRITERS)}")
+
+    count = 0
+    total_seconds = 0
+    days = 0
+    modes: Dict[str, List[int]] = {}  # mode -> [trips, seconds]
+    routes: Dict[Tuple[str, str, str], List[int]] = {}  # (origin, destination, mode) -> [trips, seconds, shortest, longest]
+    longest: List[Tuple[int, int, Tuple]] = []  # Min-heap of (duration, -id, row) keeping the LONGEST_TRIPS longest
+    temporary_path = path + ".tmp"
+
+    with tempfile.TemporaryFile("w+", encoding="utf-8") as spool:
+        listing = writer_class(spool)
+        day = None
+        day_count = 0
+        day_seconds = 0
+
+        for row in db.iter_report_rows(start_ts, end_ts):
+            log_id, origin, destination, mode, start, end, duration, description = row
+
+            # Day-by-day listing, written as the rows stream by
+            if start // 86400 != day:
+                if day is not None:
+                    listing.table_end()
+                    listing.paragraph(f"{day_count} {'trip' if day_count == 1 else 'trips'}, {format_duration(day_seconds)}")
+
+                day = start // 86400
+                day_count = 0
+                day_seconds = 0
+                days += 1
+                listing.subheading(format_day(start))
+                listing.table_start(["Start", "End", "Origin", "Destination", "Mode", "Duration", "Description"])
+
+            listing.table_row([format_time(start), format_time(end), origin, destination, mode, format_duration(duration), description or ""])
+            day_count += 1
+            day_seconds += duration
+
+            # Summary sections, accumulated in the same pass
+            count += 1
+            total_seconds += duration
+
+            mode_totals = modes.setdefault(mode, [0, 0])
+            mode_totals[0] += 1
+            mode_totals[1] += duration
+
+            route = routes.get((origin, destination, mode))
+
+            if route is None:
+                routes[(origin, destination, mode)] = [1, duration, duration, duration]
+            else:
+                route[0] += 1
+                route[1] += duration
+                route[2] = min(route[2], duration)
+                route[3] = max(route[3], duration)
+
+            if len(longest) < LONGEST_TRIPS:
+                heapq.heappush(longest, (duration, -log_id, row))
+            elif duration > longest[0][0]:
+                heapq.heapreplace(longest, (duration, -log_id, row))
+
+        if day is not None:
+            listing.table_end()
+            listing.paragraph(f"{day_count} {'trip' if day_count == 1 else 'trips'}, {format_duration(day_seconds)}")
+
+        with open(temporary_path, "w", encoding="utf-8") as f:
+            out = writer_class(f)
+            out.begin(title)
+            out.paragraph(f"{format_day(start_ts)} to {format_day(end_ts - 1)}")
+
+            out.heading("Summary")
+            out.table_start(["Trips", "Days with trips", "Total time", "Average trip"])
+            out.table_row([str(count), str(days), format_duration(total_seconds), format_duration(total_seconds // count) if count else "-"])
+            out.table_end()
+
+            out.heading("By Mode")
+            out.table_start(["Mode", "Trips", "Total time", "Average trip", "Share of time"])
+
+            for mode, (trips, seconds) in sorted(modes.items(), key=lambda item: -item[1][1]):
+                out.table_row([mode, str(trips), format_duration(seconds), format_duration(seconds // trips), f"{seconds * 100 / max(total_seconds, 1):.0f}%"])
+
+            out.table_end()
+
+            out.heading("By Route")
+            out.table_start(["Origin", "Destination", "Mode", "Trips", "Average", "Shortest", "Longest"])
+
+            for (origin, destination, mode), (trips, seconds, shortest, longest_trip) in sorted(routes.items(), key=lambda item: (-item[1][0], item[0])):
+                out.table_row([origin, destination, mode, str(trips), format_duration(seconds // trips), format_duration(shortest), format_duration(longest_trip)])
+
+            out.table_end()
+
+            out.heading("Longest Trips")
+            out.table_start(["Date", "Origin", "Destination", "Mode", "Duration"])
+
+            for duration, _, (_, origin, destination, mode, start, _, _, _) in sorted(longest, reverse=True):
+                out.table_row([f"{format_day(start)} {format_time(start)}", origin, destination, mode, format_duration(duration)])
+
+            out.table_end()
+
+            out.heading("Day by Day")
+
+            if count == 0:
+                out.paragraph("No trips in this period.")
+
+            f.flush()
+            spool.seek(0)
+            shutil.copyfileobj(spool, f)
+            out.end()
+
+    os.replace(temporary_path, path)
+    return count
+
+def main(argv: Optional[Sequence[str]] = None):
+    # Command line entry point: python -m core.report PERIOD OUTPUT
+    parser = argparse.ArgumentParser(description="Write a monthly or yearly travel report as Markdown or HTML.")
+    parser.add_argument("period", help="year (2024) or month (2024-05) to report on")
+    parser.add_argument("output", help="report file to write, ending in .md or .html")
+    parser.add_argument("--database", default=None, help=f"database path, file: URI or :memory: (default: ${db.DATABASE_ENV} or {db.DEFAULT_DATABASE})")
+    args = parser.parse_args(argv)
+
+    try:
+        start_ts, end_ts, title = period_range(args.period)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if os.path.splitext(args.output)[1].lower() not in WRITERS:
+        parser.error(f"Report file must end in one of {', '.join(WRITERS)}")
+
+    db.connect(args.database)
+    trips = write_report(args.output, start_ts, end_ts, title)
+    print(f"Wrote {trips} trips to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+import argparse
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tempfile
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+from core import db
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Snapshot layout, all integers little-endian:
+#   header    magic (8 bytes) | version u32 | section count u32 | row count u64
+#   directory one entry per section: name (16 bytes, NUL padded) | offset u64 | length u64
+#   sections  8-byte aligned, in directory order
+#
+# Sections:
+#   id, start, end, duration         int64 per row (start/end are epochs of the stored wall-clock time)
+#   origin, destination, mode        int32 codes per row into the shared string dictionary
+#   desc_offsets                     int64, rows + 1 offsets into desc_blob
+#   string_offsets                   int64, dictionary size + 1 offsets into string_blob
+#   string_blob, desc_blob           UTF-8 bytes
+MAGIC = b"TCLSNAP\0"
+VERSION = 1
+HEADER = struct.Struct("<8sIIQ")
+ENTRY = struct.Struct("<16sQQ")
+
+INT64_SECTIONS = ("id", "start", "end", "duration")
+CODE_SECTIONS = ("origin", "destination", "mode")
+SECTIONS = INT64_SECTIONS + CODE_SECTIONS + ("desc_offsets", "string_offsets", "string_blob", "desc_blob")
+TYPECODES = {"id": "q", "start": "q", "end": "q", "duration": "q", "origin": "i", "destination": "i", "mode": "i",
+             "desc_offsets": "q", "string_offsets": "q"}
+
+def aligned(offset: int) -> int:
+    return (offset + 7) & ~7
+
+def to_bytes(values: array) -> bytes:
+    # Arrays are written little-endian whatever the host byte order
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+
+    return values.tobytes()
+
+def write_snapshot(path: str, chunk_size: int = 65536) -> int:
+    # Stream the log table into a columnar snapshot file, returning the number of rows
+    # Fixed-width columns are written chunk by chunk at their final offsets, so memory stays
+    # proportional to the chunk size and the number of distinct strings
+    export = db.iter_log_export(chunk_size)
+    rows = next(export)
+
+    # Fixed-size section positions follow from the row count
+    offset = aligned(HEADER.size + ENTRY.size * len(SECTIONS))
+    layout: Dict[str, Tuple[int, int]] = {}
+
+    for name in INT64_SECTIONS + CODE_SECTIONS + ("desc_offsets",):
+        width = 8 if TYPECODES[name] == "q" else 4
+        count = rows + 1 if name == "desc_offsets" else rows
+        layout[name] = (offset, width * count)
+        offset = aligned(offset + width * count)
+
+    strings: Dict[str, int] = {}
+    written = 0
+    description_size = 0
+    temporary_path = path + ".tmp"
+
+    # A failed export leaves no partial file behind
+    try:
+        with open(temporary_path, "wb") as f, tempfile.TemporaryFile() as descriptions:
+            f.truncate(offset)
+            f.seek(layout["desc_offsets"][0])
+            f.write(to_bytes(array("q", [0])))
+
+            for chunk in export:
+                columns = {name: array(TYPECODES[name]) for name in INT64_SECTIONS + CODE_SECTIONS + ("desc_offsets",)}
+
+                for log_id, origin, destination, mode, start, end, duration, description in chunk:
+                    columns["id"].append(log_id)
+                    columns["start"].append(start)
+                    columns["end"].append(end)
+                    columns["duration"].append(duration)
+
+                    for name, text in (("origin", origin), ("destination", destination), ("mode", mode)):
+                        code = strings.get(text)
+
+                        if code is None:
+                            code = strings[text] = len(strings)
+
+                        columns[name].append(code)
+
+                    encoded = (description or "").encode("utf-8")
+                    descriptions.write(encoded)
+                    description_size += len(encoded)
+                    columns["desc_offsets"].append(description_size)
+
+                # Each column chunk goes straight to its place in the file
+                for name, values in columns.items():
+                    width = values.itemsize
+                    start_row = written + 1 if name == "desc_offsets" else written
+                    f.seek(layout[name][0] + start_row * width)
+                    f.write(to_bytes(values))
+
+                written += len(chunk)
+
+            if written != rows:
+                raise RuntimeError(f"Expected {rows} rows but read {written}")
+
+            # Variable-size sections go after the fixed ones
+            f.seek(offset)
+            string_offsets = array("q", [0])
+            blob = bytearray()
+
+            for text in strings:
+                blob.extend(text.encode("utf-8"))
+                string_offsets.append(len(blob))
+
+            for name, data in (("string_offsets", to_bytes(string_offsets)), ("string_blob", bytes(blob))):
+                layout[name] = (offset, len(data))
+                f.seek(offset)
+                f.write(data)
+                offset = aligned(offset + len(data))
+
+            layout["desc_blob"] = (offset, description_size)
+            f.seek(offset)
+            descriptions.seek(0)
+            shutil.copyfileobj(descriptions, f)
+
+            # Header and directory last, once every offset is known
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, VERSION, len(SECTIONS), rows))
+
+            for name in SECTIONS:
+                f.write(ENTRY.pack(name.encode("ascii"), *layout[name]))
+    except Exception:
+        export.close()
+
+        if os.path.exists(temporary_path):
+            os.unlink(temporary_path)
+
+        raise
+
+    os.replace(temporary_path, path)
+    return rows
+
+class Snapshot:
+    # Zero-copy reader: columns are views into a memory map, nothing is read until it is touched
+    def __init__(self, path: str):
+        self.file = open(path, "rb")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, section_count, self.rows = HEADER.unpack_from(self.map, 0)
+
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"'{path}' is not a travel log snapshot")
+        if version != VERSION:
+            self.close()
+            raise ValueError(f"Unsupported snapshot version {version}")
+
+        self.sections: Dict[str, Tuple[int, int]] = {}
+
+        for i in range(section_count):
+            name, offset, length = ENTRY.unpack_from(self.map, HEADER.size + i * ENTRY.size)
+            self.sections[name.rstrip(b"\0").decode("ascii")] = (offset, length)
+
+        self.strings: Optional[List[str]] = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def close(self):
+        # Unmap now, or once the last view from column() or raw() still in use is released
+        # Those views hold a reference to the map, so dropping ours lets the last of them close it
+        try:
+            self.map.close()
+        except BufferError:
+            pass
+
+        self.map = None
+        self.file.close()
+
+    def raw(self, name: str) -> memoryview:
+        offset, length = self.sections[name]
+        return memoryview(self.map)[offset:offset + length]
+
+    def column(self, name: str):
+        # numpy array over the map when numpy is installed, otherwise a typed memoryview
+        # Both are zero-copy; memoryview values are in host order, which is little-endian on common platforms
+        typecode = TYPECODES[name]
+
+        if numpy is not None:
+            offset, length = self.sections[name]
+            dtype = numpy.dtype("<i8" if typecode == "q" else "<i4")
+            return numpy.frombuffer(self.map, dtype=dtype, count=length // dtype.itemsize, offset=offset)
+
+        return self.raw(name).cast(typecode)
+
+    def dictionary(self) -> List[str]:
+        # Decode the shared string dictionary once; it is small compared to the rows
+        if self.strings is None:
+            offsets = self.raw("string_offsets").cast("q")
+            blob = self.raw("string_blob")
+            self.strings = [bytes(blob[offsets[i]:offsets[i + 1]]).decode("utf-8") for i in range(len(offsets) - 1)]
+
+        return self.strings
+
+    def text(self, name: str, row: int) -> str:
+        # Decoded origin, destination, or mode of one row
+        return self.dictionary()[self.raw(name).cast("i")[row]]
+
+    def description(self, row: int) -> str:
+        offsets = self.raw("desc_offsets").cast("q")
+        return bytes(self.raw("desc_blob")[offsets[row]:offsets[row + 1]]).decode("utf-8")
+
+def main(argv: Optional[Sequence[str]] = None):
+    # Command line entry point: python -m core.snapshot OUTPUT
+    parser = argparse.ArgumentParser(description="Write the travel log as a memory-mappable columnar snapshot.")
+    parser.add_argument("output", help="snapshot file to write")
+    parser.add_argument("--database", default=None, help=f"database path, file: URI or :memory: (default: ${db.DATABASE_ENV} or {db.DEFAULT_DATABASE})")
+    args = parser.parse_args(argv)
+    db.connect(args.database)
+
+    rows = write_snapshot(args.output)
+    print(f"Wrote {rows} logs to {args.output} ({os.path.getsize(args.output)} bytes)")
+
+if __name__ == "__main__":
+    main()
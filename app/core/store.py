@@ -0,0 +1,211 @@
+from array import array
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from core import db
+
+# Column tuple layout produced by db.iter_log_columns
+LogColumns = Tuple[int, str, str, str, int, int]
+
+# Attribute names of the typed column arrays
+COLUMN_NAMES = ("ids", "starts", "ends", "durations", "origins", "destinations", "modes")
+
+class LogStore:
+    # Columnar in-memory copy of travel logs
+    # Numbers live in typed arrays and text columns are dictionary encoded,
+    # so a row costs about 40 bytes instead of a tuple plus eight table items
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        # Drop all rows and the string dictionary
+        self.ids = array("q")
+        self.starts = array("q")
+        self.ends = array("q")
+        self.durations = array("i")
+        self.origins = array("i")
+        self.destinations = array("i")
+        self.modes = array("i")
+        self.strings: List[str] = []
+        self.codes: Dict[str, int] = {}
+        self.descriptions: Dict[int, str] = {}
+        self.total_seconds = 0
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def encode(self, text: str) -> int:
+        # Return the dictionary code for text, adding it if new
+        code = self.codes.get(text)
+
+        if code is None:
+            code = len(self.strings)
+            self.strings.append(text)
+            self.codes[text] = code
+
+        return code
+
+    def load(self, rows: Iterable[LogColumns]):
+        # Replace contents with rows streamed from the database
+        # Bound methods keep the per-row cost down on large histories
+        self.clear()
+        encode = self.encode
+        appends = (self.ids.append, self.origins.append, self.destinations.append, self.modes.append,
+                   self.starts.append, self.ends.append, self.durations.append)
+        ids, origins, destinations, modes, starts, ends, durations = appends
+        total_seconds = 0
+
+        for log_id, origin, destination, mode, start, end in rows:
+            ids(log_id)
+            origins(encode(origin))
+            destinations(encode(destination))
+            modes(encode(mode))
+            starts(start)
+            ends(end)
+            durations(end - start)
+            total_seconds += end - start
+
+        self.total_seconds = total_seconds
+
+    def append(self, row: LogColumns):
+        # Add a row at the end
+        self.insert(len(self.ids), row)
+
+    def insert(self, position: int, row: LogColumns):
+        # Add a row at the given position
+        log_id, origin, destination, mode, start, end = row
+        self.ids.insert(position, log_id)
+        self.origins.insert(position, self.encode(origin))
+        self.destinations.insert(position, self.encode(destination))
+        self.modes.insert(position, self.encode(mode))
+        self.starts.insert(position, start)
+        self.ends.insert(position, end)
+        self.durations.insert(position, end - start)
+        self.total_seconds += end - start
+
+    def replace(self, position: int, row: LogColumns):
+        # Overwrite the row at the given position
+        log_id, origin, destination, mode, start, end = row
+        self.total_seconds += (end - start) - self.durations[position]
+        self.descriptions.pop(self.ids[position], None)
+        self.ids[position] = log_id
+        self.origins[position] = self.encode(origin)
+        self.destinations[position] = self.encode(destination)
+        self.modes[position] = self.encode(mode)
+        self.starts[position] = start
+        self.ends[position] = end
+        self.durations[position] = end - start
+
+    def remove(self, position: int):
+        # Remove the row at the given position
+        self.total_seconds -= self.durations[position]
+        self.descriptions.pop(self.ids[position], None)
+
+        for name in COLUMN_NAMES:
+            del getattr(self, name)[position]
+
+    def remove_positions(self, positions: Iterable[int]):
+        # Remove many rows with one pass over each column
+        drop = set(positions)
+
+        if not drop:
+            return
+
+        for position in drop:
+            self.total_seconds -= self.durations[position]
+            self.descriptions.pop(self.ids[position], None)
+
+        for name in COLUMN_NAMES:
+            column = getattr(self, name)
+            setattr(self, name, array(column.typecode, (value for i, value in enumerate(column) if i not in drop)))
+
+    def find(self, log_id: int) -> int:
+        # Return the position of a log, -1 if it is not loaded
+        try:
+            return self.ids.index(log_id)
+        except ValueError:
+            return -1
+
+    def positions_of(self, log_ids: Iterable[int]) -> Dict[int, int]:
+        # Map log IDs to positions with a single scan
+        wanted = set(log_ids)
+        return {log_id: i for i, log_id in enumerate(self.ids) if log_id in wanted}
+
+    def row(self, position: int) -> LogColumns:
+        # Return the row at a position in column tuple layout
+        return (self.ids[position], self.strings[self.origins[position]], self.strings[self.destinations[position]],
+                self.strings[self.modes[position]], self.starts[position], self.ends[position])
+
+    def description(self, position: int) -> str:
+        # Fetch the description lazily by ID and keep a bounded cache of recent ones
+        log_id = self.ids[position]
+        description = self.descriptions.get(log_id)
+
+        if description is None:
+            if len(self.descriptions) >= 4096:
+                self.descriptions.clear()
+
+            description = db.get_description(log_id)
+            self.descriptions[log_id] = description
+
+        return description
+
+    def sort_key(self, column: int) -> Callable[[int], object]:
+        # Return a key function over positions for a view column
+        if column == 1:
+            return lambda i: self.strings[self.origins[i]]
+        if column == 2:
+            return lambda i: self.strings[self.destinations[i]]
+        if column == 3:
+            return lambda i: self.strings[self.modes[i]]
+        if column == 4:
+            return self.starts.__getitem__
+        if column == 5:
+            return self.ends.__getitem__
+        if column == 6:
+            return self.durations.__getitem__
+        if column == 7:
+            # Ranked by the database so no description is loaded; the ranks only hold for the current positions
+            positions = {log_id: i for i, log_id in enumerate(self.ids)}
+            ranks = array("q", [0]) * len(self.ids)
+
+            for rank, (log_id,) in enumerate(db.iter_description_order()):
+                position = positions.get(log_id)
+
+                if position is not None:
+                    ranks[position] = rank
+
+            return ranks.__getitem__
+
+        return self.ids.__getitem__
+
+    @staticmethod
+    def row_key(column: int, row: LogColumns) -> Optional[object]:
+        # Key of a not yet stored row, None for columns that need a database read
+        log_id, origin, destination, mode, start, end = row
+        keys = {0: log_id, 1: origin, 2: destination, 3: mode, 4: start, 5: end, 6: end - start}
+        return keys.get(column)
+
+    def sort(self, column: int, descending: bool = False) -> List[int]:
+        # Physically reorder every column by a view column, returning the old position of each new row
+        order = sorted(range(len(self.ids)), key=self.sort_key(column), reverse=descending)
+
+        for name in COLUMN_NAMES:
+            column_values = getattr(self, name)
+            setattr(self, name, array(column_values.typecode, (column_values[i] for i in order)))
+
+        return order
+
+    def bisect(self, column: int, key: object, descending: bool = False) -> int:
+        # Find the position that keeps rows ordered by column after inserting key
+        key_of = self.sort_key(column)
+        low, high = 0, len(self.ids)
+
+        while low < high:
+            middle = (low + high) // 2
+
+            if (key_of(middle) > key) if descending else (key_of(middle) <= key):
+                low = middle + 1
+            else:
+                high = middle
+
+        return low
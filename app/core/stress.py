@@ -0,0 +1,346 @@
+import argparse
+import calendar
+import multiprocessing
+import os
+import random
+import shutil
+import sqlite3
+import tempfile
+import time
+from array import array
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, NamedTuple, Optional, Sequence, Set, Tuple
+from core import db
+from core.downsample import load_series
+
+# A stress run drives the db module functions against a temporary database from a mix of reader and writer
+# workers. Thread workers share this process's connection and writer thread; process workers each connect on
+# their own, like the GUI, cron scripts and importers running side by side. Every call is timed, lock errors
+# are counted apart from other failures, and the database is checked for consistency afterwards
+READ_OPS = ("get", "get_all", "day_totals")
+WRITE_OPS = ("create", "update", "delete", "clear")
+DEFAULT_READ_MIX = "get=70,get_all=10,day_totals=20"
+DEFAULT_WRITE_MIX = "create=50,update=30,delete=19,clear=1"
+
+# Trips are spread over one year so day totals and route statistics see many days and routes
+YEAR = 2026
+ROUTES = [("Home", "Work", "Bus"), ("Work", "Home", "Bus"), ("Home", "Gym", "Walk"), ("Gym", "Home", "Walk"),
+          ("Home", "Airport", "Car"), ("Airport", "Home", "Car"), ("Home", "Park", "Bicycle")]
+
+# Workers start together this many seconds after being submitted, so process start-up is not measured
+START_DELAY = 1.0
+
+# Highest log ID readers pick from is refreshed every this many operations
+ID_REFRESH = 256
+
+# Distinct error messages kept per worker for the summary
+ERROR_SAMPLES = 5
+
+class WorkerResult(NamedTuple):
+    latencies: Dict[str, array]  # Operation -> seconds of each successful call
+    locked: Dict[str, int]  # Operation -> "database is locked" / "busy" failures
+    errors: Dict[str, int]  # Operation -> other failures
+    messages: List[str]  # First few distinct failure messages
+    created: List[int]  # IDs of logs this worker created
+    deleted: List[int]  # IDs of logs this worker deleted
+    descriptions: Dict[int, str]  # Description last written by an update, by log ID
+    anomalies: int  # get_all results with duplicate or unordered IDs
+    elapsed: float  # Seconds spent running operations
+
+class Check(NamedTuple):
+    name: str
+    passed: bool
+    detail: str
+
+def parse_mix(text: str, operations: Sequence[str]) -> List[Tuple[str, int]]:
+    # "create=50,update=30" to [(operation, weight)], raising ValueError with a user-facing message
+    mix = []
+
+    for part in text.split(","):
+        name, _, weight = part.strip().partition("=")
+
+        if name not in operations:
+            raise ValueError(f"Unknown operation '{name}', expected one of {', '.join(operations)}")
+        if not weight.isdigit():
+            raise ValueError(f"Weight of '{name}' must be a whole number, e.g. {name}=10")
+
+        mix.append((name, int(weight)))
+
+    if not any(weight for _, weight in mix):
+        raise ValueError(f"Mix '{text}' has no operation with a weight above 0")
+
+    return mix
+
+def random_trip(rng: random.Random) -> Tuple[str, str, str, str, str]:
+    # (origin, destination, mode, start, end) of a trip somewhere in YEAR
+    origin, destination, mode = rng.choice(ROUTES)
+    start = datetime(YEAR, 1, 1) + timedelta(minutes=rng.randrange(364 * 24 * 60))
+    end = start + timedelta(minutes=rng.randint(5, 90))
+    return origin, destination, mode, start.strftime("%Y-%m-%d %H:%M:%S"), end.strftime("%Y-%m-%d %H:%M:%S")
+
+def is_lock_error(error: Exception) -> bool:
+    return isinstance(error, sqlite3.OperationalError) and ("locked" in str(error) or "busy" in str(error))
+
+def run_worker(index: int, role: str, location: Optional[str], mix: List[Tuple[str, int]], start_at: float,
+               deadline: float, operations: int, seed: int) -> WorkerResult:
+    # Run weighted random operations until the deadline or the operation count, whichever is given
+    # location is None for thread workers, which use the connection already open in this process
+    if location is not None:
+        db.connect(location)
+
+    rng = random.Random(seed * 1000 + index)
+    names = [name for name, _ in mix]
+    weights = [weight for _, weight in mix]
+    result = WorkerResult({name: array("d") for name in (*READ_OPS, *WRITE_OPS)}, dict.fromkeys((*READ_OPS, *WRITE_OPS), 0),
+                          dict.fromkeys((*READ_OPS, *WRITE_OPS), 0), [], [], [], {}, 0, 0.0)
+    own: List[int] = []  # Live logs this worker created; only their creator updates or deletes them
+    highest = 1
+    anomalies = 0
+    done = 0
+
+    time.sleep(max(start_at - time.time(), 0))
+    began = time.perf_counter()
+
+    while (done < operations) if operations else (time.time() < deadline):
+        name = rng.choices(names, weights)[0]
+
+        # Updates and deletes need a log of this worker's own
+        if name in ("update", "delete") and not own:
+            name = "create"
+
+        if role == "reader" and done % ID_REFRESH == 0:
+            highest = db.connection().execute("SELECT MAX(id) FROM log").fetchone()[0] or 1
+
+        started = time.perf_counter()
+
+        try:
+            if name == "create":
+                own.append(db.create_log(*random_trip(rng), f"worker {index} #{done}"))
+                result.created.append(own[-1])
+            elif name == "update":
+                log_id = rng.choice(own)
+                description = f"worker {index} update #{done}"
+                db.update_log(log_id, *random_trip(rng), description)
+                result.descriptions[log_id] = description
+            elif name == "delete":
+                log_id = own.pop(rng.randrange(len(own)))
+                db.delete_log(log_id)
+                result.deleted.append(log_id)
+            elif name == "clear":
+                db.clear_all_logs()
+                own.clear()
+            elif name == "get":
+                db.get_log(rng.randint(1, highest))
+            elif name == "get_all":
+                ids = [row[0] for row in db.get_all_logs()]
+
+                if any(a >= b for a, b in zip(ids, ids[1:])):
+                    anomalies += 1
+            else:
+                db.get_day_totals(YEAR)
+
+            result.latencies[name].append(time.perf_counter() - started)
+        except Exception as e:
+            if is_lock_error(e):
+                result.locked[name] += 1
+            else:
+                result.errors[name] += 1
+
+            message = f"{name}: {type(e).__name__}: {e}"
+
+            if len(result.messages) < ERROR_SAMPLES and message not in result.messages:
+                result.messages.append(message)
+
+        done += 1
+
+    return result._replace(anomalies=anomalies, elapsed=time.perf_counter() - began)
+
+def percentile(values: List[float], share: float) -> float:
+    # Nearest-rank percentile of sorted values
+    if not values:
+        return 0.0
+
+    return values[min(len(values) - 1, max(0, int(round(share * len(values))) - 1))]
+
+def check_consistency(seeded: List[int], results: List[WorkerResult]) -> List[Check]:
+    # Compare the database with what the workers were told succeeded
+    conn = db.connection()
+    cleared_through = conn.execute(f"SELECT {db.CLEARED_THROUGH}").fetchone()[0]
+    created = set(seeded)
+    deleted: Set[int] = set()
+    descriptions: Dict[int, str] = {}
+
+    for result in results:
+        created.update(result.created)
+        deleted.update(result.deleted)
+        descriptions.update(result.descriptions)
+
+    # Acknowledged creates must be there unless deleted or cleared, and nothing else may be
+    logs = {row[0]: row for row in db.get_all_logs()}
+    expected = {log_id for log_id in created - deleted if log_id > cleared_through}
+    missing = expected - logs.keys()
+    unexpected = logs.keys() - expected
+    checks = [Check("live logs", not missing and not unexpected,
+                    f"{len(expected)} expected, {len(logs)} found, {len(missing)} missing, {len(unexpected)} unexpected")]
+
+    # The last acknowledged update of a live log is the one stored
+    stale = [log_id for log_id, description in descriptions.items() if log_id in logs and logs[log_id][6] != description]
+    checks.append(Check("updates", not stale, f"{len(descriptions)} updated logs, {len(stale)} with an older description"))
+
+    # Trigger-maintained route statistics count exactly the live logs
+    live = f"SELECT origin, destination, mode, COUNT(*) FROM log WHERE {db.LIVE} GROUP BY origin, destination, mode"
+    stats = "SELECT origin, destination, mode, count FROM route_stats"
+    routes = conn.execute(f"SELECT (SELECT COUNT(*) FROM ({live} EXCEPT {stats})) + (SELECT COUNT(*) FROM ({stats} EXCEPT {live}))").fetchone()[0]
+    checks.append(Check("route statistics", routes == 0, f"{routes} routes differ from the live logs"))
+
+    # Cached day totals agree with a fresh read
+    cached = db.get_day_totals(YEAR)
+    fresh = db.DayTotals().get(YEAR)
+    days = sum(1 for a, b in zip(cached, fresh) if a != b)
+    checks.append(Check("day totals cache", days == 0, f"{days} days differ from a fresh read"))
+
+    problems = [row[0] for row in conn.execute("PRAGMA quick_check") if row[0] != "ok"]
+    checks.append(Check("integrity", not problems, problems[0] if problems else "quick_check ok"))
+
+    anomalies = sum(result.anomalies for result in results)
+    checks.append(Check("get_all order", anomalies == 0, f"{anomalies} results with duplicate or unordered IDs"))
+    return checks
+
+def check_external_write(location: str, rng: random.Random) -> List[Check]:
+    # A write from a second connection followed by a local write before anything is read again: the local
+    # write's change log entries must not hide the other one from the caches
+    first = calendar.timegm((YEAR, 1, 1, 0, 0, 0))
+    middle = calendar.timegm((YEAR, 7, 1, 0, 0, 0))
+    last = calendar.timegm((YEAR + 1, 1, 1, 0, 0, 0)) - 1
+    halves = [(first, middle - 1), (middle, last)]
+    db.get_day_totals(YEAR)
+
+    for start_ts, end_ts in halves:
+        db.get_duration_series(start_ts, end_ts)
+
+    # The other write lands in the second half, the local one in the first, so only a full drop covers both
+    other = sqlite3.connect(location)
+
+    try:
+        with other:
+            stmt = "INSERT INTO log(origin, destination, mode, start, end, description) VALUES (?, ?, ?, ?, ?, 'external')"
+            other.execute(stmt, (*rng.choice(ROUTES), f"{YEAR}-09-15 08:00:00", f"{YEAR}-09-15 08:40:00"))
+    finally:
+        other.close()
+
+    db.create_logs([(*rng.choice(ROUTES), f"{YEAR}-02-15 08:00:00", f"{YEAR}-02-15 08:25:00", "local", None, None, None, None)])
+
+    days = sum(1 for a, b in zip(db.get_day_totals(YEAR), db.DayTotals().get(YEAR)) if a != b)
+    checks = [Check("external write", days == 0, f"{days} cached day totals differ from a fresh read")]
+    stale = sum(1 for start_ts, end_ts in halves if db.get_duration_series(start_ts, end_ts) != load_series(db.iter_duration_series(start_ts, end_ts, None)))
+    checks.append(Check("external series", stale == 0, f"{stale} of {len(halves)} cached duration series differ from a fresh read"))
+    return checks
+
+def run_stress(thread_readers: int, thread_writers: int, process_readers: int, process_writers: int,
+               read_mix: List[Tuple[str, int]], write_mix: List[Tuple[str, int]], duration: float, operations: int,
+               seed_logs: int, seed: int, directory: str) -> Tuple[List[WorkerResult], List[Check], float]:
+    # Run the workers against a new database in directory and check it, returning (results, checks, seconds)
+    location = os.path.join(directory, "stress.db")
+    db.connect(location)
+    rng = random.Random(seed)
+    db.create_logs([(*random_trip(rng), "seed", None, None, None, None) for _ in range(seed_logs)])
+    seeded = [row[0] for row in db.get_all_logs()]
+
+    start_at = time.time() + START_DELAY
+    deadline = start_at + duration
+    # (role, operation mix, runs as a thread of this process)
+    workers = ([("reader", read_mix, True)] * thread_readers + [("reader", read_mix, False)] * process_readers +
+               [("writer", write_mix, True)] * thread_writers + [("writer", write_mix, False)] * process_writers)
+    threads = ThreadPoolExecutor(max_workers=max(thread_readers + thread_writers, 1))
+    processes = ProcessPoolExecutor(max_workers=max(process_readers + process_writers, 1), mp_context=multiprocessing.get_context("spawn"))
+    futures: List[Future] = []
+
+    try:
+        for index, (role, mix, in_process) in enumerate(workers):
+            executor = threads if in_process else processes
+            futures.append(executor.submit(run_worker, index, role, None if in_process else location, mix, start_at, deadline, operations, seed))
+
+        results = [future.result() for future in futures]
+    finally:
+        threads.shutdown()
+        processes.shutdown()
+
+    elapsed = max((result.elapsed for result in results), default=0.0)
+    return results, check_consistency(seeded, results) + check_external_write(location, rng), elapsed
+
+def main(argv: Optional[Sequence[str]] = None):
+    # Command line entry point: python -m core.stress
+    parser = argparse.ArgumentParser(description="Stress the database module with concurrent thread and process readers and writers.")
+    parser.add_argument("--thread-readers", type=int, default=2, help="reader threads sharing this process's connection")
+    parser.add_argument("--thread-writers", type=int, default=2, help="writer threads sharing this process's writer thread")
+    parser.add_argument("--process-readers", type=int, default=1, help="reader processes, each with its own connection")
+    parser.add_argument("--process-writers", type=int, default=1, help="writer processes, each with its own connection and writer thread")
+    parser.add_argument("--read-mix", default=DEFAULT_READ_MIX, help=f"weighted reader operations out of {', '.join(READ_OPS)} (default: {DEFAULT_READ_MIX})")
+    parser.add_argument("--write-mix", default=DEFAULT_WRITE_MIX, help=f"weighted writer operations out of {', '.join(WRITE_OPS)} (default: {DEFAULT_WRITE_MIX})")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds each worker runs (default: 10)")
+    parser.add_argument("--operations", type=int, default=0, help="operations per worker instead of a duration")
+    parser.add_argument("--seed-logs", type=int, default=1000, help="logs in the database before the workers start (default: 1000)")
+    parser.add_argument("--seed", type=int, default=1, help="random seed, so a run can be repeated")
+    parser.add_argument("--keep", action="store_true", help="keep the temporary database and print its location")
+    args = parser.parse_args(argv)
+
+    try:
+        read_mix = parse_mix(args.read_mix, READ_OPS)
+        write_mix = parse_mix(args.write_mix, WRITE_OPS)
+    except ValueError as e:
+        parser.error(str(e))
+
+    counts = (args.thread_readers, args.thread_writers, args.process_readers, args.process_writers)
+
+    if min(counts) < 0 or not any(counts):
+        parser.error("Give at least one reader or writer and no negative counts")
+
+    directory = tempfile.mkdtemp(prefix="travel-logger-stress-")
+
+    try:
+        results, checks, elapsed = run_stress(*counts, read_mix, write_mix, args.duration, args.operations, args.seed_logs, args.seed, directory)
+    finally:
+        db.connect(":memory:")  # Close the stress database and its writer before removing it
+
+        if args.keep:
+            print(f"Database kept at {os.path.join(directory, 'stress.db')}")
+        else:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    print(f"{args.thread_readers} thread readers, {args.thread_writers} thread writers, "
+          f"{args.process_readers} process readers, {args.process_writers} process writers for {elapsed:.1f} s")
+    print(f"{'operation':<12}{'calls':>9}{'ops/s':>10}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}{'locked':>8}{'errors':>8}")
+
+    total_calls = total_locked = total_errors = 0
+
+    for name in [*READ_OPS, *WRITE_OPS]:
+        latencies = sorted(value for result in results for value in result.latencies.get(name, ()))
+        locked = sum(result.locked.get(name, 0) for result in results)
+        errors = sum(result.errors.get(name, 0) for result in results)
+
+        if not latencies and not locked and not errors:
+            continue
+
+        total_calls += len(latencies)
+        total_locked += locked
+        total_errors += errors
+        print(f"{name:<12}{len(latencies):>9}{len(latencies) / max(elapsed, 1e-9):>10.0f}"
+              f"{percentile(latencies, 0.5) * 1000:>10.2f}{percentile(latencies, 0.9) * 1000:>10.2f}"
+              f"{percentile(latencies, 0.99) * 1000:>10.2f}{(latencies[-1] if latencies else 0) * 1000:>10.2f}{locked:>8}{errors:>8}")
+
+    print(f"{'total':<12}{total_calls:>9}{total_calls / max(elapsed, 1e-9):>10.0f}{'':>40}{total_locked:>8}{total_errors:>8}")
+
+    for message in dict.fromkeys(message for result in results for message in result.messages):
+        print(f"  {message}")
+
+    print("Consistency:")
+
+    for check in checks:
+        print(f"  {check.name:<18}{'ok' if check.passed else 'FAILED':<8}{check.detail}")
+
+    if not all(check.passed for check in checks):
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
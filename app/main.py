@@ -1,12 +1,20 @@
-import sys
-import os
-from PyQt6.QtWidgets import QApplication
-from shell.main_window import MainWindow
-
-sys.path.append(os.path.join(os.path.dirname(__file__)))
-
-if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    window = MainWindow()
-    window.show()
-    sys.exit(app.exec())
\ No newline at end of file
+import sys
+import os
+import argparse
+from PyQt6.QtWidgets import QApplication
+from core import db
+from shell.main_window import MainWindow
+
+sys.path.append(os.path.join(os.path.dirname(__file__)))
+
+if __name__ == "__main__":
+    # Qt options such as -style are passed through to QApplication
+    parser = argparse.ArgumentParser(description="Travel & Commute Time Logger")
+    parser.add_argument("--database", default=None, help=f"database path, file: URI or :memory: (default: ${db.DATABASE_ENV} or {db.DEFAULT_DATABASE})")
+    args, qt_args = parser.parse_known_args()
+    db.connect(args.database)
+
+    app = QApplication(sys.argv[:1] + qt_args)
+    window = MainWindow()
+    window.show()
+    sys.exit(app.exec())
@@ -0,0 +1,181 @@
+from PyQt6.QtWidgets import QWidget, QComboBox, QLabel, QHBoxLayout, QVBoxLayout, QFormLayout, QToolTip
+from PyQt6.QtCore import Qt, QDate, QDateTime, QTimeZone, QEvent, QRectF, pyqtSignal
+from PyQt6.QtGui import QPainter, QPen, QColor
+from core import db, report
+
+# Cell colors from no trips to the busiest days
+LEVEL_COLORS = ["#ebedf0", "#c6dbef", "#6baed6", "#2171b5", "#08306b"]
+
+class CalendarHeatmapPanel(QWidget):
+	# Emitted with a "YYYY-MM-DD" date when a day is clicked
+	day_clicked = pyqtSignal(str)
+
+	def __init__(self, parent=None):
+		super().__init__(parent)
+
+		# Year selection above the calendar
+		self.year_selector = QComboBox()
+		self.heatmap = CalendarHeatmap(self)
+		self.hint = QLabel("Click a day to show its trips")
+
+		selector_layout = QFormLayout()
+		selector_layout.addRow("Year:", self.year_selector)
+
+		controls_layout = QHBoxLayout()
+		controls_layout.addLayout(selector_layout)
+		controls_layout.addStretch(1)
+		controls_layout.addWidget(self.hint)
+
+		main_layout = QVBoxLayout()
+		main_layout.addLayout(controls_layout)
+		main_layout.addWidget(self.heatmap, 1)
+		main_layout.setContentsMargins(0, 0, 0, 0)
+		self.setLayout(main_layout)
+
+		self.year_selector.currentIndexChanged.connect(self.select_year)
+		self.heatmap.day_clicked.connect(self.day_clicked)
+
+	def refresh(self):
+		# Reload the years that have trips and the shown year's day totals
+		current = self.year_selector.currentText()
+		start_range = db.get_start_range()
+		years = []
+
+		if start_range is not None:
+			# Newest year first; stored times are wall-clock values kept as UTC epochs
+			first, last = (QDateTime.fromSecsSinceEpoch(epoch, QTimeZone.utc()).date().year() for epoch in start_range)
+			years = [str(year) for year in range(last, first - 1, -1)]
+
+		self.year_selector.blockSignals(True)
+		self.year_selector.clear()
+		self.year_selector.addItems(years or [str(QDate.currentDate().year())])
+		index = self.year_selector.findText(current)
+		self.year_selector.setCurrentIndex(max(index, 0))
+		self.year_selector.blockSignals(False)
+
+		self.select_year()
+
+	def select_year(self):
+		self.heatmap.set_year(int(self.year_selector.currentText()))
+
+class CalendarHeatmap(QWidget):
+	# One cell per day, a column per week from Monday to Sunday, colored by the day's total trip time
+	# Only the per-day totals are read, never individual trips
+	day_clicked = pyqtSignal(str)
+
+	MARGIN_LEFT = 35
+	MARGIN_TOP = 20
+	LEGEND_HEIGHT = 22
+
+	def __init__(self, parent=None):
+		super().__init__(parent)
+
+		self.setMinimumHeight(160)
+		self.year = None
+		self.days = []
+		self.max_seconds = 0
+
+	def set_year(self, year):
+		self.year = year
+		self.days = db.get_day_totals(year)
+		self.max_seconds = max((seconds for _, seconds in self.days), default=0)
+		self.update()
+
+	def cell_size(self):
+		# Square cells filling the width for 54 week columns, or the height for 7 rows
+		width = (self.width() - self.MARGIN_LEFT - 5) / 54
+		height = (self.height() - self.MARGIN_TOP - self.LEGEND_HEIGHT) / 7
+		return max(4.0, min(width, height))
+
+	def cell_rect(self, day):
+		# Column and row of a day of the year, with January 1 in the first column
+		first = QDate(self.year, 1, 1)
+		offset = first.dayOfWeek() - 1 + day
+		size = self.cell_size()
+		return QRectF(self.MARGIN_LEFT + (offset // 7) * size, self.MARGIN_TOP + (offset % 7) * size, size - 2, size - 2)
+
+	def day_at(self, position):
+		# Day of the year under a point, None outside the calendar
+		if self.year is None:
+			return None
+
+		size = self.cell_size()
+		column = int((position.x() - self.MARGIN_LEFT) // size)
+		row = int((position.y() - self.MARGIN_TOP) // size)
+
+		if position.x() < self.MARGIN_LEFT or position.y() < self.MARGIN_TOP or row > 6:
+			return None
+
+		day = column * 7 + row - (QDate(self.year, 1, 1).dayOfWeek() - 1)
+		return day if 0 <= day < len(self.days) else None
+
+	def level(self, seconds):
+		# Color level 0 for no trips, otherwise 1 to 4 by share of the busiest day
+		if seconds <= 0 or self.max_seconds <= 0:
+			return 0
+
+		return min(4, 1 + int(4 * seconds / (self.max_seconds + 1)))
+
+	def event(self, event):
+		# Tooltip with the day's trips and total time
+		if event.type() == QEvent.Type.ToolTip:
+			day = self.day_at(event.pos())
+
+			if day is None:
+				QToolTip.hideText()
+			else:
+				trips, seconds = self.days[day]
+				date = QDate(self.year, 1, 1).addDays(day)
+				QToolTip.showText(event.globalPos(), f"{date.toString('ddd, MMM d, yyyy')}: {trips} {'trip' if trips == 1 else 'trips'}, {report.format_duration(seconds)}", self)
+
+			return True
+
+		return super().event(event)
+
+	def mousePressEvent(self, event):
+		if event.button() != Qt.MouseButton.LeftButton:
+			return
+
+		day = self.day_at(event.position())
+
+		if day is not None:
+			self.day_clicked.emit(QDate(self.year, 1, 1).addDays(day).toString("yyyy-MM-dd"))
+
+	def paintEvent(self, event):
+		painter = QPainter(self)
+		painter.fillRect(self.rect(), QColor("#ffffff"))
+
+		if self.year is None:
+			return
+
+		painter.setPen(Qt.PenStyle.NoPen)
+
+		for day, (_, seconds) in enumerate(self.days):
+			painter.setBrush(QColor(LEVEL_COLORS[self.level(seconds)]))
+			painter.drawRect(self.cell_rect(day))
+
+		# Month names above the week a month starts in, weekday names on the left
+		size = self.cell_size()
+		painter.setPen(QPen(QColor("#2c3c4e")))
+
+		for month in range(1, 13):
+			rect = self.cell_rect(QDate(self.year, 1, 1).daysTo(QDate(self.year, month, 1)))
+			painter.drawText(QRectF(rect.left(), 2, size * 5, self.MARGIN_TOP - 4), Qt.AlignmentFlag.AlignLeft, QDate(self.year, month, 1).toString("MMM"))
+
+		for row, name in ((0, "Mon"), (2, "Wed"), (4, "Fri")):
+			painter.drawText(QRectF(0, self.MARGIN_TOP + row * size, self.MARGIN_LEFT - 5, size), Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter, name)
+
+		# Legend and the year's total
+		trips = sum(trips for trips, _ in self.days)
+		seconds = sum(seconds for _, seconds in self.days)
+		bottom = self.MARGIN_TOP + 7 * size + 4
+		painter.drawText(QRectF(self.MARGIN_LEFT, bottom, 400, 16), Qt.AlignmentFlag.AlignLeft,
+						f"{trips} {'trip' if trips == 1 else 'trips'} in {self.year}, {report.format_duration(seconds)}")
+
+		x = self.MARGIN_LEFT + 54 * size - 5 * 14 - 70
+		painter.drawText(QRectF(x, bottom, 30, 16), Qt.AlignmentFlag.AlignRight, "Less")
+
+		for level, color in enumerate(LEVEL_COLORS):
+			painter.fillRect(QRectF(x + 35 + level * 14, bottom + 2, 11, 11), QColor(color))
+
+		painter.drawText(QRectF(x + 35 + 5 * 14, bottom, 35, 16), Qt.AlignmentFlag.AlignLeft, "More")
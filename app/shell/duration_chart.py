@@ -0,0 +1,238 @@
+from PyQt6.QtWidgets import QWidget, QComboBox, QLabel, QHBoxLayout, QVBoxLayout, QFormLayout
+from PyQt6.QtCore import Qt, QDateTime, QTimeZone, QTimer, QPointF, QRectF
+from PyQt6.QtGui import QPainter, QPen, QColor, QPolygonF
+from core import db
+from core.downsample import lttb
+
+# Line colors for per-mode series
+SERIES_COLORS = ["#2c7fb8", "#e6550d", "#31a354", "#756bb1", "#de2d26", "#636363", "#fdae6b", "#17becf"]
+
+class DurationChartPanel(QWidget):
+	def __init__(self, parent=None):
+		super().__init__(parent)
+
+		# Mode selection above the chart
+		self.mode_selector = QComboBox()
+		self.chart = DurationChart(self)
+		self.hint = QLabel("Scroll to zoom, drag to pan, double-click to reset")
+
+		selector_layout = QFormLayout()
+		selector_layout.addRow("Mode:", self.mode_selector)
+
+		controls_layout = QHBoxLayout()
+		controls_layout.addLayout(selector_layout)
+		controls_layout.addStretch(1)
+		controls_layout.addWidget(self.hint)
+
+		main_layout = QVBoxLayout()
+		main_layout.addLayout(controls_layout)
+		main_layout.addWidget(self.chart, 1)
+		main_layout.setContentsMargins(0, 0, 0, 0)
+		self.setLayout(main_layout)
+
+		self.mode_selector.currentIndexChanged.connect(self.select_mode)
+
+	def refresh(self):
+		# Reload the mode list and re-query the visible range
+		current = self.mode_selector.currentText()
+
+		self.mode_selector.blockSignals(True)
+		self.mode_selector.clear()
+		self.mode_selector.addItems(["All modes", "Each mode"] + db.get_modes())
+		index = self.mode_selector.findText(current)
+		self.mode_selector.setCurrentIndex(max(index, 0))
+		self.mode_selector.blockSignals(False)
+
+		# Keep the current zoom unless there was nothing to show yet
+		self.select_mode(reset=self.chart.view_start is None)
+
+	def select_mode(self, reset=True):
+		# Map the selector entry to the chart's series definition
+		index = self.mode_selector.currentIndex()
+
+		if index <= 0:
+			modes = [None]
+		elif index == 1:
+			modes = db.get_modes()
+		else:
+			modes = [self.mode_selector.currentText()]
+
+		self.chart.set_modes(modes, reset)
+
+class DurationChart(QWidget):
+	# Duration against start time, re-queried and downsampled with LTTB for the visible range only
+	MARGIN_LEFT = 60
+	MARGIN_RIGHT = 15
+	MARGIN_TOP = 10
+	MARGIN_BOTTOM = 30
+
+	def __init__(self, parent=None):
+		super().__init__(parent)
+
+		self.setMinimumHeight(200)
+
+		self.modes = [None]
+		self.view_start = None
+		self.view_end = None
+		self.series = []
+		self.visible_count = 0
+		self.drag_x = None
+
+		# Coalesce bursts of wheel and drag events into one query
+		self.query_timer = QTimer(self)
+		self.query_timer.setSingleShot(True)
+		self.query_timer.setInterval(30)
+		self.query_timer.timeout.connect(self.query)
+
+	def set_modes(self, modes, reset=True):
+		# Change which series are drawn, optionally fitting the view to their full time range
+		self.modes = modes
+
+		if reset:
+			self.reset_view()
+		else:
+			self.query()
+
+	def reset_view(self):
+		# Fit the view to all logs of the selected modes
+		ranges = [db.get_start_range(mode) for mode in self.modes]
+		ranges = [r for r in ranges if r is not None]
+
+		if ranges:
+			self.view_start = min(r[0] for r in ranges)
+			self.view_end = max(r[1] for r in ranges)
+
+			# Single trip or same start: show an hour around it
+			if self.view_start == self.view_end:
+				self.view_start -= 1800
+				self.view_end += 1800
+		else:
+			self.view_start = self.view_end = None
+
+		self.query()
+
+	def plot_rect(self):
+		return QRectF(self.MARGIN_LEFT, self.MARGIN_TOP,
+					max(1, self.width() - self.MARGIN_LEFT - self.MARGIN_RIGHT),
+					max(1, self.height() - self.MARGIN_TOP - self.MARGIN_BOTTOM))
+
+	def query(self):
+		# Read only the visible range and keep about one point per horizontal pixel
+		self.series = []
+		self.visible_count = 0
+
+		if self.view_start is None:
+			self.update()
+			return
+
+		threshold = max(3, int(self.plot_rect().width()))
+
+		for i, mode in enumerate(self.modes):
+			xs, ys = db.get_duration_series(int(self.view_start), int(self.view_end), mode)
+			self.visible_count += len(xs)
+			sampled_xs, sampled_ys = lttb(xs, ys, threshold)
+			self.series.append((mode or "All modes", QColor(SERIES_COLORS[i % len(SERIES_COLORS)]), sampled_xs, sampled_ys))
+
+		self.update()
+
+	def resizeEvent(self, event):
+		super().resizeEvent(event)
+		self.query_timer.start()
+
+	def wheelEvent(self, event):
+		# Zoom around the cursor position
+		if self.view_start is None:
+			return
+
+		rect = self.plot_rect()
+		ratio = min(max((event.position().x() - rect.left()) / rect.width(), 0.0), 1.0)
+		span = self.view_end - self.view_start
+		anchor = self.view_start + ratio * span
+		factor = 0.8 if event.angleDelta().y() > 0 else 1.25
+		new_span = max(span * factor, 60)
+
+		self.view_start = anchor - ratio * new_span
+		self.view_end = self.view_start + new_span
+		self.query_timer.start()
+
+	def mousePressEvent(self, event):
+		if event.button() == Qt.MouseButton.LeftButton:
+			self.drag_x = event.position().x()
+
+	def mouseMoveEvent(self, event):
+		# Pan by the dragged distance
+		if self.drag_x is None or self.view_start is None:
+			return
+
+		x = event.position().x()
+		shift = (self.drag_x - x) / self.plot_rect().width() * (self.view_end - self.view_start)
+		self.view_start += shift
+		self.view_end += shift
+		self.drag_x = x
+		self.query_timer.start()
+
+	def mouseReleaseEvent(self, event):
+		self.drag_x = None
+
+	def mouseDoubleClickEvent(self, event):
+		self.reset_view()
+
+	def paintEvent(self, event):
+		painter = QPainter(self)
+		painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+		painter.fillRect(self.rect(), QColor("#ffffff"))
+
+		rect = self.plot_rect()
+		painter.setPen(QPen(QColor("#95a5a6")))
+		painter.drawRect(rect)
+
+		if self.view_start is None:
+			painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, "No logs to chart")
+			return
+
+		max_duration = max((max(ys) for _, _, _, ys in self.series if ys), default=0)
+		max_duration = max(max_duration * 1.1, 60)
+		span = max(self.view_end - self.view_start, 1)
+
+		def to_point(x, y):
+			return QPointF(rect.left() + (x - self.view_start) / span * rect.width(),
+						rect.bottom() - y / max_duration * rect.height())
+
+		# Series lines, clipped to the plot area
+		painter.save()
+		painter.setClipRect(rect)
+
+		for _, color, xs, ys in self.series:
+			painter.setPen(QPen(color, 1.5))
+			painter.drawPolyline(QPolygonF([to_point(x, y) for x, y in zip(xs, ys)]))
+
+			if len(xs) < rect.width() / 8:
+				for x, y in zip(xs, ys):
+					painter.drawEllipse(to_point(x, y), 2, 2)
+
+		painter.restore()
+
+		# Axis labels
+		painter.setPen(QPen(QColor("#2c3c4e")))
+		painter.drawText(QRectF(0, rect.top() - 5, self.MARGIN_LEFT - 5, 20), Qt.AlignmentFlag.AlignRight, f"{int(max_duration // 60)} min")
+		painter.drawText(QRectF(0, rect.bottom() - 15, self.MARGIN_LEFT - 5, 20), Qt.AlignmentFlag.AlignRight, "0 min")
+		painter.drawText(QRectF(rect.left(), rect.bottom() + 5, rect.width(), 20), Qt.AlignmentFlag.AlignLeft, self.format_epoch(self.view_start))
+		painter.drawText(QRectF(rect.left(), rect.bottom() + 5, rect.width(), 20), Qt.AlignmentFlag.AlignRight, self.format_epoch(self.view_end))
+
+		shown = sum(len(xs) for _, _, xs, _ in self.series)
+		painter.drawText(QRectF(rect.left(), rect.bottom() + 5, rect.width(), 20), Qt.AlignmentFlag.AlignHCenter, f"{shown} of {self.visible_count} trips drawn")
+
+		# Legend when several modes are drawn
+		if len(self.series) > 1:
+			y = rect.top() + 5
+
+			for name, color, _, _ in self.series:
+				painter.setPen(QPen(color, 3))
+				painter.drawLine(QPointF(rect.right() - 110, y + 7), QPointF(rect.right() - 95, y + 7))
+				painter.setPen(QPen(QColor("#2c3c4e")))
+				painter.drawText(QRectF(rect.right() - 90, y, 85, 15), Qt.AlignmentFlag.AlignLeft, name)
+				y += 15
+
+	def format_epoch(self, epoch):
+		# Stored times are wall-clock values kept as UTC epochs
+		return QDateTime.fromSecsSinceEpoch(int(epoch), QTimeZone.utc()).toString("yyyy-MM-dd hh:mm")
@@ -1,1075 +1,1948 @@
-from PyQt6.QtWidgets import QApplication, QMainWindow, QWidget, QDialog, QLabel, QPushButton, QComboBox, QTableWidget, QTableWidgetItem, QLineEdit, QTextEdit, QDateEdit, QTimeEdit, QDialogButtonBox, QMessageBox, QHBoxLayout, QVBoxLayout, QFormLayout
-from PyQt6.QtCore import Qt, QDateTime, QDate, QTime
-from pathlib import Path
-from core import db
-
-class MainWindow(QMainWindow):
-	def __init__(self):
-		super().__init__()
-
-		# Window setup
-		self.setWindowTitle("Travel & Commute Time Logger")
-		self.setFixedSize(1000, 400)
-		self.screen = QApplication.primaryScreen().availableGeometry()
-		self.move(int((self.screen.width() - self.width()) / 2), int((self.screen.height() - self.height()) / 2))
-		self.showNormal()
-		
-		# Data storage
-		self.tables = []
-		
-		# UI components initialization
-		self.title = QLabel("TRAVEL & COMMUTE TIME LOGGER")
-		self.title.setObjectName("title")
-		self.table_selector = QComboBox()
-		self.table_selector.setEnabled(False)
-		self.create_table_btn = QPushButton("Create Table")
-		self.rename_table_btn = QPushButton("Rename Table")
-		self.rename_table_btn.setEnabled(False)
-		self.delete_table_btn = QPushButton("Delete Table")
-		self.delete_table_btn.setEnabled(False)
-		self.table = QTableWidget()
-		self.total_duration_display = QLabel("Total Duration Time:")
-		self.average_duration_display = QLabel("Average Duration Time:")
-		self.add_log_btn = QPushButton("Add Log")
-		self.add_log_btn.setEnabled(False)
-		self.delete_log_btn = QPushButton("Delete Log")
-		self.delete_log_btn.setEnabled(False)
-		self.clear_all_logs_btn = QPushButton("Clear All Logs")
-		self.clear_all_logs_btn.setEnabled(False)
-		
-		# Layout setup
-		table_selector_layout = QFormLayout()
-		table_selector_layout.addRow("Table:", self.table_selector)
-
-		table_manager_layout = QHBoxLayout()
-		table_manager_layout.addLayout(table_selector_layout)
-		table_manager_layout.addWidget(self.create_table_btn)
-		table_manager_layout.addWidget(self.rename_table_btn)
-		table_manager_layout.addWidget(self.delete_table_btn)
-
-		duration_display_layout = QVBoxLayout()
-		duration_display_layout.addWidget(self.total_duration_display)
-		duration_display_layout.addWidget(self.average_duration_display)
-		
-		table_btn_layout = QVBoxLayout()
-		table_btn_layout.addWidget(self.add_log_btn)
-		table_btn_layout.addWidget(self.delete_log_btn)
-		table_btn_layout.addWidget(self.clear_all_logs_btn)
-		table_btn_layout.setAlignment(Qt.AlignmentFlag.AlignBottom)
-
-		left_layout = QVBoxLayout()
-		left_layout.addLayout(duration_display_layout)
-		left_layout.addLayout(table_btn_layout)
-		
-		self.table_layout = QHBoxLayout()
-		self.table_layout.addWidget(self.table, 5)
-		self.table_layout.addLayout(left_layout, 1)
-		
-		general_layout = QVBoxLayout()
-		general_layout.addWidget(self.title, 1, alignment=Qt.AlignmentFlag.AlignCenter)
-		general_layout.addLayout(table_manager_layout, 2)
-		general_layout.addLayout(self.table_layout, 5)
-		
-		main_layout = QWidget()
-		main_layout.setLayout(general_layout)
-		self.setCentralWidget(main_layout)
-		
-		# Signal connections
-		self.table_selector.currentIndexChanged.connect(self.switch_table)
-		self.create_table_btn.clicked.connect(self.open_child_create_table)
-		self.rename_table_btn.clicked.connect(self.open_child_rename_table)
-		self.delete_table_btn.clicked.connect(self.delete_table)
-		self.add_log_btn.clicked.connect(self.open_child_add_log)
-		self.delete_log_btn.clicked.connect(self.delete_log)
-		self.clear_all_logs_btn.clicked.connect(self.clear_all_logs)
-
-		self.load_stylesheet()
-		self.load_from_database()
-
-	def load_stylesheet(self):
-		# Load and apply QSS stylesheet for UI styling
-		qss_file_path = Path(__file__).resolve().parent.parent / "core" / "styles.qss"
-
-		if qss_file_path.exists():
-			with qss_file_path.open("r", encoding="utf-8") as f:
-				file = f.read()
-				app = QApplication.instance()
-				app.setStyleSheet(file)
-		
-	def load_from_database(self):
-		# Load logs from database and populate table with travel data
-		logs = db.get_all_logs()
-
-		if logs:
-			# Create default table if none exists
-			if not self.tables:
-				self.create_default_table()
-			
-			current_table = self.tables[0]
-			current_table.setSortingEnabled(False)
-			current_table.setRowCount(0)
-			
-			# Populate table with database records
-			for log in logs:
-				row = current_table.rowCount()
-				current_table.insertRow(row)
-				
-				log_id, origin, destination, mode, start, end, description = log
-				
-				# Parse database datetime format to display format
-				start_dt = QDateTime.fromString(start, "yyyy-MM-dd hh:mm:ss")
-				end_dt = QDateTime.fromString(end, "yyyy-MM-dd hh:mm:ss")
-				
-				start_dt_text = f"{start_dt.date().toString('yyyy, MMM d')} [{start_dt.time().toString('h:mm AP')}]"
-				end_dt_text = f"{end_dt.date().toString('yyyy, MMM d')} [{end_dt.time().toString('h:mm AP')}]"
-				duration_text = self.calculate_duration_per_log(start_dt, end_dt)
-				
-				# Store log ID in hidden column for database operations
-				id_item = QTableWidgetItem(str(log_id))
-				current_table.setItem(row, 0, id_item)
-				current_table.setItem(row, 1, QTableWidgetItem(origin))
-				current_table.setItem(row, 2, QTableWidgetItem(destination))
-				current_table.setItem(row, 3, QTableWidgetItem(mode))
-				
-				# Set sortable data for proper table sorting
-				start_item = QTableWidgetItem(start_dt_text)
-				start_item.setData(Qt.ItemDataRole.UserRole, self.get_sortable_datetime(start_dt_text))
-				end_item = QTableWidgetItem(end_dt_text)
-				end_item.setData(Qt.ItemDataRole.UserRole, self.get_sortable_datetime(end_dt_text))
-				duration_item = QTableWidgetItem(duration_text)
-				duration_item.setData(Qt.ItemDataRole.UserRole, self.get_sortable_duration(duration_text))
-				
-				current_table.setItem(row, 4, start_item)
-				current_table.setItem(row, 5, end_item)
-				current_table.setItem(row, 6, duration_item)
-				current_table.setItem(row, 7, QTableWidgetItem(description))
-				
-				# Make all cells non-editable for data integrity
-				for col in range(current_table.columnCount()):
-					item = current_table.item(row, col)
-
-					if item:
-						item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-			
-			current_table.setSortingEnabled(True)
-			
-			# Update UI state based on data availability
-			self.table_selector.setEnabled(True)
-			self.rename_table_btn.setEnabled(True)
-			self.delete_table_btn.setEnabled(True)
-			self.add_log_btn.setEnabled(True)
-			
-			if len(logs) > 0:
-				self.delete_log_btn.setEnabled(True)
-				self.clear_all_logs_btn.setEnabled(True)
-			
-			# Calculate and display duration statistics
-			total_duration, average_duration = self.calculate_total_and_average_duration()
-			self.total_duration_display.setText(total_duration)
-			self.average_duration_display.setText(average_duration)
-
-	def create_default_table(self):
-		# Create default table widget with predefined columns and settings
-		new_table = QTableWidget(0, 8)
-		new_table.setHorizontalHeaderLabels(["ID", "Origin", "Destination", "Mode", "Start Date/Time", "End Date/Time", "Duration", "Description"])
-		new_table.setColumnHidden(0, True)  # Hide ID column for internal use
-		new_table.setColumnWidth(1, 100)
-		new_table.setColumnWidth(2, 100)
-		new_table.setColumnWidth(3, 100)
-		new_table.setColumnWidth(4, 139)
-		new_table.setColumnWidth(5, 139)
-		new_table.setColumnWidth(6, 160)
-		new_table.setColumnWidth(7, 200)
-		
-		new_table.setWordWrap(True)
-		new_table.resizeRowsToContents()
-		new_table.setSortingEnabled(True)
-		new_table.cellDoubleClicked.connect(self.open_child_edit_log)
-		new_table.itemSelectionChanged.connect(self.activate_delete_log)
-		
-		self.tables.append(new_table)
-		self.table_selector.addItem("Travel Logs")
-		self.table_selector.setCurrentIndex(0)
-		self.update_table(new_table)
-		
-	def switch_table(self):
-		# Switch between different table views
-		if self.tables:
-			self.update_table(self.tables[self.table_selector.currentIndex()])
-
-	def open_child_create_table(self):
-		# Open dialog for creating new table
-		self.open_child_create_table = ChildCreateTable(self)
-		self.open_child_create_table.setModal(True)
-		self.open_child_create_table.show()
-
-	def open_child_rename_table(self):
-		# Open dialog for renaming current table
-		self.open_child_rename_table = ChildRenameTable(self)
-		self.open_child_rename_table.setModal(True)
-		self.open_child_rename_table.show()
-
-	def update_table(self, new_table):
-		# Update main display with new table widget
-		self.table.setParent(None)
-		self.table = new_table
-		self.centralWidget().layout().itemAt(2).layout().insertWidget(0, self.table, 5)
-
-		total_duration, average_duration = self.calculate_total_and_average_duration()
-		self.total_duration_display.setText(total_duration)
-		self.average_duration_display.setText(average_duration)
-	
-	def delete_table(self):
-		# Delete current table after confirmation
-		current_index = self.table_selector.currentIndex()
-
-		confirm = QMessageBox.question(self, "Delete Table", f"Do you really want to continue deleting '{self.table_selector.currentText()}' table?\nAll of its logs cannot be recovered once deleted.")
-
-		if confirm == QMessageBox.StandardButton.Yes:
-			self.table_layout.removeWidget(self.table)
-			self.tables.pop(current_index)
-			self.table_selector.removeItem(current_index)
-
-			if not self.tables:
-				self.empty_table = QTableWidget()
-				self.update_table(self.empty_table)
-
-				total_duration, average_duration = self.calculate_total_and_average_duration()
-				self.total_duration_display.setText(total_duration)
-				self.average_duration_display.setText(average_duration)
-
-				# Disable buttons when no tables exist
-				self.table_selector.setEnabled(False)
-				self.rename_table_btn.setEnabled(False)
-				self.delete_table_btn.setEnabled(False)
-				self.add_log_btn.setEnabled(False)
-	
-	def open_child_add_log(self):
-		# Open dialog for adding new travel log
-		self.open_child_add_log = ChildAddLog(self)
-		self.open_child_add_log.setModal(True)
-		self.open_child_add_log.show()
-
-	def get_sortable_datetime(self, datetime_text):
-		# Convert display datetime to sortable string format (yyyyMMddhhmm)
-		datetime_parts = datetime_text.split("[")
-		date_part = datetime_parts[0].strip()
-		time_part = datetime_parts[1].rstrip("]").strip()
-		
-		date_object = QDate.fromString(date_part, "yyyy, MMM d")
-		time_object = QTime.fromString(time_part, "h:mm AP")
-		datetime_object = QDateTime(date_object, time_object)
-		
-		return datetime_object.toString("yyyyMMddhhmm")
-
-	def get_sortable_duration(self, duration_text):
-		# Convert duration text to sortable seconds format
-		total_seconds = 0
-
-		# Parse days component
-		if 'day' in duration_text:
-			days_part = duration_text.split('day')[0].strip()
-
-			if '&' in days_part:
-				days_part = days_part.split('&')[0].strip()
-
-			if ',' in days_part:
-				days_part = days_part.split(',')[0].strip()
-
-			days = int(days_part)
-			total_seconds += days * 86400
-		
-		# Parse hours component
-		if 'hr' in duration_text:
-			hours_part = duration_text.split('hr')[0]
-
-			if '&' in hours_part:
-				hours_part = hours_part.split('&')[-1].strip()
-			elif ',' in hours_part:
-				hours_part = hours_part.split(',')[-1].strip()
-			else:
-				parts = hours_part.split()
-				hours = int(parts[-1]) if parts else 0
-				total_seconds += hours * 3600
-
-		# Parse minutes component
-		if 'min' in duration_text:
-			minutes_part = duration_text.split('min')[0]
-
-			if '&' in minutes_part:
-				minutes_part = minutes_part.split('&')[-1].strip()
-			else:
-				parts = minutes_part.split()
-				minutes = int(parts[-1]) if parts else 0
-				total_seconds += minutes * 60
-				
-		return str(total_seconds).zfill(10)  # Zero-pad for proper sorting
-
-	def parse_datetime(self, datetime_text):
-		# Parse display datetime text back to QDateTime object
-		datetime_parts = datetime_text.split("[")
-		date_part = datetime_parts[0].strip()
-		time_part = datetime_parts[1].rstrip("]").strip()
-		date_object = QDate.fromString(date_part, "yyyy, MMM d")
-		time_object = QTime.fromString(time_part, "h:mm AP")
-		return QDateTime(date_object, time_object)
-
-	def calculate_duration_per_log(self, start_dt, end_dt):
-		# Calculate duration between start and end datetime in human-readable format
-		duration_seconds = start_dt.secsTo(end_dt)
-
-		minutes = (duration_seconds // 60) % 60
-		hours = (duration_seconds // 3600) % 24
-		days = duration_seconds // 86400
-		
-		components = []
-		
-		if days > 0:
-			components.append(f"{days} {'day' if days == 1 else 'days'}")
-			
-		if hours > 0:
-			components.append(f"{hours} {'hr' if hours == 1 else 'hrs'}")
-			
-		if minutes > 0:
-			components.append(f"{minutes} {'min' if minutes == 1 else 'mins'}")
-		
-		duration = self.format_duration_components(components)
-		
-		return duration
-		
-	def calculate_total_and_average_duration(self):
-		# Calculate total and average duration across all logs in current table
-		current_table_index = self.table_selector.currentIndex()
-
-		if current_table_index < 0:
-			return "Total Duration Time:", "Average Duration Time:"
-			
-		current_table = self.tables[current_table_index]
-		log_count = current_table.rowCount()
-
-		if log_count == 0:
-			return "Total Duration Time:", "Average Duration Time:"
-		
-		total_seconds = 0
-		
-		# Sum durations from all logs
-		for row in range(log_count):
-			start_dt_text = current_table.item(row, 4).text()  # Start datetime column
-			end_dt_text = current_table.item(row, 5).text()    # End datetime column
-			
-			start_dt = self.parse_datetime(start_dt_text)
-			end_dt = self.parse_datetime(end_dt_text)
-			
-			total_seconds += start_dt.secsTo(end_dt)
-
-		# Calculate time components for total duration
-		total_minutes = (total_seconds // 60) % 60
-		total_hours = (total_seconds // 3600) % 24
-		total_days = total_seconds // 86400
-
-		# Calculate time components for average duration
-		average_seconds = total_seconds // log_count
-		average_minutes = (average_seconds // 60) % 60
-		average_hours = (average_seconds // 3600) % 24
-		average_days = average_seconds // 86400
-
-		total_components = []
-		average_components = []
-
-		# Build total duration components
-		if total_days > 0:
-			total_components.append(f"{total_days} {'day' if total_days == 1 else 'days'}")
-
-		if total_hours > 0:
-			total_components.append(f"{total_hours} {'hr' if total_hours == 1 else 'hrs'}")
-
-		if total_minutes > 0:
-			total_components.append(f"{total_minutes} {'min' if total_minutes == 1 else 'mins'}")
-
-		# Build average duration components
-		if average_days > 0:
-			average_components.append(f"{average_days} {'day' if average_days == 1 else 'days'}")
-
-		if average_hours > 0:
-			average_components.append(f"{average_hours} {'hr' if average_hours == 1 else 'hrs'}")
-
-		if average_minutes > 0:
-			average_components.append(f"{average_minutes} {'min' if average_minutes == 1 else 'mins'}")
-		
-		total_duration = self.format_duration_components(total_components)
-		average_duration = self.format_duration_components(average_components)
-
-		# Format output based on log count
-		if log_count == 1:
-			return f"Total Duration Time:\n  {total_duration}", "Average Duration Time:"
-		else:
-			return f"Total Duration Time:\n  {total_duration}", f"Average Duration Time:\n  {average_duration}"
-
-	def format_duration_components(self, components):
-		# Format duration components with proper conjunction
-		if len(components) == 1:
-			return components[0]
-		elif len(components) == 2:
-			return f"{components[0]} & {components[1]}"
-		else:
-			return f"{components[0]}, {components[1]}, & {components[2]}"
-	
-	def open_child_edit_log(self, row, column):
-		# Open dialog for editing existing log (double-click handler)
-		if QApplication.activeModalWidget() is not None:
-			return
-
-		self.open_child_edit_log = ChildEditLog(self, row)
-		self.open_child_edit_log.setModal(True)
-		self.open_child_edit_log.show()
-	
-	def activate_delete_log(self):
-		# Enable delete button when a log is selected
-		selected_log = self.table.currentRow()
-		self.delete_log_btn.setEnabled(selected_log >= 0)
-	
-	def delete_log(self):
-		# Delete selected log after confirmation
-		current_table = self.tables[self.table_selector.currentIndex()]
-		current_log = current_table.currentRow()
-
-		confirm = QMessageBox.question(self, "Delete Log", "Do you really want to delete this log?", QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
-
-		if confirm == QMessageBox.StandardButton.Yes:
-			# Get log ID from hidden column for database operation
-			log_id = int(current_table.item(current_log, 0).text())
-			
-			# Delete from database
-			db.delete_log(log_id)
-			
-			# Delete from UI
-			current_table.removeRow(current_log)
-
-			total_duration, average_duration = self.calculate_total_and_average_duration()
-			self.total_duration_display.setText(total_duration)
-			self.average_duration_display.setText(average_duration)
-
-			# Disable buttons if no logs remain
-			if current_table.rowCount() == 0:
-				self.delete_log_btn.setEnabled(False)
-				self.clear_all_logs_btn.setEnabled(False)
-
-	def clear_all_logs(self):
-		# Clear all logs in current table after confirmation
-		confirm = QMessageBox.question(self, "Clear All Logs", f"Do you really want to clear all logs in '{self.table_selector.currentText()}' table?\nThey cannot be recovered once deleted.", QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
-
-		if confirm == QMessageBox.StandardButton.Yes:
-			current_table = self.tables[self.table_selector.currentIndex()]
-
-			# Clear from database
-			db.clear_all_logs()
-			
-			# Clear from UI
-			current_table.setRowCount(0)
-
-			total_duration, average_duration = self.calculate_total_and_average_duration()
-			self.total_duration_display.setText(total_duration)
-			self.average_duration_display.setText(average_duration)
-
-			self.delete_log_btn.setEnabled(False)
-			self.clear_all_logs_btn.setEnabled(False)
-
-class ChildCreateTable(QDialog):
-	def __init__(self, main_window):
-		super().__init__(main_window)
-
-		self.setWindowTitle("Create New Table")
-		self.setFixedSize(200, 100)
-		screen = main_window.screen
-		self.move(int((screen.width() - self.width()) / 2), int((screen.height() - self.height()) / 2))
-
-		self.main_window = main_window
-
-		self.input = QLineEdit()
-		self.error_prompt = QLabel()
-		self.buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Cancel | QDialogButtonBox.StandardButton.Ok)
-		self.buttons.button(QDialogButtonBox.StandardButton.Ok).setText("Create")
-		self.buttons.setLayoutDirection(Qt.LayoutDirection.RightToLeft)
-
-		layout = QFormLayout()
-		layout.addRow("Table name:", self.input)
-		
-		main_layout = QVBoxLayout()
-		main_layout.addLayout(layout)
-		main_layout.addWidget(self.error_prompt, alignment=Qt.AlignmentFlag.AlignCenter)
-		main_layout.addWidget(self.buttons, alignment=Qt.AlignmentFlag.AlignCenter)
-		self.setLayout(main_layout)
-
-		self.buttons.rejected.connect(self.reject)
-		self.buttons.accepted.connect(self.create)
-
-	def create(self):
-		# Validate and create new table
-		if self.input.text():
-			table_names = [self.main_window.table_selector.itemText(i) for i in range(len(self.main_window.tables))]
-			
-			if self.input.text() not in table_names:
-				new_table = QTableWidget(0, 8)
-				new_table.setHorizontalHeaderLabels(["ID", "Origin", "Destination", "Mode", "Start Date/Time", "End Date/Time", "Duration", "Description"])
-				new_table.setColumnHidden(0, True)  # Hide ID column
-				new_table.setColumnWidth(1, 100)
-				new_table.setColumnWidth(2, 100)
-				new_table.setColumnWidth(3, 100)
-				new_table.setColumnWidth(4, 139)
-				new_table.setColumnWidth(5, 139)
-				new_table.setColumnWidth(6, 160)
-				new_table.setColumnWidth(7, 200)
-				
-				new_table.setWordWrap(True)
-				new_table.resizeRowsToContents()
-				new_table.setSortingEnabled(True)
-				new_table.cellDoubleClicked.connect(self.main_window.open_child_edit_log)
-				new_table.itemSelectionChanged.connect(self.main_window.activate_delete_log)
-				
-				self.main_window.tables.append(new_table)
-				self.main_window.table_selector.addItem(self.input.text())
-				self.main_window.table_selector.setCurrentIndex(self.main_window.table_selector.count() - 1)
-				self.main_window.update_table(new_table)
-				
-				# Enable table management buttons
-				self.main_window.table_selector.setEnabled(True)
-				self.main_window.rename_table_btn.setEnabled(True)
-				self.main_window.delete_table_btn.setEnabled(True)
-				self.main_window.add_log_btn.setEnabled(True)
-				
-				self.accept()
-			else:
-				self.error_prompt.setText(f"<font color='red'>* '{self.input.text()}' table already exists.</font>")
-		else:
-			self.error_prompt.setText("<font color='red'>* Table name is required.</font>")
-
-class ChildRenameTable(QDialog):
-	def __init__(self, main_window):
-		super().__init__(main_window)
-
-		self.setWindowTitle("Rename Table")
-		self.setFixedSize(200, 100)
-		screen = main_window.screen
-		self.move(int((screen.width() - self.width()) / 2), int((screen.height() - self.height()) / 2))
-
-		self.main_window = main_window
-
-		self.input = QLineEdit()
-		self.error_prompt = QLabel()
-		self.buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Cancel | QDialogButtonBox.StandardButton.Ok)
-		self.buttons.button(QDialogButtonBox.StandardButton.Ok).setText("Save")
-		self.buttons.setLayoutDirection(Qt.LayoutDirection.RightToLeft)
-
-		layout = QFormLayout()
-		layout.addRow("Table name:", self.input)
-
-		main_layout = QVBoxLayout()
-		main_layout.addLayout(layout)
-		main_layout.addWidget(self.error_prompt, alignment=Qt.AlignmentFlag.AlignCenter)
-		main_layout.addWidget(self.buttons, alignment=Qt.AlignmentFlag.AlignCenter)
-		self.setLayout(main_layout)
-
-		self.buttons.rejected.connect(self.reject)
-		self.buttons.accepted.connect(self.save)
-
-	def save(self):
-		# Validate and save table rename
-		if not self.input.text():
-			self.error_prompt.setText("<font color='red'>* Table name is required.</font>")
-			return
-
-		table_names = [self.main_window.table_selector.itemText(i) for i in range(len(self.main_window.tables))]
-		current_table_name = self.main_window.table_selector.currentText()
-
-		if self.input.text() in table_names and self.input.text() != current_table_name:
-			self.error_prompt.setText(f"<font color='red'>* '{self.input.text()}' table already exists.</font>")
-		else:
-			self.main_window.table_selector.setItemText(self.main_window.table_selector.currentIndex(), self.input.text())
-			self.accept()
-
-class ChildAddLog(QDialog):
-	def __init__(self, main_window):
-		super().__init__(main_window)
-
-		self.setWindowTitle("Add Log")
-		self.setFixedWidth(325)
-		self.setMinimumHeight(300)
-		screen = main_window.screen
-		self.move(int((screen.width() - self.width()) / 2), int((screen.height() - self.height()) / 2))
-
-		self.main_window = main_window
-
-		# Input fields with validation
-		self.origin_input = QLineEdit()
-		self.error_label1 = QLabel()
-		self.error_label1.setVisible(False)
-		self.destination_input = QLineEdit()
-		self.error_label2 = QLabel()
-		self.error_label2.setVisible(False)
-		self.mode_input_cb = QComboBox()
-		self.mode_input_cb.addItems(["Car", "Walk", "Bus", "Airplane", "Bicycle", "Other"])
-		self.mode_input_le = QLineEdit()
-		self.mode_input_le.setEnabled(False)
-		self.mode_input_le.setVisible(False)
-		self.error_label3 = QLabel()
-		self.error_label3.setVisible(False)
-		
-		# DateTime inputs with current time defaults
-		now = QDateTime.currentDateTime()
-		self.start_date_input = QDateEdit()
-		self.start_date_input.setDisplayFormat("yyyy/MM/d")
-		self.start_date_input.setCalendarPopup(True)
-		self.start_date_input.setDate(now.date())
-		self.start_time_input = QTimeEdit()
-		self.start_time_input.setTime(now.time())
-		self.end_date_input = QDateEdit()
-		self.end_date_input.setDisplayFormat("yyyy/MM/d")
-		self.end_date_input.setCalendarPopup(True)
-		self.end_date_input.setDate(now.addSecs(60).date())  # Default to 1 minute later
-		self.end_time_input = QTimeEdit()
-		self.end_time_input.setTime(now.addSecs(60).time())
-		self.error_label4 = QLabel()
-		self.error_label4.setVisible(False)
-		self.description_input = QTextEdit()
-		self.description_input.setFixedHeight(80)
-		self.buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Cancel | QDialogButtonBox.StandardButton.Ok)
-		self.buttons.button(QDialogButtonBox.StandardButton.Ok).setText("Add")
-		self.buttons.setLayoutDirection(Qt.LayoutDirection.RightToLeft)
-		
-		# Layout organization
-		start_input_layout = QHBoxLayout()
-		start_input_layout.addWidget(self.start_date_input)
-		start_input_layout.addWidget(self.start_time_input)
-		
-		end_input_layout = QHBoxLayout()
-		end_input_layout.addWidget(self.end_date_input)
-		end_input_layout.addWidget(self.end_time_input)
-
-		fill_up_layout = QFormLayout()
-		fill_up_layout.addRow("Origin:", self.origin_input)
-		fill_up_layout.addRow("", self.error_label1)
-		fill_up_layout.addRow("Destination:", self.destination_input)
-		fill_up_layout.addRow("", self.error_label2)
-		fill_up_layout.addRow("Mode:", self.mode_input_cb)
-		fill_up_layout.addRow("", self.mode_input_le)
-		fill_up_layout.addRow("", self.error_label3)
-		fill_up_layout.addRow("Start Date/Time:", start_input_layout)
-		fill_up_layout.addRow("End Date/Time:", end_input_layout)
-		fill_up_layout.addRow("", self.error_label4)
-		fill_up_layout.addRow("Description:\n(optional)", self.description_input)
-
-		main_layout = QVBoxLayout()
-		main_layout.addLayout(fill_up_layout)
-		main_layout.addWidget(self.buttons, alignment=Qt.AlignmentFlag.AlignLeft)
-		self.setLayout(main_layout)
-
-		# Signal connections
-		self.mode_input_cb.currentIndexChanged.connect(self.combobox_other)
-		self.start_time_input.timeChanged.connect(self.adjust_end_time)
-		self.end_time_input.timeChanged.connect(self.adjust_start_time)
-		self.buttons.rejected.connect(self.reject)
-		self.buttons.accepted.connect(self.add)
-
-	def combobox_other(self):
-		# Show/hide custom mode input when "Other" is selected
-		if self.mode_input_cb.currentIndex() != 5:
-			self.mode_input_le.clear()
-			self.mode_input_le.setEnabled(False)
-			self.mode_input_le.setVisible(False)
-		else:
-			self.mode_input_le.setEnabled(True)
-			self.mode_input_le.setVisible(True)
-		
-		self.update_dialog_height()
-
-	def update_dialog_height(self):
-		# Adjust dialog height based on content visibility
-		self.setMinimumHeight(0)
-		self.setMaximumHeight(450)
-		self.adjustSize()
-
-	def get_datetime_inputs(self):
-		# Get combined datetime objects from date and time inputs
-		start_dt = QDateTime(self.start_date_input.date(), self.start_time_input.time())
-		end_dt = QDateTime(self.end_date_input.date(), self.end_time_input.time())
-		return start_dt, end_dt
-
-	def adjust_end_time(self):
-		# Ensure end time is always after start time
-		start_dt, end_dt = self.get_datetime_inputs()
-
-		if start_dt >= end_dt:
-			increment = start_dt.addSecs(60)
-			self.end_date_input.setDate(increment.date())
-			self.end_time_input.setTime(increment.time())
-		
-	def adjust_start_time(self):
-		# Ensure start time is always before end time
-		start_dt, end_dt = self.get_datetime_inputs()
-
-		if end_dt <= start_dt:
-			increment = end_dt.addSecs(-60)
-			self.start_date_input.setDate(increment.date())
-			self.start_time_input.setTime(increment.time())
-
-	def add(self):
-		# Validate inputs and add new log to database and UI
-
-		# Origin validation
-		if not self.origin_input.text():
-			self.error_label1.setVisible(True)
-			self.error_label1.setText("<font color='red'> * Origin is required.</font>")
-		else:
-			self.error_label1.setVisible(False)
-
-		# Destination validation
-		if not self.destination_input.text():
-			self.error_label2.setVisible(True)
-			self.error_label2.setText("<font color='red'> * Destination is required.</font>")
-		else:
-			self.error_label2.setVisible(False)
-
-		# Mode validation for "Other" selection
-		if self.mode_input_cb.currentText() == "Other" and not self.mode_input_le.text():
-			self.error_label3.setVisible(True)
-			self.error_label3.setText("<font color='red'> * Mode is required.</font>")
-		else:
-			self.error_label3.setVisible(False)
-
-		# DateTime validation
-		start_dt, end_dt = self.get_datetime_inputs()
-
-		if start_dt >= end_dt:
-			self.error_label4.setVisible(True)
-			self.error_label4.setText("<font color='red'> * End date & time must be after start date & time.</font>")
-			self.error_label4.setWordWrap(True)
-		else:
-			self.error_label4.setVisible(False)
-
-		self.update_dialog_height()
-
-		# Check if any validation errors exist
-		errors = [self.error_label1.isVisible(), self.error_label2.isVisible(), 
-				self.error_label3.isVisible(), self.error_label4.isVisible()]
-
-		if any(errors):
-			return
-
-		# Prepare data for database insertion
-		origin = self.origin_input.text()
-		destination = self.destination_input.text()
-		mode = self.mode_input_cb.currentText() if self.mode_input_cb.currentIndex() != 5 else self.mode_input_le.text()
-		start = start_dt.toString("yyyy-MM-dd hh:mm:ss")
-		end = end_dt.toString("yyyy-MM-dd hh:mm:ss")
-		description = self.description_input.toPlainText()
-
-		try:
-			# Save to database and get generated log ID
-			log_id = db.create_log(origin, destination, mode, start, end, description)
-			
-			# Update UI with new log
-			current_table = self.main_window.tables[self.main_window.table_selector.currentIndex()]
-			new_log = current_table.rowCount()
-			current_table.setSortingEnabled(False)
-			current_table.insertRow(new_log)
-
-			current_table.blockSignals(True)
-
-			# Store log data in table cells
-			id_item = QTableWidgetItem(str(log_id))
-			current_table.setItem(new_log, 0, id_item)
-			current_table.setItem(new_log, 1, QTableWidgetItem(origin))
-			current_table.setItem(new_log, 2, QTableWidgetItem(destination))
-			current_table.setItem(new_log, 3, QTableWidgetItem(mode))
-	
-			# Format datetime for display
-			start_dt_text = f"{self.start_date_input.date().toString('yyyy, MMM d')} [{self.start_time_input.time().toString('h:mm AP')}]"
-			end_dt_text = f"{self.end_date_input.date().toString('yyyy, MMM d')} [{self.end_time_input.time().toString('h:mm AP')}]"
-			duration_text = self.main_window.calculate_duration_per_log(start_dt, end_dt)
-
-			# Create sortable table items
-			start_item = QTableWidgetItem(start_dt_text)
-			start_item.setData(Qt.ItemDataRole.UserRole, self.main_window.get_sortable_datetime(start_dt_text))
-			end_item = QTableWidgetItem(end_dt_text)
-			end_item.setData(Qt.ItemDataRole.UserRole, self.main_window.get_sortable_datetime(end_dt_text))
-			duration_item = QTableWidgetItem(duration_text)
-			duration_item.setData(Qt.ItemDataRole.UserRole, self.main_window.get_sortable_duration(duration_text))
-			
-			current_table.setItem(new_log, 4, start_item)
-			current_table.setItem(new_log, 5, end_item)
-			current_table.setItem(new_log, 6, duration_item)
-			current_table.setItem(new_log, 7, QTableWidgetItem(description))
-
-			current_table.setSortingEnabled(True)
-			current_table.blockSignals(False)
-
-			# Make all cells non-editable
-			for col in range(current_table.columnCount()):
-				item = current_table.item(new_log, col)
-
-				if item:
-					item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-			
-			# Update duration statistics
-			total_duration, average_duration = self.main_window.calculate_total_and_average_duration()
-			self.main_window.total_duration_display.setText(total_duration)
-			self.main_window.average_duration_display.setText(average_duration)
-
-			self.main_window.delete_log_btn.setEnabled(False)
-			self.main_window.clear_all_logs_btn.setEnabled(True)
-
-			current_table.selectRow(new_log)
-	
-			self.accept()
-			
-		except ValueError as e:
-			QMessageBox.warning(self, "Error", str(e))
-
-class ChildEditLog(QDialog):
-	def __init__(self, main_window, row):
-		super().__init__(main_window)
-
-		self.setWindowTitle("Edit Log")
-		self.setFixedWidth(325)
-		self.setMinimumHeight(300)
-		screen = main_window.screen
-		self.move(int((screen.width() - self.width()) / 2), int((screen.height() - self.height()) / 2))
-
-		self.main_window = main_window
-		self.current_log = row
-
-		# Load existing log data for editing
-		current_table = self.main_window.tables[self.main_window.table_selector.currentIndex()]
-		log_id = int(current_table.item(self.current_log, 0).text())
-		origin = current_table.item(self.current_log, 1).text()
-		destination = current_table.item(self.current_log, 2).text()
-		mode = current_table.item(self.current_log, 3).text()
-		start_dt_text = current_table.item(self.current_log, 4).text()
-		end_dt_text = current_table.item(self.current_log, 5).text()
-		description = current_table.item(self.current_log, 7).text()
-
-		start_dt = self.main_window.parse_datetime(start_dt_text)
-		end_dt = self.main_window.parse_datetime(end_dt_text)
-
-		self.log_id = log_id
-		self.origin_input = QLineEdit(origin)
-		self.error_label1 = QLabel()
-		self.error_label1.setVisible(False)
-		self.destination_input = QLineEdit(destination)
-		self.error_label2 = QLabel()
-		self.error_label2.setVisible(False)
-		self.mode_input_cb = QComboBox()
-		self.mode_input_cb.addItems(["Car", "Walk", "Bus", "Airplane", "Bicycle", "Other"])
-		self.mode_input_le = QLineEdit()
-		self.mode_input_le.setEnabled(False)
-		self.mode_input_le.setVisible(False)
-		self.error_label3 = QLabel()
-		self.error_label3.setVisible(False)
-		self.start_date_input = QDateEdit(start_dt.date())
-		self.start_date_input.setDisplayFormat("yyyy/MM/d")
-		self.start_date_input.setCalendarPopup(True)
-		self.start_time_input = QTimeEdit(start_dt.time())
-		self.start_time_input.setDisplayFormat("h:mm AP")
-		self.end_date_input = QDateEdit(end_dt.date())
-		self.end_date_input.setDisplayFormat("yyyy/MM/d")
-		self.end_date_input.setCalendarPopup(True)
-		self.end_time_input = QTimeEdit(end_dt.time())
-		self.end_time_input.setDisplayFormat("h:mm AP")
-		self.error_label4 = QLabel()
-		self.error_label4.setVisible(False)
-		self.description_input = QTextEdit(description)
-		self.description_input.setFixedHeight(80)
-		self.buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Cancel | QDialogButtonBox.StandardButton.Ok)
-		self.buttons.button(QDialogButtonBox.StandardButton.Ok).setText("Save")
-		self.buttons.setLayoutDirection(Qt.LayoutDirection.RightToLeft)
-		
-		# Set current mode in combobox
-		current_mode = self.mode_input_cb.findText(mode)
-
-		if current_mode != -1:
-			self.mode_input_cb.setCurrentIndex(current_mode)
-		else:
-			self.mode_input_cb.setCurrentIndex(5)
-			self.mode_input_le.setEnabled(True)
-			self.mode_input_le.setVisible(True)
-			self.mode_input_le.setText(mode)
-		
-		# Layout organization
-		start_input_layout = QHBoxLayout()
-		start_input_layout.addWidget(self.start_date_input)
-		start_input_layout.addWidget(self.start_time_input)
-		
-		end_input_layout = QHBoxLayout()
-		end_input_layout.addWidget(self.end_date_input)
-		end_input_layout.addWidget(self.end_time_input)
-
-		fill_up_layout = QFormLayout()
-		fill_up_layout.addRow("Origin:", self.origin_input)
-		fill_up_layout.addRow("", self.error_label1)
-		fill_up_layout.addRow("Destination:", self.destination_input)
-		fill_up_layout.addRow("", self.error_label2)
-		fill_up_layout.addRow("Mode:", self.mode_input_cb)
-		fill_up_layout.addRow("", self.mode_input_le)
-		fill_up_layout.addRow("", self.error_label3)
-		fill_up_layout.addRow("Start Date/Time:", start_input_layout)
-		fill_up_layout.addRow("End Date/Time:", end_input_layout)
-		fill_up_layout.addRow("", self.error_label4)
-		fill_up_layout.addRow("Description:\n(optional)", self.description_input)
-
-		main_layout = QVBoxLayout()
-		main_layout.addLayout(fill_up_layout)
-		main_layout.addWidget(self.buttons, alignment=Qt.AlignmentFlag.AlignLeft)
-		self.setLayout(main_layout)
-
-		# Signal connections
-		self.mode_input_cb.currentIndexChanged.connect(self.combobox_other)
-		self.start_time_input.timeChanged.connect(self.adjust_end_time)
-		self.end_time_input.timeChanged.connect(self.adjust_start_time)
-		self.buttons.rejected.connect(self.reject)
-		self.buttons.accepted.connect(self.save)
-
-	def combobox_other(self):
-		# Show/hide custom mode input when "Other" is selected
-		if self.mode_input_cb.currentIndex() != 5:
-			self.mode_input_le.clear()
-			self.mode_input_le.setEnabled(False)
-			self.mode_input_le.setVisible(False)
-		else:
-			self.mode_input_le.setEnabled(True)
-			self.mode_input_le.setVisible(True)
-		
-		self.update_dialog_height()
-
-	def update_dialog_height(self):
-		# Adjust dialog height based on content visibility
-		self.setMinimumHeight(0)
-		self.setMaximumHeight(450)
-		self.adjustSize()
-
-	def get_datetime_inputs(self):
-		# Get combined datetime objects from date and time inputs
-		start_dt = QDateTime(self.start_date_input.date(), self.start_time_input.time())
-		end_dt = QDateTime(self.end_date_input.date(), self.end_time_input.time())
-		return start_dt, end_dt
-
-	def adjust_end_time(self):
-		# Ensure end time is always after start time
-		start_dt, end_dt = self.get_datetime_inputs()
-
-		if start_dt >= end_dt:
-			increment = start_dt.addSecs(60)
-			self.end_date_input.setDate(increment.date())
-			self.end_time_input.setTime(increment.time())
-		
-	def adjust_start_time(self):
-		# Ensure start time is always before end time
-		start_dt, end_dt = self.get_datetime_inputs()
-
-		if end_dt <= start_dt:
-			increment = end_dt.addSecs(-60)
-			self.start_date_input.setDate(increment.date())
-			self.start_time_input.setTime(increment.time())
-
-	def save(self):
-		# Validate inputs and save edited log to database and UI
-
-		# Origin validation
-		if not self.origin_input.text():
-			self.error_label1.setVisible(True)
-			self.error_label1.setText("<font color='red'> * Origin is required.</font>")
-		else:
-			self.error_label1.setVisible(False)
-
-		# Destination validation
-		if not self.destination_input.text():
-			self.error_label2.setVisible(True)
-			self.error_label2.setText("<font color='red'> * Destination is required.</font>")
-		else:
-			self.error_label2.setVisible(False)
-
-		# Mode validation for "Other" selection
-		if self.mode_input_cb.currentIndex() == 5 and not self.mode_input_le.text():
-			self.error_label3.setVisible(True)
-			self.error_label3.setText("<font color='red'> * Mode is required.</font>")
-		else:
-			self.error_label3.setVisible(False)
-
-		# DateTime validation
-		start_dt, end_dt = self.get_datetime_inputs()
-
-		if start_dt >= end_dt:
-			self.error_label4.setVisible(True)
-			self.error_label4.setText("<font color='red'> * End date & time must be after start date & time.</font>")
-			self.error_label4.setWordWrap(True)
-		else:
-			self.error_label4.setVisible(False)
-
-		self.update_dialog_height()
-
-		# Check if any validation errors exist
-		errors = [self.error_label1.isVisible(), self.error_label2.isVisible(), 
-				self.error_label3.isVisible(), self.error_label4.isVisible()]
-
-		if any(errors):
-			return
-
-		# Prepare data for database update
-		origin = self.origin_input.text()
-		destination = self.destination_input.text()
-		mode = self.mode_input_cb.currentText() if self.mode_input_cb.currentIndex() != 5 else self.mode_input_le.text()
-		start = start_dt.toString("yyyy-MM-dd hh:mm:ss")
-		end = end_dt.toString("yyyy-MM-dd hh:mm:ss")
-		description = self.description_input.toPlainText()
-
-		try:
-			# Update database
-			db.update_log(self.log_id, origin, destination, mode, start, end, description)
-			
-			# Update UI with edited log data
-			current_table = self.main_window.tables[self.main_window.table_selector.currentIndex()]
-			current_table.setSortingEnabled(False)
-			current_table.blockSignals(True)
-
-			current_table.setItem(self.current_log, 1, QTableWidgetItem(origin))
-			current_table.setItem(self.current_log, 2, QTableWidgetItem(destination))
-			current_table.setItem(self.current_log, 3, QTableWidgetItem(mode))
-	
-			# Format datetime for display
-			start_dt_text = f"{self.start_date_input.date().toString('yyyy, MMM d')} [{self.start_time_input.time().toString('h:mm AP')}]"
-			end_dt_text = f"{self.end_date_input.date().toString('yyyy, MMM d')} [{self.end_time_input.time().toString('h:mm AP')}]"
-			duration_text = self.main_window.calculate_duration_per_log(start_dt, end_dt)
-
-			# Create sortable table items
-			start_item = QTableWidgetItem(start_dt_text)
-			start_item.setData(Qt.ItemDataRole.UserRole, self.main_window.get_sortable_datetime(start_dt_text))
-			end_item = QTableWidgetItem(end_dt_text)
-			end_item.setData(Qt.ItemDataRole.UserRole, self.main_window.get_sortable_datetime(end_dt_text))
-			duration_item = QTableWidgetItem(duration_text)
-			duration_item.setData(Qt.ItemDataRole.UserRole, self.main_window.get_sortable_duration(duration_text))
-			
-			current_table.setItem(self.current_log, 4, start_item)
-			current_table.setItem(self.current_log, 5, end_item)
-			current_table.setItem(self.current_log, 6, duration_item)
-			current_table.setItem(self.current_log, 7, QTableWidgetItem(description))
-
-			current_table.setSortingEnabled(True)
-			current_table.blockSignals(False)
-			
-			# Make all cells non-editable
-			for col in range(current_table.columnCount()):
-				item = current_table.item(self.current_log, col)
-
-				if item:
-					item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-
-			# Update duration statistics
-			total_duration, average_duration = self.main_window.calculate_total_and_average_duration()
-			self.main_window.total_duration_display.setText(total_duration)
-			self.main_window.average_duration_display.setText(average_duration)
-
-			current_table.selectRow(self.current_log)
-	
-			self.accept()
-			
-		except ValueError as e:
-			QMessageBox.warning(self, "Error", str(e))
+from PyQt6.QtWidgets import QApplication, QMainWindow, QWidget, QDialog, QLabel, QPushButton, QComboBox, QTableView, QLineEdit, QTextEdit, QDateEdit, QTimeEdit, QDialogButtonBox, QMessageBox, QInputDialog, QAbstractItemView, QSpinBox, QListWidget, QHBoxLayout, QVBoxLayout, QFormLayout
+from PyQt6.QtCore import Qt, QDate, QDateTime, QTimeZone, QTimer, QAbstractTableModel, QModelIndex
+from PyQt6.QtGui import QColor, QFont, QKeySequence, QShortcut
+from pathlib import Path
+import sqlite3
+import time
+from itertools import chain
+from core import db, filters, report
+from core.store import LogStore
+from shell.duration_chart import DurationChartPanel
+from shell.calendar_heatmap import CalendarHeatmapPanel
+
+# Frequent routes offered as templates when adding a log, logged straight away with Ctrl+1 to Ctrl+9
+ROUTE_TEMPLATES = 9
+
+# Repeat choices when adding a log, as weekday bits with Monday = bit 0; None repeats on the start's weekday
+REPEAT_CHOICES = [("Does not repeat", 0), ("Every weekday", 0b0011111), ("Every day", 0b1111111), ("Weekly on this day", None), ("Weekends", 0b1100000)]
+WEEKDAY_NAMES = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+# Seconds between expansions of recurring trips into logs
+SCHEDULE_INTERVAL = 60
+
+# Seconds a quick entry's notice stays in the status bar before maintenance may replace it
+NOTICE_SECONDS = 10
+
+class MainWindow(QMainWindow):
+	def __init__(self):
+		super().__init__()
+
+		# Window setup
+		self.setWindowTitle("Travel & Commute Time Logger")
+		self.setFixedSize(1000, 500)
+		self.screen = QApplication.primaryScreen().availableGeometry()
+		self.move(int((self.screen.width() - self.width()) / 2), int((self.screen.height() - self.height()) / 2))
+		self.showNormal()
+		
+		# Data storage
+		self.tables = []
+		self.route_thresholds = {}
+		self.undo_stack = []
+		self.views = {}
+		self.route_templates = []
+		self.maintenance = db.Maintenance()
+		self.maintenance_slice = None
+		self.notice_until = 0
+		
+		# UI components initialization
+		self.title = QLabel("TRAVEL & COMMUTE TIME LOGGER")
+		self.title.setObjectName("title")
+		self.table_selector = QComboBox()
+		self.table_selector.setEnabled(False)
+		self.create_table_btn = QPushButton("Create Table")
+		self.rename_table_btn = QPushButton("Rename Table")
+		self.rename_table_btn.setEnabled(False)
+		self.delete_table_btn = QPushButton("Delete Table")
+		self.delete_table_btn.setEnabled(False)
+		self.chart_btn = QPushButton("Show Chart")
+		self.calendar_btn = QPushButton("Show Calendar")
+		self.schedules_btn = QPushButton("Schedules")
+		self.view_selector = QComboBox()
+		self.view_selector.setMinimumWidth(140)
+		self.where_input = QLineEdit()
+		self.where_input.setPlaceholderText('e.g. mode in (Bus, Walk) and start >= 2026-01-01 and duration > 45m and origin ~ "Station"')
+		self.where_input.setToolTip(filters.describe_fields())
+		self.where_btn = QPushButton("Apply")
+		self.save_view_btn = QPushButton("Save View")
+		self.delete_view_btn = QPushButton("Delete View")
+		self.delete_view_btn.setEnabled(False)
+		self.near_input = QLineEdit()
+		self.near_input.setPlaceholderText("Place name or latitude, longitude")
+		self.radius_input = QSpinBox()
+		self.radius_input.setRange(10, 100000)
+		self.radius_input.setSingleStep(100)
+		self.radius_input.setValue(500)
+		self.radius_input.setSuffix(" m")
+		self.endpoint_selector = QComboBox()
+		self.endpoint_selector.addItems(["Origin", "Destination", "Either"])
+		self.filter_btn = QPushButton("Filter")
+		self.clear_filter_btn = QPushButton("Clear Filter")
+		self.clear_filter_btn.setEnabled(False)
+		self.table = QTableView()
+		self.total_duration_display = QLabel("Total Duration Time:")
+		self.average_duration_display = QLabel("Average Duration Time:")
+		self.add_log_btn = QPushButton("Add Log")
+		self.add_log_btn.setEnabled(False)
+		self.add_log_btn.setToolTip("Ctrl+N, or Ctrl+1 to Ctrl+9 for a frequent route")
+		self.delete_log_btn = QPushButton("Delete Log")
+		self.delete_log_btn.setEnabled(False)
+		self.change_mode_btn = QPushButton("Change Mode")
+		self.change_mode_btn.setEnabled(False)
+		self.shift_time_btn = QPushButton("Shift Time")
+		self.shift_time_btn.setEnabled(False)
+		self.clear_all_logs_btn = QPushButton("Clear All Logs")
+		self.clear_all_logs_btn.setEnabled(False)
+		self.undo_btn = QPushButton("Undo")
+		self.undo_btn.setEnabled(False)
+		self.chart_panel = DurationChartPanel()
+		self.chart_panel.setVisible(False)
+		self.calendar_panel = CalendarHeatmapPanel()
+		self.calendar_panel.setVisible(False)
+		
+		# Layout setup
+		table_selector_layout = QFormLayout()
+		table_selector_layout.addRow("Table:", self.table_selector)
+
+		view_selector_layout = QFormLayout()
+		view_selector_layout.addRow("View:", self.view_selector)
+
+		table_manager_layout = QHBoxLayout()
+		table_manager_layout.addLayout(table_selector_layout)
+		table_manager_layout.addLayout(view_selector_layout)
+		table_manager_layout.addWidget(self.create_table_btn)
+		table_manager_layout.addWidget(self.rename_table_btn)
+		table_manager_layout.addWidget(self.delete_table_btn)
+		table_manager_layout.addWidget(self.chart_btn)
+		table_manager_layout.addWidget(self.calendar_btn)
+		table_manager_layout.addWidget(self.schedules_btn)
+
+		near_layout = QFormLayout()
+		near_layout.addRow("Near:", self.near_input)
+
+		filter_layout = QHBoxLayout()
+		filter_layout.addLayout(near_layout, 3)
+		filter_layout.addWidget(self.radius_input, 1)
+		filter_layout.addWidget(self.endpoint_selector, 1)
+		filter_layout.addWidget(self.filter_btn)
+		filter_layout.addWidget(self.clear_filter_btn)
+
+		where_layout = QFormLayout()
+		where_layout.addRow("Where:", self.where_input)
+
+		view_layout = QHBoxLayout()
+		view_layout.addLayout(where_layout, 5)
+		view_layout.addWidget(self.where_btn)
+		view_layout.addWidget(self.save_view_btn)
+		view_layout.addWidget(self.delete_view_btn)
+
+		duration_display_layout = QVBoxLayout()
+		duration_display_layout.addWidget(self.total_duration_display)
+		duration_display_layout.addWidget(self.average_duration_display)
+		
+		table_btn_layout = QVBoxLayout()
+		table_btn_layout.addWidget(self.add_log_btn)
+		table_btn_layout.addWidget(self.delete_log_btn)
+		table_btn_layout.addWidget(self.change_mode_btn)
+		table_btn_layout.addWidget(self.shift_time_btn)
+		table_btn_layout.addWidget(self.clear_all_logs_btn)
+		table_btn_layout.addWidget(self.undo_btn)
+		table_btn_layout.setAlignment(Qt.AlignmentFlag.AlignBottom)
+
+		left_layout = QVBoxLayout()
+		left_layout.addLayout(duration_display_layout)
+		left_layout.addLayout(table_btn_layout)
+		
+		self.table_layout = QHBoxLayout()
+		self.table_layout.addWidget(self.table, 5)
+		self.table_layout.addLayout(left_layout, 1)
+		
+		general_layout = QVBoxLayout()
+		general_layout.addWidget(self.title, 1, alignment=Qt.AlignmentFlag.AlignCenter)
+		general_layout.addLayout(table_manager_layout, 2)
+		general_layout.addLayout(filter_layout, 1)
+		general_layout.addLayout(view_layout, 1)
+		general_layout.addLayout(self.table_layout, 5)
+		general_layout.addWidget(self.chart_panel, 5)
+		general_layout.addWidget(self.calendar_panel, 3)
+		
+		main_layout = QWidget()
+		main_layout.setLayout(general_layout)
+		self.setCentralWidget(main_layout)
+		
+		# Signal connections
+		self.table_selector.currentIndexChanged.connect(self.switch_table)
+		self.create_table_btn.clicked.connect(self.open_child_create_table)
+		self.rename_table_btn.clicked.connect(self.open_child_rename_table)
+		self.delete_table_btn.clicked.connect(self.delete_table)
+		self.chart_btn.clicked.connect(self.toggle_chart)
+		self.calendar_btn.clicked.connect(self.toggle_calendar)
+		self.schedules_btn.clicked.connect(self.open_child_schedules)
+		self.calendar_panel.day_clicked.connect(self.show_day)
+		self.near_input.returnPressed.connect(self.apply_location_filter)
+		self.filter_btn.clicked.connect(self.apply_location_filter)
+		self.clear_filter_btn.clicked.connect(self.clear_location_filter)
+		self.view_selector.activated.connect(self.select_view)
+		self.where_input.returnPressed.connect(self.apply_expression_filter)
+		self.where_btn.clicked.connect(self.apply_expression_filter)
+		self.save_view_btn.clicked.connect(self.save_view)
+		self.delete_view_btn.clicked.connect(self.delete_view)
+		self.add_log_btn.clicked.connect(self.open_child_add_log)
+		self.delete_log_btn.clicked.connect(self.delete_log)
+		self.change_mode_btn.clicked.connect(self.change_mode_of_logs)
+		self.shift_time_btn.clicked.connect(self.shift_time_of_logs)
+		self.clear_all_logs_btn.clicked.connect(self.clear_all_logs)
+		self.undo_btn.clicked.connect(self.undo_delete)
+		QShortcut(QKeySequence.StandardKey.Undo, self, self.undo_delete)
+		QShortcut(QKeySequence("Ctrl+N"), self, self.open_child_add_log)
+
+		for i in range(ROUTE_TEMPLATES):
+			QShortcut(QKeySequence(f"Ctrl+{i + 1}"), self, lambda i=i: self.log_route_template(i))
+
+		# Dialogs are built once and reset on every open, so they show without delay
+		self.create_table_dialog = ChildCreateTable(self)
+		self.rename_table_dialog = ChildRenameTable(self)
+		self.add_log_dialog = ChildAddLog(self)
+		self.edit_log_dialog = ChildEditLog(self)
+		self.schedules_dialog = ChildSchedules(self)
+
+		self.load_stylesheet()
+		self.expand_schedules()
+		self.load_from_database()
+		self.load_views()
+
+		# Poll the change log so writes from other processes show up as deltas
+		self.change_timer = QTimer(self)
+		self.change_timer.timeout.connect(self.apply_database_changes)
+		self.change_timer.start(1000)
+
+		# Database upkeep (purging tombstones, vacuum, statistics, integrity checks) in small idle-time slices
+		self.maintenance_timer = QTimer(self)
+		self.maintenance_timer.timeout.connect(self.run_maintenance)
+		self.maintenance_timer.start(500)
+
+		# Recurring trips are logged once they start; new rows reach the tables through the change poll
+		self.schedule_timer = QTimer(self)
+		self.schedule_timer.timeout.connect(self.expand_schedules)
+		self.schedule_timer.start(SCHEDULE_INTERVAL * 1000)
+
+	def load_stylesheet(self):
+		# Load and apply QSS stylesheet for UI styling
+		qss_file_path = Path(__file__).resolve().parent.parent / "core" / "styles.qss"
+
+		if qss_file_path.exists():
+			with qss_file_path.open("r", encoding="utf-8") as f:
+				file = f.read()
+				app = QApplication.instance()
+				app.setStyleSheet(file)
+		
+	def load_from_database(self):
+		# Load logs from database and populate table with travel data
+		# Remember the change position first so writes made during the load are replayed later
+		db.prune_changes()
+		self.change_seq = db.last_change_seq()
+		self.data_version = db.data_version()
+		logs = db.iter_log_columns()
+		first_log = next(logs, None)
+
+		if first_log is not None:
+			# Create default table if none exists
+			if not self.tables:
+				self.create_default_table()
+			
+			# Stream database records straight into the columnar store
+			self.tables[0].model().load(chain([first_log], logs))
+			
+			# Update UI state based on data availability
+			self.table_selector.setEnabled(True)
+			self.rename_table_btn.setEnabled(True)
+			self.delete_table_btn.setEnabled(True)
+			self.add_log_btn.setEnabled(True)
+			self.clear_all_logs_btn.setEnabled(True)
+			
+			# Calculate and display duration statistics
+			self.update_statistics()
+
+	def format_datetime(self, epoch):
+		# Format a stored epoch (local time kept as UTC) for display
+		dt = QDateTime.fromSecsSinceEpoch(epoch, QTimeZone.utc())
+		return f"{dt.date().toString('yyyy, MMM d')} [{dt.time().toString('h:mm AP')}]"
+
+	def apply_database_changes(self):
+		# Apply only the logs changed since the last poll instead of reloading everything
+		version = db.data_version()
+
+		if version == self.data_version:
+			return
+
+		self.data_version = version
+		changes = db.changes_since(self.change_seq)
+
+		if changes is None:
+			# Our position was pruned from the change log, fall back to a full reload
+			for current_table in self.tables:
+				current_table.model().clear()
+
+			self.load_from_database()
+			return
+
+		if not changes:
+			return
+
+		self.change_seq = changes[-1][0]
+
+		if any(op in ("clear", "restore") for _, _, op in changes):
+			# A clear or its undo touches every log at once, so match the tables to the database
+			self.resync_tables()
+			return
+
+		deleted_ids = [log_id for _, log_id, op in changes if op == "delete"]
+		changed_logs = db.get_log_columns([log_id for _, log_id, op in changes if op != "delete"])
+
+		if changed_logs and not self.tables:
+			self.create_default_table()
+			self.table_selector.setEnabled(True)
+			self.rename_table_btn.setEnabled(True)
+			self.delete_table_btn.setEnabled(True)
+			self.add_log_btn.setEnabled(True)
+
+		# Update logs in the table that shows them, new logs go to the first table like on startup
+		pending = {log[0]: log for log in changed_logs}
+
+		for current_table in self.tables:
+			model = current_table.model()
+			model.remove_logs(deleted_ids)
+			shown = model.owned_ids(pending)
+			model.upsert_logs([pending.pop(log_id) for log_id in shown])
+
+		if pending:
+			self.tables[0].model().upsert_logs(list(pending.values()))
+
+		self.update_statistics()
+
+		self.clear_all_logs_btn.setEnabled(self.table.model() is not None and self.table.model().rowCount() > 0)
+		self.activate_delete_log()
+
+	def resync_tables(self):
+		# Drop logs that are gone and refresh the rest in the table that owns them, new ones go to the first table
+		pending = {log[0]: log for log in db.iter_log_columns()}
+
+		if pending and not self.tables:
+			self.create_default_table()
+			self.table_selector.setEnabled(True)
+			self.rename_table_btn.setEnabled(True)
+			self.delete_table_btn.setEnabled(True)
+			self.add_log_btn.setEnabled(True)
+
+		for current_table in self.tables:
+			model = current_table.model()
+			model.remove_logs([log_id for log_id in chain(model.store.ids, model.filtered_out.ids) if log_id not in pending])
+			shown = model.owned_ids(pending)
+			model.upsert_logs([pending.pop(log_id) for log_id in shown])
+
+		if pending:
+			self.tables[0].model().upsert_logs(list(pending.values()))
+
+		self.update_statistics()
+
+		self.clear_all_logs_btn.setEnabled(self.table.model() is not None and self.table.model().rowCount() > 0)
+		self.activate_delete_log()
+
+	def run_maintenance(self):
+		# Report the finished maintenance slice, then start the next one if nothing else is going on
+		if self.maintenance_slice is not None:
+			if not self.maintenance_slice.done():
+				return
+
+			self.report_maintenance(self.maintenance_slice)
+			self.maintenance_slice = None
+
+		if QApplication.activeModalWidget() is not None or db.pending_writes():
+			return
+
+		self.maintenance_slice = self.maintenance.step()
+
+	def report_maintenance(self, finished):
+		# Show what a maintenance slice did in the status bar; integrity problems get a warning
+		try:
+			result = finished.result()
+		except sqlite3.Error as e:
+			self.statusBar().showMessage(f"Database maintenance failed: {e}", 10000)
+			return
+
+		if result.problems:
+			QMessageBox.warning(self, "Database Check", "The database integrity check found problems:\n" + "\n".join(result.problems[:10]))
+
+		if result.detail and time.monotonic() >= self.notice_until:
+			self.statusBar().showMessage(f"{result.detail} in {result.seconds * 1000:.0f} ms  |  Database {self.format_size(result.size)}, {self.format_size(result.free)} free", 5000)
+
+		# Recent results and query cache metrics stay available on hover
+		cache = db.cache_stats()
+		lookups = cache.hits + cache.misses
+		lines = [f"{r.detail} ({r.seconds * 1000:.0f} ms)" for r in list(self.maintenance.history)[-10:] if r.detail]
+		lines.append(f"Query cache: {cache.hits}/{lookups} hits ({cache.hits * 100 // max(lookups, 1)}%), {cache.entries} results, {self.format_size(cache.size)}, "
+			f"{cache.invalidations} invalidated, {cache.evictions} evicted")
+		self.statusBar().setToolTip("\n".join(lines))
+
+	def format_size(self, size):
+		# Byte count as a short human-readable size
+		for unit in ("B", "KB", "MB"):
+			if size < 1024:
+				return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+
+			size /= 1024
+
+		return f"{size:.1f} GB"
+
+	def create_log_table(self):
+		# Create a table view over a columnar log model with predefined columns and settings
+		new_table = QTableView()
+		new_table.setModel(LogTableModel(self))
+		new_table.setColumnHidden(0, True)  # Hide ID column for internal use
+		new_table.setColumnWidth(1, 100)
+		new_table.setColumnWidth(2, 100)
+		new_table.setColumnWidth(3, 100)
+		new_table.setColumnWidth(4, 139)
+		new_table.setColumnWidth(5, 139)
+		new_table.setColumnWidth(6, 160)
+		new_table.setColumnWidth(7, 200)
+		
+		new_table.setWordWrap(True)
+		new_table.resizeRowsToContents()
+		new_table.setSortingEnabled(True)
+		new_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+		new_table.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+		new_table.doubleClicked.connect(self.open_child_edit_log)
+		new_table.selectionModel().selectionChanged.connect(self.activate_delete_log)
+		return new_table
+
+	def create_default_table(self):
+		# Create default table with predefined columns and settings
+		new_table = self.create_log_table()
+		
+		self.tables.append(new_table)
+		self.table_selector.addItem("Travel Logs")
+		self.table_selector.setCurrentIndex(0)
+		self.update_table(new_table)
+
+	def switch_table(self):
+		# Switch between different table views
+		if self.tables:
+			self.update_table(self.tables[self.table_selector.currentIndex()])
+
+	def open_child_create_table(self):
+		# Open dialog for creating new table
+		self.create_table_dialog.reset()
+		self.create_table_dialog.setModal(True)
+		self.create_table_dialog.show()
+
+	def open_child_rename_table(self):
+		# Open dialog for renaming current table
+		self.rename_table_dialog.reset()
+		self.rename_table_dialog.setModal(True)
+		self.rename_table_dialog.show()
+
+	def open_child_schedules(self):
+		# Open dialog listing recurring trips
+		self.schedules_dialog.reset()
+		self.schedules_dialog.setModal(True)
+		self.schedules_dialog.show()
+
+	def expand_schedules(self):
+		# Log every occurrence of a recurring trip that has started since the last expansion, in one transaction
+		db.expand_schedules()
+
+	def update_table(self, new_table):
+		# Update main display with new table widget
+		self.table.setParent(None)
+		self.table = new_table
+		self.table_layout.insertWidget(0, self.table, 5)
+		self.clear_filter_btn.setEnabled(isinstance(self.table.model(), LogTableModel) and self.table.model().location_filter is not None)
+		self.where_input.setText((self.table.model().expression_filter or "") if isinstance(self.table.model(), LogTableModel) else "")
+		self.show_current_view()
+
+		self.update_statistics()
+	
+	def delete_table(self):
+		# Delete current table after confirmation
+		current_index = self.table_selector.currentIndex()
+
+		confirm = QMessageBox.question(self, "Delete Table", f"Do you really want to continue deleting '{self.table_selector.currentText()}' table?\nAll of its logs cannot be recovered once deleted.")
+
+		if confirm == QMessageBox.StandardButton.Yes:
+			self.table_layout.removeWidget(self.table)
+			self.tables.pop(current_index)
+			self.table_selector.removeItem(current_index)
+
+			if not self.tables:
+				self.empty_table = QTableView()
+				self.update_table(self.empty_table)
+
+				self.update_statistics()
+
+				# Disable buttons when no tables exist
+				self.table_selector.setEnabled(False)
+				self.rename_table_btn.setEnabled(False)
+				self.delete_table_btn.setEnabled(False)
+				self.add_log_btn.setEnabled(False)
+	
+	def open_child_add_log(self):
+		# Open dialog for adding new travel log
+		if QApplication.activeModalWidget() is not None or not self.add_log_btn.isEnabled():
+			return
+
+		self.add_log_dialog.reset()
+		self.add_log_dialog.setModal(True)
+		self.add_log_dialog.show()
+
+	def log_route_template(self, index):
+		# Log a frequent route straight away, starting now and ending after its expected duration
+		# The status bar names the trip and Undo (Ctrl+Z) takes it out again
+		if index >= len(self.route_templates) or QApplication.activeModalWidget() is not None or not self.add_log_btn.isEnabled():
+			return
+
+		origin, destination, mode, _ = self.route_templates[index]
+		estimate = db.get_route_estimate(origin, destination, mode)
+		start_dt = QDateTime.currentDateTime()
+		end_dt = start_dt.addSecs(60 if estimate is None else max(estimate.median, 60))
+		log_id = db.create_log(origin, destination, mode, start_dt.toString("yyyy-MM-dd hh:mm:ss"), end_dt.toString("yyyy-MM-dd hh:mm:ss"))
+
+		current_table = self.tables[self.table_selector.currentIndex()]
+		model = current_table.model()
+		model.upsert_logs(db.get_log_columns([log_id]))
+		self.push_undo(("add", current_table, [log_id]))
+
+		self.update_statistics()
+
+		self.delete_log_btn.setEnabled(False)
+		self.clear_all_logs_btn.setEnabled(True)
+
+		current_table.selectRow(model.store.find(log_id))
+
+		self.notice_until = time.monotonic() + NOTICE_SECONDS
+		self.statusBar().showMessage(f"Logged {origin} → {destination} ({mode}) until {end_dt.toString('hh:mm')}  |  Ctrl+Z to undo", NOTICE_SECONDS * 1000)
+
+	def calculate_duration_per_log(self, start_dt, end_dt):
+		# Calculate duration between start and end datetime in human-readable format
+		return self.format_duration(start_dt.secsTo(end_dt))
+
+	def format_duration(self, duration_seconds):
+		# Format a number of seconds as days, hours, and minutes, worded the same as reports
+		return report.format_duration(duration_seconds)
+
+	def calculate_total_and_average_duration(self):
+		# Calculate total and average duration from the running sums of the current table's store
+		current_table_index = self.table_selector.currentIndex()
+
+		if current_table_index < 0:
+			return "Total Duration Time:", "Average Duration Time:"
+			
+		store = self.tables[current_table_index].model().store
+		log_count = len(store)
+
+		if log_count == 0:
+			return "Total Duration Time:", "Average Duration Time:"
+		
+		total_seconds = store.total_seconds
+		average_seconds = total_seconds // log_count
+
+		total_duration = self.format_duration(total_seconds)
+		average_duration = self.format_duration(average_seconds)
+
+		# Format output based on log count
+		if log_count == 1:
+			return f"Total Duration Time:\n  {total_duration}", "Average Duration Time:"
+		else:
+			return f"Total Duration Time:\n  {total_duration}", f"Average Duration Time:\n  {average_duration}"
+
+	def update_statistics(self):
+		# Refresh the duration labels, outlier thresholds, and the chart after logs change
+		total_duration, average_duration = self.calculate_total_and_average_duration()
+		self.total_duration_display.setText(total_duration)
+		self.average_duration_display.setText(average_duration)
+
+		# One row per route, so this stays cheap however long the history is
+		self.route_thresholds = db.get_route_thresholds()
+		self.route_templates = db.get_route_templates(ROUTE_TEMPLATES)
+		self.table.viewport().update()
+
+		if self.chart_panel.isVisible():
+			self.chart_panel.refresh()
+
+		if self.calendar_panel.isVisible():
+			self.calendar_panel.refresh()
+
+	def toggle_chart(self):
+		# Show or hide the duration chart below the table
+		visible = not self.chart_panel.isVisible()
+		self.chart_panel.setVisible(visible)
+		self.chart_btn.setText("Hide Chart" if visible else "Show Chart")
+		self.fit_panels()
+
+		if visible:
+			self.chart_panel.refresh()
+
+	def toggle_calendar(self):
+		# Show or hide the calendar heatmap of daily trip time below the table
+		visible = not self.calendar_panel.isVisible()
+		self.calendar_panel.setVisible(visible)
+		self.calendar_btn.setText("Hide Calendar" if visible else "Show Calendar")
+		self.fit_panels()
+
+		if visible:
+			self.calendar_panel.refresh()
+
+	def fit_panels(self):
+		# Grow the window by the height of each panel shown below the table
+		self.setFixedSize(1000, 500 + (300 if self.chart_panel.isVisible() else 0) + (200 if self.calendar_panel.isVisible() else 0))
+
+	def show_day(self, date):
+		# Filter the current table to the trips started on a day clicked in the calendar
+		self.where_input.setText(f"start = {date}")
+		self.apply_expression_filter()
+
+	def apply_location_filter(self):
+		# Show only logs of the current table that start/end near a place or coordinates
+		text = self.near_input.text().strip()
+
+		if not self.tables:
+			return
+
+		if not text:
+			self.clear_location_filter()
+			return
+
+		location = self.parse_location(text)
+
+		if location is None:
+			QMessageBox.warning(self, "Error", f"No location is recorded for '{text}'.\nEnter a place name from imported trips or 'latitude, longitude'.")
+			return
+
+		endpoint = self.endpoint_selector.currentText().lower()
+		self.tables[self.table_selector.currentIndex()].model().set_location_filter(location + (self.radius_input.value(), endpoint))
+		self.clear_filter_btn.setEnabled(True)
+		self.filter_changed()
+
+	def clear_location_filter(self):
+		# Show every log of the current table again
+		if self.tables:
+			self.tables[self.table_selector.currentIndex()].model().set_location_filter(None)
+
+		self.clear_filter_btn.setEnabled(False)
+		self.filter_changed()
+
+	def load_views(self):
+		# Fill the view selector with the saved views, keeping the shown view selected
+		self.views = dict(db.get_views())
+		self.view_selector.clear()
+		self.view_selector.addItem("All Logs")
+		self.view_selector.addItems(list(self.views))
+		self.show_current_view()
+
+	def show_current_view(self):
+		# Select the saved view whose expression is applied, "All Logs" without one, or nothing for an unsaved filter
+		expression = self.where_input.text().strip()
+		names = [name for name, view_expression in self.views.items() if view_expression == expression] if expression else []
+
+		if not expression:
+			self.view_selector.setCurrentIndex(0)
+		elif names:
+			self.view_selector.setCurrentText(names[0])
+		else:
+			self.view_selector.setCurrentIndex(-1)
+
+		self.delete_view_btn.setEnabled(self.view_selector.currentIndex() > 0)
+
+	def select_view(self, index):
+		# Apply a saved view to the current table
+		self.where_input.setText(self.views.get(self.view_selector.itemText(index), "") if index > 0 else "")
+		self.apply_expression_filter()
+
+	def apply_expression_filter(self):
+		# Show only logs of the current table that match the filter expression, or every log for an empty one
+		expression = self.where_input.text().strip()
+
+		if expression:
+			try:
+				filters.compile_filter(expression)
+			except ValueError as e:
+				QMessageBox.warning(self, "Error", f"Invalid filter: {e}")
+				return
+
+		if self.tables:
+			self.tables[self.table_selector.currentIndex()].model().set_expression_filter(expression or None)
+			self.filter_changed()
+
+		self.show_current_view()
+
+	def save_view(self):
+		# Save the filter expression as a named view
+		expression = self.where_input.text().strip()
+		current_name = self.view_selector.currentText() if self.view_selector.currentIndex() > 0 else ""
+		name, ok = QInputDialog.getText(self, "Save View", "View name:", text=current_name)
+
+		if not ok:
+			return
+
+		try:
+			db.save_view(name, expression)
+		except ValueError as e:
+			QMessageBox.warning(self, "Error", f"Invalid filter: {e}" if name.strip() else str(e))
+			return
+
+		self.apply_expression_filter()
+		self.load_views()
+		self.view_selector.setCurrentText(name.strip())
+		self.delete_view_btn.setEnabled(True)
+
+	def delete_view(self):
+		# Delete the selected saved view; the filter it applied stays until changed
+		name = self.view_selector.currentText()
+		confirm = QMessageBox.question(self, "Delete View", f"Do you really want to delete the '{name}' view?")
+
+		if confirm == QMessageBox.StandardButton.Yes:
+			db.delete_view(name)
+			self.load_views()
+			self.view_selector.setCurrentIndex(-1)
+			self.delete_view_btn.setEnabled(False)
+
+	def parse_location(self, text):
+		# Read "latitude, longitude" or look up the recorded coordinates of a place name
+		parts = text.split(",")
+
+		if len(parts) == 2:
+			try:
+				lat, lon = float(parts[0]), float(parts[1])
+
+				if -90 <= lat <= 90 and -180 <= lon <= 180:
+					return lat, lon
+			except ValueError:
+				pass
+
+		return db.get_place_location(text)
+
+	def filter_changed(self):
+		# Rows were swapped wholesale, so refresh statistics and selection-dependent buttons
+		self.update_statistics()
+		self.clear_all_logs_btn.setEnabled(self.table.model() is not None and self.table.model().rowCount() > 0)
+		self.activate_delete_log()
+
+	def format_duration_components(self, components):
+		# Format duration components with proper conjunction
+		return report.format_duration_components(components)
+
+	def open_child_edit_log(self, index):
+		# Open dialog for editing existing log (double-click handler)
+		if QApplication.activeModalWidget() is not None:
+			return
+
+		self.edit_log_dialog.load(index.row())
+		self.edit_log_dialog.setModal(True)
+		self.edit_log_dialog.show()
+
+	def activate_delete_log(self):
+		# Enable selection actions when at least one log is selected
+		has_selection = bool(self.get_selected_rows(self.table))
+		self.delete_log_btn.setEnabled(has_selection)
+		self.change_mode_btn.setEnabled(has_selection)
+		self.shift_time_btn.setEnabled(has_selection)
+
+	def get_selected_rows(self, current_table):
+		# Return selected row indices in descending order so removals don't shift pending rows
+		if current_table.selectionModel() is None:
+			return []
+
+		rows = {index.row() for index in current_table.selectionModel().selectedRows()}
+		return sorted(rows, reverse=True)
+
+	def get_log_ids(self, current_table, rows):
+		# Read log IDs from the table's store for the given rows
+		model = current_table.model()
+		return [model.log_id(row) for row in rows]
+
+	def delete_log(self):
+		# Delete selected logs after a single confirmation
+		current_table = self.tables[self.table_selector.currentIndex()]
+		selected_logs = self.get_selected_rows(current_table)
+
+		if not selected_logs:
+			return
+
+		if len(selected_logs) == 1:
+			message = "Do you really want to delete this log?"
+		else:
+			message = f"Do you really want to delete these {len(selected_logs)} logs?"
+
+		confirm = QMessageBox.question(self, "Delete Log", message, QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+
+		if confirm == QMessageBox.StandardButton.Yes:
+			# Delete from database in one transaction
+			log_ids = self.get_log_ids(current_table, selected_logs)
+			db.delete_logs(log_ids)
+			self.push_undo(("delete", current_table, log_ids))
+			
+			# Delete from UI
+			current_table.model().remove_logs(log_ids)
+
+			self.update_statistics()
+
+			# Disable buttons if no logs remain
+			if current_table.model().rowCount() == 0:
+				self.delete_log_btn.setEnabled(False)
+				self.clear_all_logs_btn.setEnabled(False)
+
+	def change_mode_of_logs(self):
+		# Set the same mode on every selected log
+		current_table = self.tables[self.table_selector.currentIndex()]
+		selected_logs = self.get_selected_rows(current_table)
+
+		if not selected_logs:
+			return
+
+		mode, ok = QInputDialog.getItem(self, "Change Mode", f"Mode for {len(selected_logs)} selected log(s):", ["Car", "Walk", "Bus", "Airplane", "Bicycle"], 0, True)
+
+		if not ok:
+			return
+
+		try:
+			log_ids = self.get_log_ids(current_table, selected_logs)
+			db.update_logs_mode(log_ids, mode.strip())
+			self.reload_logs(current_table, log_ids)
+		except ValueError as e:
+			QMessageBox.warning(self, "Error", str(e))
+
+	def shift_time_of_logs(self):
+		# Move start and end of every selected log by the same number of minutes
+		current_table = self.tables[self.table_selector.currentIndex()]
+		selected_logs = self.get_selected_rows(current_table)
+
+		if not selected_logs:
+			return
+
+		minutes, ok = QInputDialog.getInt(self, "Shift Time", f"Minutes to shift {len(selected_logs)} selected log(s)\n(negative moves earlier):", 0, -525600, 525600)
+
+		if not ok or minutes == 0:
+			return
+
+		log_ids = self.get_log_ids(current_table, selected_logs)
+		db.shift_logs(log_ids, minutes * 60)
+		self.reload_logs(current_table, log_ids)
+
+	def reload_logs(self, current_table, log_ids):
+		# Refresh the given logs from one batched read, then update statistics once
+		current_table.model().upsert_logs(db.get_log_columns(log_ids))
+
+		self.update_statistics()
+
+	def clear_all_logs(self):
+		# Clear all logs in current table after confirmation
+		confirm = QMessageBox.question(self, "Clear All Logs", f"Do you really want to clear all logs in '{self.table_selector.currentText()}' table?\nYou can still undo this for a few minutes.", QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+
+		if confirm == QMessageBox.StandardButton.Yes:
+			current_table = self.tables[self.table_selector.currentIndex()]
+
+			# Clear from database, remembering which logs this table showed for undo
+			model = current_table.model()
+			log_ids = set(chain(model.store.ids, model.filtered_out.ids))
+			self.push_undo(("clear", current_table, log_ids, db.clear_all_logs()))
+			
+			# Clear from UI
+			current_table.model().clear()
+
+			self.update_statistics()
+
+			self.delete_log_btn.setEnabled(False)
+			self.change_mode_btn.setEnabled(False)
+			self.shift_time_btn.setEnabled(False)
+			self.clear_all_logs_btn.setEnabled(False)
+
+	def push_undo(self, action):
+		# Remember a delete, clear or quick entry; only recent ones are kept since compaction purges older ones
+		self.undo_stack = self.undo_stack[-19:] + [action]
+		self.update_undo_button()
+
+	def update_undo_button(self):
+		# Name what Undo will do next
+		kind = self.undo_stack[-1][0] if self.undo_stack else None
+		self.undo_btn.setEnabled(kind is not None)
+		self.undo_btn.setText({"add": "Undo Add", "delete": "Undo Delete", "clear": "Undo Clear"}.get(kind, "Undo"))
+
+	def undo_delete(self):
+		# Bring back the logs of the most recent delete or clear into the table they were in,
+		# or take out the trip of the most recent quick entry
+		if not self.undo_stack or QApplication.activeModalWidget() is not None:
+			return
+
+		action = self.undo_stack.pop()
+		self.update_undo_button()
+		kind, current_table, log_ids = action[:3]
+
+		if kind == "add":
+			db.delete_logs(log_ids)
+
+			if current_table in self.tables:
+				current_table.model().remove_logs(log_ids)
+
+			self.statusBar().clearMessage()
+			self.update_statistics()
+
+			self.clear_all_logs_btn.setEnabled(self.table.model() is not None and self.table.model().rowCount() > 0)
+			self.activate_delete_log()
+			return
+
+		if current_table not in self.tables:
+			if not self.tables:
+				self.create_default_table()
+				self.table_selector.setEnabled(True)
+				self.rename_table_btn.setEnabled(True)
+				self.delete_table_btn.setEnabled(True)
+				self.add_log_btn.setEnabled(True)
+
+			current_table = self.tables[0]
+
+		if kind == "delete":
+			restored = db.restore_logs(log_ids)
+			current_table.model().upsert_logs(db.get_log_columns(log_ids))
+
+			if restored < len(log_ids):
+				QMessageBox.warning(self, "Undo Delete", f"{len(log_ids) - restored} of the deleted logs were already purged and cannot be restored.")
+		elif db.undo_clear(action[3]):
+			current_table.model().upsert_logs([log for log in db.iter_log_columns() if log[0] in log_ids])
+		else:
+			QMessageBox.warning(self, "Undo Delete", "The cleared logs were already purged and cannot be restored.")
+
+		self.update_statistics()
+
+		self.clear_all_logs_btn.setEnabled(self.table.model() is not None and self.table.model().rowCount() > 0)
+		self.activate_delete_log()
+
+class LogTableModel(QAbstractTableModel):
+	# Table model reading display values on demand from a columnar LogStore
+	HEADERS = ["ID", "Origin", "Destination", "Mode", "Start Date/Time", "End Date/Time", "Duration", "Description"]
+
+	def __init__(self, main_window):
+		super().__init__(main_window)
+
+		self.main_window = main_window
+		self.store = LogStore()
+		self.sort_column = None
+
+		# Active (lat, lon, radius, endpoint) filter; logs it rejects are parked in a side store
+		self.location_filter = None
+		self.expression_filter = None
+		self.filtered_out = LogStore()
+		self.sort_order = Qt.SortOrder.AscendingOrder
+
+	def rowCount(self, parent=QModelIndex()):
+		return 0 if parent.isValid() else len(self.store)
+
+	def columnCount(self, parent=QModelIndex()):
+		return 0 if parent.isValid() else len(self.HEADERS)
+
+	def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+		if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+			return self.HEADERS[section]
+
+		return super().headerData(section, orientation, role)
+
+	def flags(self, index):
+		# All cells are selectable but non-editable for data integrity
+		return Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEnabled
+
+	def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+		# Build display text only for the cells the view asks for
+		if not index.isValid():
+			return None
+
+		row, column = index.row(), index.column()
+		store = self.store
+
+		# Flag trips that are unusually long for their route
+		if column == 6 and role in (Qt.ItemDataRole.ForegroundRole, Qt.ItemDataRole.FontRole, Qt.ItemDataRole.ToolTipRole):
+			route = (store.strings[store.origins[row]], store.strings[store.destinations[row]], store.strings[store.modes[row]])
+			threshold = self.main_window.route_thresholds.get(route)
+
+			if threshold is None or store.durations[row] <= threshold:
+				return None
+			elif role == Qt.ItemDataRole.ForegroundRole:
+				return QColor("#c0392b")
+			elif role == Qt.ItemDataRole.FontRole:
+				font = QFont()
+				font.setBold(True)
+				return font
+			else:
+				return f"Unusually long for this route (usually under {self.main_window.format_duration(int(threshold))})"
+
+		if role != Qt.ItemDataRole.DisplayRole:
+			return None
+
+		if column == 0:
+			return str(store.ids[row])
+		elif column == 1:
+			return store.strings[store.origins[row]]
+		elif column == 2:
+			return store.strings[store.destinations[row]]
+		elif column == 3:
+			return store.strings[store.modes[row]]
+		elif column == 4:
+			return self.main_window.format_datetime(store.starts[row])
+		elif column == 5:
+			return self.main_window.format_datetime(store.ends[row])
+		elif column == 6:
+			return self.main_window.format_duration(store.durations[row])
+		else:
+			return store.description(row)
+
+	def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+		# Remember the view's sort so later inserts land in order
+		self.sort_column = column
+		self.sort_order = order
+		self.resort()
+
+	def resort(self):
+		# Reorder the store itself and keep selections pointing at the same logs
+		if self.sort_column is None:
+			return
+
+		self.layoutAboutToBeChanged.emit()
+		order = self.store.sort(self.sort_column, self.sort_order == Qt.SortOrder.DescendingOrder)
+		persistent = self.persistentIndexList()
+
+		if persistent:
+			new_positions = [0] * len(order)
+
+			for new_position, old_position in enumerate(order):
+				new_positions[old_position] = new_position
+
+			moved = [self.index(new_positions[index.row()], index.column()) for index in persistent]
+			self.changePersistentIndexList(persistent, moved)
+
+		self.layoutChanged.emit()
+
+	def load(self, logs):
+		# Replace all rows with logs in column layout
+		self.beginResetModel()
+		self.store.load(logs)
+		self.filtered_out.clear()
+		self.apply_filter()
+
+		if self.sort_column is not None:
+			self.store.sort(self.sort_column, self.sort_order == Qt.SortOrder.DescendingOrder)
+
+		self.endResetModel()
+
+	def clear(self):
+		# Drop all rows
+		self.beginResetModel()
+		self.store.clear()
+		self.filtered_out.clear()
+		self.endResetModel()
+
+	def set_location_filter(self, location_filter):
+		# Show only logs within a radius of a point, or every log again for None
+		self.set_filters(location_filter, self.expression_filter)
+
+	def set_expression_filter(self, expression_filter):
+		# Show only logs matching a filter expression, or every log again for None
+		self.set_filters(self.location_filter, expression_filter)
+
+	def set_filters(self, location_filter, expression_filter):
+		# Bring back every filtered out log, then apply both filters anew
+		self.beginResetModel()
+
+		for position in range(len(self.filtered_out)):
+			self.store.append(self.filtered_out.row(position))
+
+		self.filtered_out.clear()
+		self.location_filter = location_filter
+		self.expression_filter = expression_filter
+		self.apply_filter()
+
+		if self.sort_column is not None:
+			self.store.sort(self.sort_column, self.sort_order == Qt.SortOrder.DescendingOrder)
+
+		self.endResetModel()
+
+	def matching_ids(self, log_ids=None):
+		# IDs passing every active filter, optionally only among log_ids, or None without filters
+		matching = None
+
+		if self.location_filter is not None:
+			matching = db.find_logs_near(*self.location_filter, log_ids=log_ids)
+
+		if self.expression_filter is not None:
+			found = db.find_logs_matching(self.expression_filter, log_ids)
+			matching = found if matching is None else matching & found
+
+		return matching
+
+	def apply_filter(self):
+		# Move rows rejected by the filters from the store to the side store
+		matching = self.matching_ids()
+
+		if matching is None:
+			return
+
+		rejected = [position for position, log_id in enumerate(self.store.ids) if log_id not in matching]
+
+		for position in rejected:
+			self.filtered_out.append(self.store.row(position))
+
+		self.store.remove_positions(rejected)
+
+	def owned_ids(self, log_ids):
+		# IDs among log_ids that belong to this table, shown or filtered out
+		wanted = set(log_ids)
+		owned = set(self.store.positions_of(wanted))
+
+		if len(self.filtered_out):
+			owned.update(self.filtered_out.positions_of(wanted))
+
+		return owned
+
+	def log_id(self, row):
+		return self.store.ids[row]
+
+	def get_log(self, row):
+		# Return (id, origin, destination, mode, start epoch, end epoch, description) for a row
+		return self.store.row(row) + (self.store.description(row),)
+
+	def insertion_row(self, log):
+		# Row that keeps the current sort order, or the end if the key needs a database read
+		key = None if self.sort_column is None else LogStore.row_key(self.sort_column, log)
+
+		if key is None:
+			return len(self.store)
+
+		return self.store.bisect(self.sort_column, key, self.sort_order == Qt.SortOrder.DescendingOrder)
+
+	def remove_logs(self, log_ids):
+		# Remove logs by ID, with one model reset for large batches
+		log_ids = set(log_ids)
+
+		if len(self.filtered_out):
+			self.filtered_out.remove_positions(self.filtered_out.positions_of(log_ids).values())
+
+		positions = sorted(self.store.positions_of(log_ids).values(), reverse=True)
+
+		if len(positions) > 64:
+			self.beginResetModel()
+			self.store.remove_positions(positions)
+			self.endResetModel()
+			return
+
+		for position in positions:
+			self.beginRemoveRows(QModelIndex(), position, position)
+			self.store.remove(position)
+			self.endRemoveRows()
+
+	def upsert_logs(self, logs):
+		# Insert or replace logs in column layout, keeping sort order and selection
+		matching = self.matching_ids([log[0] for log in logs])
+
+		if matching is not None:
+			# Re-check changed logs against the filters; rejected ones move to the side store
+			rejected = [log for log in logs if log[0] not in matching]
+			logs = [log for log in logs if log[0] in matching]
+			self.remove_logs([log[0] for log in rejected])
+			self.filtered_out.remove_positions(self.filtered_out.positions_of(matching).values())
+
+			for log in rejected:
+				self.filtered_out.append(log)
+
+		positions = self.store.positions_of([log[0] for log in logs])
+
+		if len(logs) > 64:
+			# Large batches: overwrite in place, append new logs as one block, then resort once
+			new_logs = [log for log in logs if log[0] not in positions]
+
+			for log in logs:
+				if log[0] in positions:
+					self.store.replace(positions[log[0]], log)
+
+			if positions:
+				self.dataChanged.emit(self.index(0, 0), self.index(len(self.store) - 1, len(self.HEADERS) - 1))
+
+			if new_logs:
+				self.beginInsertRows(QModelIndex(), len(self.store), len(self.store) + len(new_logs) - 1)
+
+				for log in new_logs:
+					self.store.append(log)
+
+				self.endInsertRows()
+
+			self.resort()
+			return
+
+		def shift(first, step):
+			# Keep the positions of the logs still to do in step with a row inserted or removed at first
+			for log_id, position in positions.items():
+				if position >= first:
+					positions[log_id] = position + step
+
+		for log in logs:
+			position = positions.pop(log[0], -1)
+			row = self.insertion_row(log)
+
+			if position < 0:
+				self.beginInsertRows(QModelIndex(), row, row)
+				self.store.insert(row, log)
+				self.endInsertRows()
+				shift(row, 1)
+			elif row in (position, position + 1):
+				# Still in order, only the cells change
+				self.store.replace(position, log)
+				self.dataChanged.emit(self.index(position, 0), self.index(position, len(self.HEADERS) - 1))
+			else:
+				# Move the row so its selection follows it
+				self.beginMoveRows(QModelIndex(), position, position, QModelIndex(), row)
+				self.store.remove(position)
+				shift(position + 1, -1)
+				self.store.insert(row if row < position else row - 1, log)
+				shift(row if row < position else row - 1, 1)
+				self.endMoveRows()
+
+class ChildCreateTable(QDialog):
+	def __init__(self, main_window):
+		super().__init__(main_window)
+
+		self.setWindowTitle("Create New Table")
+		self.setFixedSize(200, 100)
+		screen = main_window.screen
+		self.move(int((screen.width() - self.width()) / 2), int((screen.height() - self.height()) / 2))
+
+		self.main_window = main_window
+
+		self.input = QLineEdit()
+		self.error_prompt = QLabel()
+		self.buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Cancel | QDialogButtonBox.StandardButton.Ok)
+		self.buttons.button(QDialogButtonBox.StandardButton.Ok).setText("Create")
+		self.buttons.setLayoutDirection(Qt.LayoutDirection.RightToLeft)
+
+		layout = QFormLayout()
+		layout.addRow("Table name:", self.input)
+		
+		main_layout = QVBoxLayout()
+		main_layout.addLayout(layout)
+		main_layout.addWidget(self.error_prompt, alignment=Qt.AlignmentFlag.AlignCenter)
+		main_layout.addWidget(self.buttons, alignment=Qt.AlignmentFlag.AlignCenter)
+		self.setLayout(main_layout)
+
+		self.buttons.rejected.connect(self.reject)
+		self.buttons.accepted.connect(self.create)
+
+	def reset(self):
+		# Clear the previous name and error before the dialog is shown again
+		self.input.clear()
+		self.error_prompt.clear()
+		self.input.setFocus()
+
+	def create(self):
+		# Validate and create new table
+		if self.input.text():
+			table_names = [self.main_window.table_selector.itemText(i) for i in range(len(self.main_window.tables))]
+			
+			if self.input.text() not in table_names:
+				new_table = self.main_window.create_log_table()
+				
+				self.main_window.tables.append(new_table)
+				self.main_window.table_selector.addItem(self.input.text())
+				self.main_window.table_selector.setCurrentIndex(self.main_window.table_selector.count() - 1)
+				self.main_window.update_table(new_table)
+				
+				# Enable table management buttons
+				self.main_window.table_selector.setEnabled(True)
+				self.main_window.rename_table_btn.setEnabled(True)
+				self.main_window.delete_table_btn.setEnabled(True)
+				self.main_window.add_log_btn.setEnabled(True)
+				
+				self.accept()
+			else:
+				self.error_prompt.setText(f"<font color='red'>* '{self.input.text()}' table already exists.</font>")
+		else:
+			self.error_prompt.setText("<font color='red'>* Table name is required.</font>")
+
+class ChildRenameTable(QDialog):
+	def __init__(self, main_window):
+		super().__init__(main_window)
+
+		self.setWindowTitle("Rename Table")
+		self.setFixedSize(200, 100)
+		screen = main_window.screen
+		self.move(int((screen.width() - self.width()) / 2), int((screen.height() - self.height()) / 2))
+
+		self.main_window = main_window
+
+		self.input = QLineEdit()
+		self.error_prompt = QLabel()
+		self.buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Cancel | QDialogButtonBox.StandardButton.Ok)
+		self.buttons.button(QDialogButtonBox.StandardButton.Ok).setText("Save")
+		self.buttons.setLayoutDirection(Qt.LayoutDirection.RightToLeft)
+
+		layout = QFormLayout()
+		layout.addRow("Table name:", self.input)
+
+		main_layout = QVBoxLayout()
+		main_layout.addLayout(layout)
+		main_layout.addWidget(self.error_prompt, alignment=Qt.AlignmentFlag.AlignCenter)
+		main_layout.addWidget(self.buttons, alignment=Qt.AlignmentFlag.AlignCenter)
+		self.setLayout(main_layout)
+
+		self.buttons.rejected.connect(self.reject)
+		self.buttons.accepted.connect(self.save)
+
+	def reset(self):
+		# Clear the previous name and error before the dialog is shown again
+		self.input.clear()
+		self.error_prompt.clear()
+		self.input.setFocus()
+
+	def save(self):
+		# Validate and save table rename
+		if not self.input.text():
+			self.error_prompt.setText("<font color='red'>* Table name is required.</font>")
+			return
+
+		table_names = [self.main_window.table_selector.itemText(i) for i in range(len(self.main_window.tables))]
+		current_table_name = self.main_window.table_selector.currentText()
+
+		if self.input.text() in table_names and self.input.text() != current_table_name:
+			self.error_prompt.setText(f"<font color='red'>* '{self.input.text()}' table already exists.</font>")
+		else:
+			self.main_window.table_selector.setItemText(self.main_window.table_selector.currentIndex(), self.input.text())
+			self.accept()
+
+class ChildAddLog(QDialog):
+	def __init__(self, main_window):
+		super().__init__(main_window)
+
+		self.setWindowTitle("Add Log")
+		self.setFixedWidth(325)
+		self.setMinimumHeight(300)
+		screen = main_window.screen
+		self.move(int((screen.width() - self.width()) / 2), int((screen.height() - self.height()) / 2))
+
+		self.main_window = main_window
+
+		# Frequent routes to start from, refreshed on every open
+		self.template_input = QComboBox()
+
+		# Input fields with validation
+		self.origin_input = QLineEdit()
+		self.error_label1 = QLabel()
+		self.error_label1.setVisible(False)
+		self.destination_input = QLineEdit()
+		self.error_label2 = QLabel()
+		self.error_label2.setVisible(False)
+		self.mode_input_cb = QComboBox()
+		self.mode_input_cb.addItems(["Car", "Walk", "Bus", "Airplane", "Bicycle", "Other"])
+		self.mode_input_le = QLineEdit()
+		self.mode_input_le.setEnabled(False)
+		self.mode_input_le.setVisible(False)
+		self.error_label3 = QLabel()
+		self.error_label3.setVisible(False)
+		self.estimate_label = QLabel()
+		self.estimate_label.setWordWrap(True)
+		self.estimate_label.setVisible(False)
+		self.estimate = None
+		
+		# DateTime inputs with current time defaults
+		now = QDateTime.currentDateTime()
+		self.start_date_input = QDateEdit()
+		self.start_date_input.setDisplayFormat("yyyy/MM/d")
+		self.start_date_input.setCalendarPopup(True)
+		self.start_date_input.setDate(now.date())
+		self.start_time_input = QTimeEdit()
+		self.start_time_input.setTime(now.time())
+		self.end_date_input = QDateEdit()
+		self.end_date_input.setDisplayFormat("yyyy/MM/d")
+		self.end_date_input.setCalendarPopup(True)
+		self.end_date_input.setDate(now.addSecs(60).date())  # Default to 1 minute later
+		self.end_time_input = QTimeEdit()
+		self.end_time_input.setTime(now.addSecs(60).time())
+		self.error_label4 = QLabel()
+		self.error_label4.setVisible(False)
+		self.repeat_input = QComboBox()
+		self.repeat_input.addItems([label for label, _ in REPEAT_CHOICES])
+		self.repeat_input.setToolTip("Log this trip again automatically at the same time")
+		self.description_input = QTextEdit()
+		self.description_input.setFixedHeight(80)
+		self.buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Cancel | QDialogButtonBox.StandardButton.Ok)
+		self.buttons.button(QDialogButtonBox.StandardButton.Ok).setText("Add")
+		self.buttons.setLayoutDirection(Qt.LayoutDirection.RightToLeft)
+		
+		# Layout organization
+		start_input_layout = QHBoxLayout()
+		start_input_layout.addWidget(self.start_date_input)
+		start_input_layout.addWidget(self.start_time_input)
+		
+		end_input_layout = QHBoxLayout()
+		end_input_layout.addWidget(self.end_date_input)
+		end_input_layout.addWidget(self.end_time_input)
+
+		fill_up_layout = QFormLayout()
+		fill_up_layout.addRow("Frequent:", self.template_input)
+		fill_up_layout.addRow("Origin:", self.origin_input)
+		fill_up_layout.addRow("", self.error_label1)
+		fill_up_layout.addRow("Destination:", self.destination_input)
+		fill_up_layout.addRow("", self.error_label2)
+		fill_up_layout.addRow("Mode:", self.mode_input_cb)
+		fill_up_layout.addRow("", self.mode_input_le)
+		fill_up_layout.addRow("", self.error_label3)
+		fill_up_layout.addRow("Start Date/Time:", start_input_layout)
+		fill_up_layout.addRow("End Date/Time:", end_input_layout)
+		fill_up_layout.addRow("", self.error_label4)
+		fill_up_layout.addRow("", self.estimate_label)
+		fill_up_layout.addRow("Repeat:", self.repeat_input)
+		fill_up_layout.addRow("Description:\n(optional)", self.description_input)
+
+		main_layout = QVBoxLayout()
+		main_layout.addLayout(fill_up_layout)
+		main_layout.addWidget(self.buttons, alignment=Qt.AlignmentFlag.AlignLeft)
+		self.setLayout(main_layout)
+
+		# Signal connections
+		self.mode_input_cb.currentIndexChanged.connect(self.combobox_other)
+		self.start_time_input.timeChanged.connect(self.adjust_end_time)
+		self.end_time_input.timeChanged.connect(self.adjust_start_time)
+		self.origin_input.editingFinished.connect(self.load_route_estimate)
+		self.destination_input.editingFinished.connect(self.load_route_estimate)
+		self.mode_input_cb.currentIndexChanged.connect(self.load_route_estimate)
+		self.mode_input_le.editingFinished.connect(self.load_route_estimate)
+		self.start_time_input.timeChanged.connect(self.show_route_estimate)
+		self.end_time_input.timeChanged.connect(self.show_route_estimate)
+		self.end_date_input.dateChanged.connect(self.show_route_estimate)
+		self.template_input.activated.connect(self.select_template)
+		self.buttons.rejected.connect(self.reject)
+		self.buttons.accepted.connect(self.add)
+
+	def reset(self):
+		# Clear the previous entry and start from the current time
+		now = QDateTime.currentDateTime()
+		self.estimate = None
+		self.origin_input.clear()
+		self.destination_input.clear()
+		self.mode_input_cb.setCurrentIndex(0)
+		self.mode_input_le.clear()
+		self.start_date_input.setDate(now.date())
+		self.start_time_input.setTime(now.time())
+		self.end_date_input.setDate(now.addSecs(60).date())  # Default to 1 minute later
+		self.end_time_input.setTime(now.addSecs(60).time())
+		self.repeat_input.setCurrentIndex(0)
+		self.description_input.clear()
+
+		for label in (self.error_label1, self.error_label2, self.error_label3, self.error_label4):
+			label.setVisible(False)
+
+		self.template_input.clear()
+		self.template_input.addItem("")
+
+		for i, (origin, destination, mode, trips) in enumerate(self.main_window.route_templates):
+			self.template_input.addItem(f"{i + 1}. {origin} → {destination} ({mode}, {trips} {'trip' if trips == 1 else 'trips'})")
+
+		self.template_input.setEnabled(self.template_input.count() > 1)
+		self.template_input.setCurrentIndex(0)
+		self.show_route_estimate()
+		self.origin_input.setFocus()
+
+	def select_template(self, index):
+		# Fill in the route picked from the frequent routes
+		if index > 0:
+			self.apply_template(self.main_window.route_templates[index - 1])
+
+	def apply_template(self, template):
+		# Fill origin, destination and mode, then pre-fill the end time from the route's expected duration
+		origin, destination, mode, _ = template
+		self.origin_input.setText(origin)
+		self.destination_input.setText(destination)
+		mode_index = self.mode_input_cb.findText(mode)
+
+		if mode_index not in (-1, 5):
+			self.mode_input_cb.setCurrentIndex(mode_index)
+		else:
+			self.mode_input_cb.setCurrentIndex(5)
+			self.mode_input_le.setText(mode)
+
+		self.estimate = None
+		self.load_route_estimate()
+
+	def combobox_other(self):
+		# Show/hide custom mode input when "Other" is selected
+		if self.mode_input_cb.currentIndex() != 5:
+			self.mode_input_le.clear()
+			self.mode_input_le.setEnabled(False)
+			self.mode_input_le.setVisible(False)
+		else:
+			self.mode_input_le.setEnabled(True)
+			self.mode_input_le.setVisible(True)
+		
+		self.update_dialog_height()
+
+	def update_dialog_height(self):
+		# Adjust dialog height based on content visibility
+		self.setMinimumHeight(0)
+		self.setMaximumHeight(450)
+		self.adjustSize()
+
+	def get_datetime_inputs(self):
+		# Get combined datetime objects from date and time inputs
+		start_dt = QDateTime(self.start_date_input.date(), self.start_time_input.time())
+		end_dt = QDateTime(self.end_date_input.date(), self.end_time_input.time())
+		return start_dt, end_dt
+
+	def adjust_end_time(self):
+		# Ensure end time is always after start time
+		start_dt, end_dt = self.get_datetime_inputs()
+
+		if start_dt >= end_dt:
+			increment = start_dt.addSecs(60)
+			self.end_date_input.setDate(increment.date())
+			self.end_time_input.setTime(increment.time())
+		
+	def adjust_start_time(self):
+		# Ensure start time is always before end time
+		start_dt, end_dt = self.get_datetime_inputs()
+
+		if end_dt <= start_dt:
+			increment = end_dt.addSecs(-60)
+			self.start_date_input.setDate(increment.date())
+			self.start_time_input.setTime(increment.time())
+
+	def load_route_estimate(self):
+		# Look up the route's expected duration and pre-fill the end time with it
+		origin = self.origin_input.text()
+		destination = self.destination_input.text()
+		mode = self.mode_input_cb.currentText() if self.mode_input_cb.currentIndex() != 5 else self.mode_input_le.text()
+		estimate = db.get_route_estimate(origin, destination, mode) if origin and destination and mode else None
+
+		if estimate != self.estimate:
+			self.estimate = estimate
+
+			if estimate is not None:
+				start_dt, _ = self.get_datetime_inputs()
+				end_dt = start_dt.addSecs(max(estimate.median, 60))
+				self.end_date_input.setDate(end_dt.date())
+				self.end_time_input.setTime(end_dt.time())
+
+		self.show_route_estimate()
+
+	def show_route_estimate(self):
+		# Show the expected duration and warn when the entered times are unusually long
+		if self.estimate is None:
+			self.estimate_label.setVisible(False)
+		else:
+			format_duration = self.main_window.format_duration
+			trips = f"{self.estimate.count} {'trip' if self.estimate.count == 1 else 'trips'}"
+			text = f"Expected: {format_duration(self.estimate.median)} (90% under {format_duration(self.estimate.p90)}, {trips})"
+			start_dt, end_dt = self.get_datetime_inputs()
+
+			if db.is_unusual_duration(self.estimate, start_dt.secsTo(end_dt)):
+				text += "<br><font color='#c0392b'>Unusually long for this route.</font>"
+
+			self.estimate_label.setText(text)
+			self.estimate_label.setVisible(True)
+
+		self.update_dialog_height()
+
+	def add(self):
+		# Validate inputs and add new log to database and UI
+
+		# Origin validation
+		if not self.origin_input.text():
+			self.error_label1.setVisible(True)
+			self.error_label1.setText("<font color='red'> * Origin is required.</font>")
+		else:
+			self.error_label1.setVisible(False)
+
+		# Destination validation
+		if not self.destination_input.text():
+			self.error_label2.setVisible(True)
+			self.error_label2.setText("<font color='red'> * Destination is required.</font>")
+		else:
+			self.error_label2.setVisible(False)
+
+		# Mode validation for "Other" selection
+		if self.mode_input_cb.currentText() == "Other" and not self.mode_input_le.text():
+			self.error_label3.setVisible(True)
+			self.error_label3.setText("<font color='red'> * Mode is required.</font>")
+		else:
+			self.error_label3.setVisible(False)
+
+		# DateTime validation
+		start_dt, end_dt = self.get_datetime_inputs()
+
+		if start_dt >= end_dt:
+			self.error_label4.setVisible(True)
+			self.error_label4.setText("<font color='red'> * End date & time must be after start date & time.</font>")
+			self.error_label4.setWordWrap(True)
+		elif self.repeat_input.currentIndex() > 0 and start_dt.secsTo(end_dt) >= 86400:
+			self.error_label4.setVisible(True)
+			self.error_label4.setText("<font color='red'> * A repeating trip must be shorter than a day.</font>")
+			self.error_label4.setWordWrap(True)
+		else:
+			self.error_label4.setVisible(False)
+
+		self.update_dialog_height()
+
+		# Check if any validation errors exist
+		errors = [self.error_label1.isVisible(), self.error_label2.isVisible(), 
+				self.error_label3.isVisible(), self.error_label4.isVisible()]
+
+		if any(errors):
+			return
+
+		# Prepare data for database insertion
+		origin = self.origin_input.text()
+		destination = self.destination_input.text()
+		mode = self.mode_input_cb.currentText() if self.mode_input_cb.currentIndex() != 5 else self.mode_input_le.text()
+		start = start_dt.toString("yyyy-MM-dd hh:mm:ss")
+		end = end_dt.toString("yyyy-MM-dd hh:mm:ss")
+		description = self.description_input.toPlainText()
+
+		try:
+			# Save to database and get generated log ID
+			log_id = db.create_log(origin, destination, mode, start, end, description)
+
+			# Repeat from the next occurrence on; this trip counts as the schedule's first
+			_, weekdays = REPEAT_CHOICES[self.repeat_input.currentIndex()]
+
+			if weekdays is None:
+				weekdays = 1 << (start_dt.date().dayOfWeek() - 1)
+
+			if weekdays:
+				db.create_schedule(origin, destination, mode, weekdays, start_dt.toString("hh:mm"), end_dt.toString("hh:mm"),
+								start_dt.toString("yyyy-MM-dd"), description, start)
+				self.main_window.expand_schedules()
+			
+			# Update UI with new log at its sorted position
+			current_table = self.main_window.tables[self.main_window.table_selector.currentIndex()]
+			model = current_table.model()
+			model.upsert_logs(db.get_log_columns([log_id]))
+			
+			# Update duration statistics
+			self.main_window.update_statistics()
+
+			self.main_window.delete_log_btn.setEnabled(False)
+			self.main_window.clear_all_logs_btn.setEnabled(True)
+
+			current_table.selectRow(model.store.find(log_id))
+	
+			self.accept()
+			
+		except ValueError as e:
+			QMessageBox.warning(self, "Error", str(e))
+
+class ChildSchedules(QDialog):
+	def __init__(self, main_window):
+		super().__init__(main_window)
+
+		self.setWindowTitle("Schedules")
+		self.setFixedSize(460, 300)
+		screen = main_window.screen
+		self.move(int((screen.width() - self.width()) / 2), int((screen.height() - self.height()) / 2))
+
+		self.main_window = main_window
+		self.schedules = []
+
+		self.list = QListWidget()
+		self.hint = QLabel("Trips repeated with the Repeat option when adding a log")
+		self.skip_btn = QPushButton("Skip Next")
+		self.stop_btn = QPushButton("Stop Repeating")
+		self.close_btn = QPushButton("Close")
+
+		button_layout = QHBoxLayout()
+		button_layout.addWidget(self.skip_btn)
+		button_layout.addWidget(self.stop_btn)
+		button_layout.addStretch(1)
+		button_layout.addWidget(self.close_btn)
+
+		main_layout = QVBoxLayout()
+		main_layout.addWidget(self.hint)
+		main_layout.addWidget(self.list)
+		main_layout.addLayout(button_layout)
+		self.setLayout(main_layout)
+
+		self.list.currentRowChanged.connect(self.select_schedule)
+		self.skip_btn.clicked.connect(self.skip_next)
+		self.stop_btn.clicked.connect(self.stop)
+		self.close_btn.clicked.connect(self.accept)
+
+	def reset(self):
+		# Reload the running schedules and their next occurrences
+		row = self.list.currentRow()
+		self.schedules = db.get_schedules()
+		self.list.clear()
+
+		for schedule in self.schedules:
+			next_day = db.next_occurrence(schedule)
+			next_text = QDate.fromString(next_day, "yyyy-MM-dd").toString("ddd, MMM d") if next_day else "none"
+			self.list.addItem(f"{schedule.origin} → {schedule.destination} ({schedule.mode}), {self.format_weekdays(schedule.weekdays)} "
+							f"{schedule.start_time}–{schedule.end_time}, next {next_text}")
+
+		self.list.setCurrentRow(min(max(row, 0), len(self.schedules) - 1))
+		self.select_schedule(self.list.currentRow())
+
+	def format_weekdays(self, weekdays):
+		# "Mon–Fri", "Every day", or the weekday names
+		if weekdays == 0b1111111:
+			return "every day"
+		elif weekdays == 0b0011111:
+			return "Mon–Fri"
+
+		return ", ".join(name for i, name in enumerate(WEEKDAY_NAMES) if weekdays >> i & 1)
+
+	def select_schedule(self, row):
+		self.skip_btn.setEnabled(row >= 0)
+		self.stop_btn.setEnabled(row >= 0)
+
+	def skip_next(self):
+		# Leave the next occurrence of the selected schedule unlogged
+		schedule = self.schedules[self.list.currentRow()]
+		next_day = db.next_occurrence(schedule)
+
+		if next_day is not None:
+			db.skip_occurrence(schedule.id, next_day)
+
+		self.reset()
+
+	def stop(self):
+		# End the selected schedule; trips it already logged are kept
+		schedule = self.schedules[self.list.currentRow()]
+		confirm = QMessageBox.question(self, "Stop Repeating", f"Stop logging {schedule.origin} → {schedule.destination} ({schedule.mode}) automatically?")
+
+		if confirm == QMessageBox.StandardButton.Yes:
+			db.end_schedule(schedule.id, QDate.currentDate().addDays(-1).toString("yyyy-MM-dd"))
+			self.reset()
+
+class ChildEditLog(QDialog):
+	def __init__(self, main_window):
+		super().__init__(main_window)
+
+		self.setWindowTitle("Edit Log")
+		self.setFixedWidth(325)
+		self.setMinimumHeight(300)
+		screen = main_window.screen
+		self.move(int((screen.width() - self.width()) / 2), int((screen.height() - self.height()) / 2))
+
+		self.main_window = main_window
+		self.current_log = None
+		self.log_id = None
+
+		# Input fields, filled with the log to edit by load()
+		self.origin_input = QLineEdit()
+		self.error_label1 = QLabel()
+		self.error_label1.setVisible(False)
+		self.destination_input = QLineEdit()
+		self.error_label2 = QLabel()
+		self.error_label2.setVisible(False)
+		self.mode_input_cb = QComboBox()
+		self.mode_input_cb.addItems(["Car", "Walk", "Bus", "Airplane", "Bicycle", "Other"])
+		self.mode_input_le = QLineEdit()
+		self.mode_input_le.setEnabled(False)
+		self.mode_input_le.setVisible(False)
+		self.error_label3 = QLabel()
+		self.error_label3.setVisible(False)
+		self.start_date_input = QDateEdit()
+		self.start_date_input.setDisplayFormat("yyyy/MM/d")
+		self.start_date_input.setCalendarPopup(True)
+		self.start_time_input = QTimeEdit()
+		self.start_time_input.setDisplayFormat("h:mm AP")
+		self.end_date_input = QDateEdit()
+		self.end_date_input.setDisplayFormat("yyyy/MM/d")
+		self.end_date_input.setCalendarPopup(True)
+		self.end_time_input = QTimeEdit()
+		self.end_time_input.setDisplayFormat("h:mm AP")
+		self.error_label4 = QLabel()
+		self.error_label4.setVisible(False)
+		self.description_input = QTextEdit()
+		self.description_input.setFixedHeight(80)
+		self.buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Cancel | QDialogButtonBox.StandardButton.Ok)
+		self.buttons.button(QDialogButtonBox.StandardButton.Ok).setText("Save")
+		self.buttons.setLayoutDirection(Qt.LayoutDirection.RightToLeft)
+		
+		# Layout organization
+		start_input_layout = QHBoxLayout()
+		start_input_layout.addWidget(self.start_date_input)
+		start_input_layout.addWidget(self.start_time_input)
+		
+		end_input_layout = QHBoxLayout()
+		end_input_layout.addWidget(self.end_date_input)
+		end_input_layout.addWidget(self.end_time_input)
+
+		fill_up_layout = QFormLayout()
+		fill_up_layout.addRow("Origin:", self.origin_input)
+		fill_up_layout.addRow("", self.error_label1)
+		fill_up_layout.addRow("Destination:", self.destination_input)
+		fill_up_layout.addRow("", self.error_label2)
+		fill_up_layout.addRow("Mode:", self.mode_input_cb)
+		fill_up_layout.addRow("", self.mode_input_le)
+		fill_up_layout.addRow("", self.error_label3)
+		fill_up_layout.addRow("Start Date/Time:", start_input_layout)
+		fill_up_layout.addRow("End Date/Time:", end_input_layout)
+		fill_up_layout.addRow("", self.error_label4)
+		fill_up_layout.addRow("Description:\n(optional)", self.description_input)
+
+		main_layout = QVBoxLayout()
+		main_layout.addLayout(fill_up_layout)
+		main_layout.addWidget(self.buttons, alignment=Qt.AlignmentFlag.AlignLeft)
+		self.setLayout(main_layout)
+
+		# Signal connections
+		self.mode_input_cb.currentIndexChanged.connect(self.combobox_other)
+		self.start_time_input.timeChanged.connect(self.adjust_end_time)
+		self.end_time_input.timeChanged.connect(self.adjust_start_time)
+		self.buttons.rejected.connect(self.reject)
+		self.buttons.accepted.connect(self.save)
+
+	def load(self, row):
+		# Fill the dialog with the log shown in a row of the current table and clear earlier errors
+		current_table = self.main_window.tables[self.main_window.table_selector.currentIndex()]
+		log_id, origin, destination, mode, start, end, description = current_table.model().get_log(row)
+
+		start_dt = QDateTime.fromSecsSinceEpoch(start, QTimeZone.utc())
+		end_dt = QDateTime.fromSecsSinceEpoch(end, QTimeZone.utc())
+
+		self.current_log = row
+		self.log_id = log_id
+		self.origin_input.setText(origin)
+		self.destination_input.setText(destination)
+		self.description_input.setPlainText(description)
+
+		# Set current mode in combobox
+		current_mode = self.mode_input_cb.findText(mode)
+
+		if current_mode not in (-1, 5):
+			self.mode_input_cb.setCurrentIndex(current_mode)
+		else:
+			self.mode_input_cb.setCurrentIndex(5)
+			self.mode_input_le.setText(mode)
+
+		# Set all four at once without the start/end adjustments reacting to half-loaded values
+		datetime_inputs = (self.start_date_input, self.start_time_input, self.end_date_input, self.end_time_input)
+
+		for widget in datetime_inputs:
+			widget.blockSignals(True)
+
+		self.start_date_input.setDate(start_dt.date())
+		self.start_time_input.setTime(start_dt.time())
+		self.end_date_input.setDate(end_dt.date())
+		self.end_time_input.setTime(end_dt.time())
+
+		for widget in datetime_inputs:
+			widget.blockSignals(False)
+
+		for label in (self.error_label1, self.error_label2, self.error_label3, self.error_label4):
+			label.setVisible(False)
+
+		self.update_dialog_height()
+
+	def combobox_other(self):
+		# Show/hide custom mode input when "Other" is selected
+		if self.mode_input_cb.currentIndex() != 5:
+			self.mode_input_le.clear()
+			self.mode_input_le.setEnabled(False)
+			self.mode_input_le.setVisible(False)
+		else:
+			self.mode_input_le.setEnabled(True)
+			self.mode_input_le.setVisible(True)
+		
+		self.update_dialog_height()
+
+	def update_dialog_height(self):
+		# Adjust dialog height based on content visibility
+		self.setMinimumHeight(0)
+		self.setMaximumHeight(450)
+		self.adjustSize()
+
+	def get_datetime_inputs(self):
+		# Get combined datetime objects from date and time inputs
+		start_dt = QDateTime(self.start_date_input.date(), self.start_time_input.time())
+		end_dt = QDateTime(self.end_date_input.date(), self.end_time_input.time())
+		return start_dt, end_dt
+
+	def adjust_end_time(self):
+		# Ensure end time is always after start time
+		start_dt, end_dt = self.get_datetime_inputs()
+
+		if start_dt >= end_dt:
+			increment = start_dt.addSecs(60)
+			self.end_date_input.setDate(increment.date())
+			self.end_time_input.setTime(increment.time())
+		
+	def adjust_start_time(self):
+		# Ensure start time is always before end time
+		start_dt, end_dt = self.get_datetime_inputs()
+
+		if end_dt <= start_dt:
+			increment = end_dt.addSecs(-60)
+			self.start_date_input.setDate(increment.date())
+			self.start_time_input.setTime(increment.time())
+
+	def save(self):
+		# Validate inputs and save edited log to database and UI
+
+		# Origin validation
+		if not self.origin_input.text():
+			self.error_label1.setVisible(True)
+			self.error_label1.setText("<font color='red'> * Origin is required.</font>")
+		else:
+			self.error_label1.setVisible(False)
+
+		# Destination validation
+		if not self.destination_input.text():
+			self.error_label2.setVisible(True)
+			self.error_label2.setText("<font color='red'> * Destination is required.</font>")
+		else:
+			self.error_label2.setVisible(False)
+
+		# Mode validation for "Other" selection
+		if self.mode_input_cb.currentIndex() == 5 and not self.mode_input_le.text():
+			self.error_label3.setVisible(True)
+			self.error_label3.setText("<font color='red'> * Mode is required.</font>")
+		else:
+			self.error_label3.setVisible(False)
+
+		# DateTime validation
+		start_dt, end_dt = self.get_datetime_inputs()
+
+		if start_dt >= end_dt:
+			self.error_label4.setVisible(True)
+			self.error_label4.setText("<font color='red'> * End date & time must be after start date & time.</font>")
+			self.error_label4.setWordWrap(True)
+		else:
+			self.error_label4.setVisible(False)
+
+		self.update_dialog_height()
+
+		# Check if any validation errors exist
+		errors = [self.error_label1.isVisible(), self.error_label2.isVisible(), 
+				self.error_label3.isVisible(), self.error_label4.isVisible()]
+
+		if any(errors):
+			return
+
+		# Prepare data for database update
+		origin = self.origin_input.text()
+		destination = self.destination_input.text()
+		mode = self.mode_input_cb.currentText() if self.mode_input_cb.currentIndex() != 5 else self.mode_input_le.text()
+		start = start_dt.toString("yyyy-MM-dd hh:mm:ss")
+		end = end_dt.toString("yyyy-MM-dd hh:mm:ss")
+		description = self.description_input.toPlainText()
+
+		try:
+			# Update database
+			db.update_log(self.log_id, origin, destination, mode, start, end, description)
+			
+			# Update UI with edited log data at its sorted position
+			current_table = self.main_window.tables[self.main_window.table_selector.currentIndex()]
+			model = current_table.model()
+			model.upsert_logs(db.get_log_columns([self.log_id]))
+
+			# Update duration statistics
+			self.main_window.update_statistics()
+
+			current_table.selectRow(model.store.find(self.log_id))
+	
+			self.accept()
+			
+		except ValueError as e:
+			QMessageBox.warning(self, "Error", str(e))